@@ -41,8 +41,9 @@ def run():
 
         env = os.environ.copy()
         env["PYTHONUNBUFFERED"] = "1"
+        # The transcription server outlives restarts, so only the first start loads the model
         process = subprocess.Popen(
-            [sys.executable, "-m", "vibetotext"],
+            [sys.executable, "-m", "vibetotext", "--whisper-server"],
             env=env,
         )
         return process
@@ -86,6 +87,10 @@ def run():
             print(f"\n🔄 Detected changes in: {', '.join(p.name for p in changed)}")
             print("   Restarting...\n")
             stop_process()
+            if any(p.name == "whisper_server.py" for p in changed):
+                # Server code changed: stop it so the next start spawns the new version
+                subprocess.run([sys.executable, "-m", "vibetotext.whisper_server", "--stop"],
+                              capture_output=True)
             time.sleep(0.5)
             start_process()
             last_mtimes = current_mtimes
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Benchmark: TranscriptionHistory.search() on a large synthetic history.
+
+Builds a history of synthetic entries (Zipf-distributed vocabulary, 5-40
+words each, spread over two years and four modes) through add_entries(), then
+times a set of representative queries against the 10 ms target.
+
+    python scripts/bench_history_search.py                       # 1M entries in a temp dir
+    python scripts/bench_history_search.py --db /tmp/bench.db    # Build once, reuse on later runs
+"""
+
+import argparse
+import contextlib
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from vibetotext.history import TranscriptionHistory  # noqa: E402
+
+VOCABULARY = 50000
+MODES = ["transcribe", "greppy", "cleanup", "plan"]
+TARGET_MS = 10.0
+CHUNK = 20000
+
+
+def word(rank: int) -> str:
+    """Synthetic word for a frequency rank (0 = most common); letters only, so the tokenizer keeps it whole."""
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    out = ""
+    rank += 1
+    while rank:
+        rank, digit = divmod(rank - 1, 26)
+        out = letters[digit] + out
+    return "x" + out
+
+
+def build(history: TranscriptionHistory, entries: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    start = datetime(2024, 1, 1)
+    span = timedelta(days=730).total_seconds()
+    # Seconds since start, sorted so entries arrive in time order as they would in real use
+    offsets = np.sort(rng.uniform(0, span, entries))
+    built = time.time()
+    for first in range(0, entries, CHUNK):
+        n = min(CHUNK, entries - first)
+        lengths = rng.integers(5, 41, n)
+        ranks = np.minimum(rng.zipf(1.3, int(lengths.sum())) - 1, VOCABULARY - 1)
+        modes = rng.integers(0, len(MODES), n)
+        batch = []
+        pos = 0
+        for i in range(n):
+            text = " ".join(word(r) for r in ranks[pos:pos + lengths[i]])
+            pos += lengths[i]
+            batch.append({
+                "text": text,
+                "mode": MODES[modes[i]],
+                "timestamp": start + timedelta(seconds=float(offsets[first + i])),
+                "duration_seconds": float(lengths[i]) / 2.5,
+            })
+        history.add_entries(batch)
+        history.flush()
+        print(f"\r[BENCH] Built {first + n:,}/{entries:,} entries", end="", file=sys.stderr)
+    print(f"\n[BENCH] Build took {time.time() - built:.0f}s", file=sys.stderr)
+
+
+def time_query(history: TranscriptionHistory, runs: int, **kwargs) -> tuple:
+    """Median milliseconds over runs (after one warm-up), and the results."""
+    results = history.search(**kwargs)
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        history.search(**kwargs)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=1_000_000, help="Synthetic entries (default: 1M)")
+    parser.add_argument("--db", help="Database file; built if missing or empty, reused otherwise (default: temp)")
+    parser.add_argument("--runs", type=int, default=20, help="Timed runs per query; the median is reported")
+    parser.add_argument("--limit", type=int, default=50, help="Results per query")
+    args = parser.parse_args()
+
+    tmp = None
+    if args.db:
+        path = Path(args.db)
+    else:
+        tmp = tempfile.TemporaryDirectory()
+        path = Path(tmp.name) / "history.db"
+
+    history = TranscriptionHistory(path)
+    try:
+        if history.entry_count == 0:
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                build(history, args.entries)  # Without the writer's per-batch logging
+        history.flush()
+        size_mb = path.stat().st_size / 1e6
+        print(f"[BENCH] {history.entry_count:,} entries, {size_mb:.0f} MB, FTS5: {history._fts}")
+
+        # Ranks chosen for match counts from a handful to most of the table
+        cases = [
+            ("rare word", {"query": word(3000)}),
+            ("less rare word", {"query": word(600)}),
+            ("mid-frequency word", {"query": word(300)}),
+            ("two less rare words", {"query": f"{word(500)} {word(700)}"}),
+            ("two mid-frequency words", {"query": f"{word(200)} {word(400)}"}),
+            ("common word", {"query": word(1)}),
+            ("two common words", {"query": f"{word(0)} {word(1)}"}),
+            ("common word, mode filter", {"query": word(1), "mode": "plan"}),
+            ("common word, since filter", {"query": word(1), "since": "2025-12-01"}),
+            ("common + rare word", {"query": f"{word(0)} {word(3000)}"}),
+            ("no match", {"query": "zzzzunmatched"}),
+        ]
+        print(f"  {'query':<28} {'results':>7} {'order':>7} {'median':>9}")
+        slow = 0
+        for name, kwargs in cases:
+            ms, results = time_query(history, args.runs, limit=args.limit, **kwargs)
+            order = "-" if not results else "newest" if results[0]["rank"] is None else "bm25"
+            flag = "" if ms < TARGET_MS else f"  (over {TARGET_MS:.0f} ms)"
+            slow += ms >= TARGET_MS
+            print(f"  {name:<28} {len(results):>7} {order:>7} {ms:>7.1f}ms{flag}")
+        print(f"[BENCH] {len(cases) - slow}/{len(cases)} queries under {TARGET_MS:.0f} ms")
+    finally:
+        history.close()
+        if tmp is not None:
+            tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
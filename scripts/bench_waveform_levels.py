@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: waveform bar levels per audio block, per-band loop vs weight matrix.
+
+Times the original per-band np.mean loop against AudioRecorder's precomputed
+(NUM_BARS, bins) weight matrix on the same blocks, and checks they agree.
+
+    python scripts/bench_waveform_levels.py [--blocks 128 256 512] [--calls 5000]
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from vibetotext.recorder import AudioRecorder  # noqa: E402
+
+
+def levels_per_band_loop(rec: AudioRecorder, block: np.ndarray, prev: np.ndarray) -> np.ndarray:
+    """The levels computation as it was before the weight matrix (window, padding and bands rebuilt per block)."""
+    audio = block.flatten()
+    rms = np.sqrt(np.mean(audio**2))
+    if min(1.0, rms * 100) < rec.SILENCE_THRESHOLD:
+        return prev * rec.SMOOTHING
+
+    if len(audio) < rec.FFT_SIZE:
+        audio = np.pad(audio, (0, rec.FFT_SIZE - len(audio)))
+    else:
+        audio = audio[:rec.FFT_SIZE]
+    window = np.hanning(len(audio))
+    spectrum = np.abs(np.fft.rfft(audio * window))
+    spectrum = np.clip(spectrum, 1e-10, None)
+    spectrum_db = 20 * np.log10(spectrum)
+    spectrum_norm = np.clip((spectrum_db + 60) / 60, 0, 1)
+
+    usable_bins = len(spectrum_norm) - rec.MIN_FREQ_BIN
+    levels = np.zeros(rec.NUM_BARS)
+    for i in range(rec.NUM_BARS):
+        lo = int(rec.MIN_FREQ_BIN + usable_bins * ((i / rec.NUM_BARS) ** 2.5))
+        hi = int(rec.MIN_FREQ_BIN + usable_bins * (((i + 1) / rec.NUM_BARS) ** 2.5))
+        hi = max(hi, lo + 1)
+        avg = np.mean(spectrum_norm[lo:hi])
+        if i < 4:
+            avg *= 0.5 + (i * 0.125)
+        levels[i] = avg
+    return prev * rec.SMOOTHING + levels * (1 - rec.SMOOTHING)
+
+
+def levels_weight_matrix(rec: AudioRecorder, block: np.ndarray) -> np.ndarray:
+    """The current path: the block is captured, then AudioRecorder._compute_levels() runs on it."""
+    rec.capture.frames = 0  # Reuse the start of the capture buffer for every call
+    rec.capture.write(block)
+    audio = block[:, 0]
+    rec._energy = float(np.dot(audio, audio))
+    rec._energy_samples = len(audio)
+    return rec._compute_levels()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--blocks", type=int, nargs="+", default=[128, 256, 512], help="Block sizes (samples)")
+    parser.add_argument("--calls", type=int, default=5000, help="Calls per timing run")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing runs; the fastest is reported")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    rec = AudioRecorder()
+    print(f"{'block':>6}  {'per-band loop':>14}  {'weight matrix':>14}  {'speedup':>7}  max diff")
+    for size in args.blocks:
+        block = (rng.standard_normal((size, 1)) * 0.1).astype(np.float32)
+
+        # Same input and same starting smoothing state for both paths
+        rec._prev_levels[:] = 0.0
+        expected = levels_per_band_loop(rec, block, np.zeros(rec.NUM_BARS))
+        diff = float(np.max(np.abs(levels_weight_matrix(rec, block) - expected)))
+
+        prev = np.zeros(rec.NUM_BARS)
+        old = min(timeit.repeat(lambda: levels_per_band_loop(rec, block, prev), number=args.calls, repeat=args.repeat))
+        new = min(timeit.repeat(lambda: levels_weight_matrix(rec, block), number=args.calls, repeat=args.repeat))
+        old_us, new_us = old / args.calls * 1e6, new / args.calls * 1e6
+        print(f"{size:>6}  {old_us:>12.1f}us  {new_us:>12.1f}us  {old_us / new_us:>6.1f}x  {diff:.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,15 +7,11 @@ import sys
 import tempfile
 import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-from vibetotext.recorder import AudioRecorder, HotkeyListener
-from vibetotext.transcriber import Transcriber
-from vibetotext.context import search_context, format_context
-from vibetotext.greppy import search_files, format_files_for_context
-from vibetotext.llm import cleanup_text, generate_implementation_plan
-from vibetotext.output import paste_at_cursor
-from vibetotext.history import TranscriptionHistory
+# Highest --level-rate accepted; faster than any display refreshes
+MAX_LEVEL_RATE = 240
 
 
 def open_history_app():
@@ -40,6 +36,11 @@ def open_history_app():
 
 
 def main():
+    # `vibetotext batch ...` transcribes files instead of running the hotkey loop
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        from vibetotext.batch import main as batch_main
+        sys.exit(batch_main(sys.argv[2:]))
+
     parser = argparse.ArgumentParser(
         description="Voice-to-text with automatic code context injection"
     )
@@ -107,10 +108,89 @@ def main():
         default=None,
         help="Audio input device index (overrides saved config)",
     )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Transcribe while recording so long dictations finish quickly on release",
+    )
+    parser.add_argument(
+        "--no-vad",
+        action="store_true",
+        help="Disable trimming silence before transcription",
+    )
+    parser.add_argument(
+        "--level-rate",
+        type=float,
+        default=None,
+        help=f"Waveform updates per second, up to {MAX_LEVEL_RATE:g} (default: 30, the overlay frame rate)",
+    )
+    parser.add_argument(
+        "--stream-output",
+        action="store_true",
+        help="Paste cleanup/plan output progressively as Gemini generates it",
+    )
+    parser.add_argument(
+        "--draft-model",
+        default=None,
+        choices=["tiny", "base", "small", "medium", "large"],
+        help="Tiered mode: draft utterances under 4s of speech with this fast model and paste the draft "
+             "when it looks reliable. Otherwise the paste waits for --model: unreliable drafts are "
+             "re-transcribed first, and longer utterances skip the draft. A pasted draft is never replaced",
+    )
+    parser.add_argument(
+        "--latency-slo",
+        type=float,
+        default=None,
+        help="Route each recording to the largest model expected to transcribe it within this many "
+             "seconds, given its length, measured speed and CPU load (decisions: ~/.vibetotext/routing.jsonl)",
+    )
+    parser.add_argument(
+        "--route-models",
+        default=None,
+        help="Comma-separated model sizes --latency-slo may choose from (default: tiny,base and --model)",
+    )
+    parser.add_argument(
+        "--whisper-server",
+        action="store_true",
+        help="Keep the Whisper model loaded in a background server process that survives restarts",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Print import time per module and startup phase timings once ready",
+    )
 
     args = parser.parse_args()
+    if args.level_rate is not None and not 0 < args.level_rate <= MAX_LEVEL_RATE:
+        parser.error(f"--level-rate must be above 0 and at most {MAX_LEVEL_RATE:g}")
+    route_models = ["tiny", "base", args.model]
+    if args.route_models:
+        route_models = [name.strip() for name in args.route_models.split(",") if name.strip()]
+        unknown = set(route_models) - {"tiny", "base", "small", "medium", "large"}
+        if unknown or not route_models:
+            parser.error(f"--route-models: unknown model size(s) {', '.join(sorted(unknown)) or '(none given)'}")
+    if args.latency_slo is not None and not args.latency_slo > 0:
+        parser.error("--latency-slo must be above 0 seconds")
     print("[DEBUG] Args parsed, no_ui flag:", args.no_ui, flush=True)
 
+    profiler = None
+    if args.profile_startup:
+        from vibetotext.profiling import StartupProfiler
+        profiler = StartupProfiler()
+        profiler.install()
+
+    # Imported after argument parsing so --help is instant and --profile-startup sees them.
+    # Gemini (llm) is imported on the first cleanup/plan.
+    from vibetotext.recorder import LEVEL_RATE, AudioRecorder, HotkeyListener
+    from vibetotext.transcriber import TieredTranscriber, Transcriber, same_text
+    from vibetotext.router import ModelRouter
+    from vibetotext.streaming import TranscriptionStream
+    from vibetotext.pipeline import PipelineExecutor
+    from vibetotext.greppy import DEFAULT_CODEBASE, SpeculativeSearch, prewarm, search_files, format_files_for_context
+    from vibetotext.output import paste_at_cursor, paste_stream
+    from vibetotext.history import TranscriptionHistory
+    from vibetotext.config import get_config
+
     # Initialize UI if enabled
     ui = None
     if not args.no_ui:
@@ -130,17 +210,9 @@ def main():
         print("[DEBUG] UI disabled via --no-ui flag", flush=True)
 
     # Load config for saved audio device (unless overridden by --device)
-    import json
-    config_file = Path.home() / ".vibetotext" / "config.json"
     saved_device = args.device  # Command line takes priority
     if saved_device is None:
-        try:
-            if config_file.exists():
-                with open(config_file, "r") as f:
-                    config = json.load(f)
-                    saved_device = config.get("audio_device_index")
-        except Exception:
-            pass
+        saved_device = get_config().get("audio_device_index")
 
     # Set audio device
     import sounddevice as sd
@@ -148,8 +220,20 @@ def main():
         sd.default.device[0] = saved_device  # Set input device
 
     # Initialize components
-    recorder = AudioRecorder()
-    transcriber = Transcriber(model_name=args.model)
+    if profiler:
+        profiler.mark("imports")
+    level_rate = LEVEL_RATE if args.level_rate is None else args.level_rate
+    recorder = AudioRecorder(level_rate=level_rate)
+    if args.latency_slo:
+        transcriber = ModelRouter(route_models, args.latency_slo, vad=not args.no_vad, server=args.whisper_server)
+    else:
+        transcriber = Transcriber(model_name=args.model, vad=not args.no_vad, server=args.whisper_server)
+    tiered = None
+    if args.draft_model:
+        draft = Transcriber(model_name=args.draft_model, vad=not args.no_vad, server=args.whisper_server)
+        tiered = TieredTranscriber(draft, transcriber)
+        # Runs LLM calls on the draft while the refine pass is still transcribing
+        speculation_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="vibetotext-speculate")
     history = TranscriptionHistory()
 
     # Set up hotkeys for all modes
@@ -164,14 +248,26 @@ def main():
 
     # Track current mode
     current_mode = [None]  # Use list to allow mutation in nested function
+    current_stream = [None]  # Active TranscriptionStream when --streaming is on
+    current_search = [None]  # SpeculativeSearch fed by the stream in greppy mode
 
     # Set up audio level callback for UI
     if ui:
-        recorder.on_level = ui.update_waveform
+        ui.connect_recorder(recorder)
+
+    if profiler:
+        profiler.mark("setup (UI, audio device, history)")
 
     print("[DEBUG] About to preload model...", flush=True)
-    # Preload model
-    _ = transcriber.model
+    # Preload model and start the Greppy worker so the first search doesn't pay index load
+    (tiered or transcriber).preload()
+    if profiler:
+        profiler.mark("whisper model load")
+    prewarm([args.codebase or DEFAULT_CODEBASE])
+    if profiler:
+        profiler.mark("greppy prewarm (background)")
+        profiler.uninstall()
+        print(profiler.report(), flush=True)
     print("[DEBUG] Model loaded, defining callbacks...", flush=True)
 
     def on_start(mode):
@@ -185,6 +281,16 @@ def main():
             if ui:
                 ui.show_recording()
             recorder.start()
+            if args.streaming:
+                # Greppy mode: start searching on partial text while the user is still talking
+                search = None
+                if mode == "greppy":
+                    search = SpeculativeSearch(limit=args.greppy_limit, codebase=args.codebase)
+                current_search[0] = search
+                current_stream[0] = TranscriptionStream(
+                    transcriber, recorder.capture, sample_rate=recorder.sample_rate,
+                    on_partial=search.update if search else None,
+                )
         except Exception:
             error_log = os.path.join(tempfile.gettempdir(), "vibetotext_crash.log")
             error_msg = f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] Error in on_start (mode={mode}):\n"
@@ -203,18 +309,83 @@ def main():
             if ui:
                 ui.hide_recording()
             audio = recorder.stop()
+            stream, current_stream[0] = current_stream[0], None
+            search, current_search[0] = current_search[0], None
 
             if len(audio) == 0:
+                if stream:
+                    stream.cancel()
                 return
 
-            # Calculate audio duration for stats
-            duration_seconds = len(audio) / 16000  # Sample rate is 16000
+            if stream:
+                stream.close(audio)
 
-            # Transcribe
-            text = transcriber.transcribe(audio)
+            # Hand off to the pipeline so the hotkey listener is free immediately
+            if pipeline.submit(mode, audio, stream, search) is None:
+                print(f"[DEBUG] {pipeline.max_pending} recordings still processing, dropping this one.", flush=True)
+                if stream:
+                    stream.cancel()
+
+        except Exception:
+            # Log error to file
+            error_log = os.path.join(tempfile.gettempdir(), "vibetotext_crash.log")
+            error_msg = f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] Error in on_stop (mode={mode}):\n"
+            error_msg += traceback.format_exc()
+
+            with open(error_log, "a") as f:
+                f.write(error_msg + "\n")
+
+            # Hide UI if still showing
+            if ui:
+                try:
+                    ui.hide_recording()
+                except Exception:
+                    pass
+
+    def paste_streamed(job, chunks):
+        """Paste LLM output as it streams in, once every earlier recording has been pasted."""
+        pipeline.wait_turn(job)
+        output = paste_stream(chunks, stop=lambda: job.cancelled)
+        job.pasted = bool(output)
+        return output or None
+
+    def speculate(job, draft, prefetched):
+        """Start the mode's follow-up work on a tiered draft while the refine pass runs."""
+        if job.mode == "greppy":
+            # resolve() reuses this search if the refined text mostly matches the draft
+            if job.search is None:
+                job.search = SpeculativeSearch(limit=args.greppy_limit, codebase=args.codebase)
+            job.search.update(draft)
+        elif job.mode in ("cleanup", "plan") and not args.stream_output:
+            from vibetotext.llm import cleanup_text, generate_implementation_plan
+            generate = cleanup_text if job.mode == "cleanup" else generate_implementation_plan
+            prefetched[draft] = speculation_pool.submit(generate, draft)
+
+    def prefetched_result(prefetched, text):
+        """LLM output computed from the tiered draft, if the final transcript matches the draft."""
+        for draft, future in prefetched.items():
+            if same_text(draft, text):
+                return future.result()
+        return None
+
+    def process_recording(job):
+        """Transcribe and post-process one recording (runs on a pipeline worker)."""
+        mode = job.mode
+        try:
+            # Transcribe (streaming mode only has the tail left to do)
+            stream = job.stream
+            prefetched = {}  # Tiered draft -> Future of the LLM output generated from it
+            if stream:
+                text = stream.result()
+                if stream.error:
+                    text = transcriber.transcribe(job.audio)
+            elif tiered:
+                text = tiered.transcribe(job.audio, on_draft=lambda draft: speculate(job, draft, prefetched))
+            else:
+                text = transcriber.transcribe(job.audio)
 
             if not text:
-                return
+                return None
 
             # Filter out Whisper blank audio / silence markers
             text_lower = text.strip().lower()
@@ -225,54 +396,92 @@ def main():
                 "[no speech]", "[ no speech ]", "(no speech)", "( no speech )",
             )
             if text_lower in noise_markers:
-                return
+                return None
+
+            job.text = text
+            if job.cancelled:
+                return None
 
             if mode == "greppy":
                 # Greppy mode: search for relevant files and attach them
-                files = search_files(text, limit=args.greppy_limit, codebase=args.codebase)
+                if job.search:
+                    files = job.search.resolve(text)
+                else:
+                    files = search_files(text, limit=args.greppy_limit, codebase=args.codebase)
                 # Format output with file contents
                 context = format_files_for_context(files)
                 output = text + context
 
             elif mode == "cleanup":
                 # Cleanup mode: use Gemini to refine rambling into clear prompt
-                refined = cleanup_text(text)
+                from vibetotext.llm import cleanup_text, stream_cleanup_text
+                if args.stream_output:
+                    refined = paste_streamed(job, stream_cleanup_text(text))
+                else:
+                    refined = prefetched_result(prefetched, text) or cleanup_text(text)
                 output = refined if refined else text
 
             elif mode == "plan":
                 # Plan mode: use Gemini to generate implementation plan
-                plan = generate_implementation_plan(text)
+                from vibetotext.llm import generate_implementation_plan, stream_implementation_plan
+                if args.stream_output:
+                    plan = paste_streamed(job, stream_implementation_plan(text))
+                else:
+                    plan = prefetched_result(prefetched, text) or generate_implementation_plan(text)
                 output = plan if plan else text
 
             else:
                 # Regular transcribe mode - just transcribe, no context search
                 output = text
 
-            # Save to history with duration for WPM calculation
-            history.add_entry(text, mode, duration_seconds=duration_seconds)
-
-            # Paste at cursor
-            paste_at_cursor(output)
+            return output
 
         except Exception:
             # Log error to file
             error_log = os.path.join(tempfile.gettempdir(), "vibetotext_crash.log")
-            error_msg = f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] Error in on_stop (mode={mode}):\n"
+            error_msg = f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] Error processing recording (mode={mode}):\n"
             error_msg += traceback.format_exc()
 
             with open(error_log, "a") as f:
                 f.write(error_msg + "\n")
+            return None
 
-            # Hide UI if still showing
-            if ui:
-                try:
+    def deliver(job, output):
+        """Save and paste a finished recording (called in recording order)."""
+        # Calculate audio duration for stats
+        duration_seconds = len(job.audio) / 16000  # Sample rate is 16000
+
+        # Save to history with duration for WPM calculation
+        history.add_entry(job.text, job.mode, duration_seconds=duration_seconds)
+
+        # Paste at cursor (streamed output is already there)
+        if not job.pasted:
+            paste_at_cursor(output)
+
+    def on_cancel(mode):
+        try:
+            if mode == "history":
+                return
+            if mode is not None:
+                # ESC while recording: discard the recording
+                if ui:
                     ui.hide_recording()
-                except Exception:
-                    pass
+                recorder.stop()
+                current_search[0] = None
+                stream, current_stream[0] = current_stream[0], None
+                if stream:
+                    stream.cancel()
+            elif pipeline.pending:
+                # ESC while idle: drop anything not yet pasted
+                pipeline.cancel_pending()
+        except Exception:
+            pass
+
+    pipeline = PipelineExecutor(process_recording, deliver)
 
     # Start listening
     print("[DEBUG] About to start hotkey listener...", flush=True)
-    hotkey_listener = listener.start(on_start, on_stop)
+    hotkey_listener = listener.start(on_start, on_stop, on_cancel)
     print("[DEBUG] Hotkey listener started! Ready for input.", flush=True)
 
     # Run main loop (process UI events if enabled)
@@ -282,6 +491,7 @@ def main():
                 ui.process_ui_events()
             time.sleep(0.05)
     except KeyboardInterrupt:
+        pipeline.shutdown(wait=False)
         if ui:
             ui.stop_ui()
         sys.exit(0)
@@ -0,0 +1,260 @@
+"""Batch transcription of audio files - `vibetotext batch <dir|files...>`."""
+
+import argparse
+import json
+import os
+import sys
+import time
+import wave
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+AUDIO_EXTENSIONS = {".wav"}
+DEFAULT_THREADS = 2  # Per worker; several narrow workers beat one wide one on many short files
+HISTORY_CHUNK = 500  # Results queued to history per add_entries() call
+
+_transcriber = None  # Per worker process, created by _init_worker
+_n_threads = None
+
+
+def read_wav(path: Path) -> np.ndarray:
+    """
+    Read a PCM WAV file as 16kHz mono float32.
+
+    Args:
+        path: WAV file (8/16/24/32-bit integer PCM, any channel count and rate)
+
+    Returns:
+        Audio normalized to [-1, 1]
+    """
+    try:
+        with wave.open(str(path), "rb") as w:
+            channels, width, rate = w.getnchannels(), w.getsampwidth(), w.getframerate()
+            raw = w.readframes(w.getnframes())
+    except (wave.Error, EOFError) as e:
+        raise ValueError(f"not a PCM WAV file ({str(e) or 'truncated'})") from e
+
+    if width == 1:
+        audio = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif width == 2:
+        audio = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768
+    elif width == 3:
+        b = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        samples = b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16)
+        samples = np.where(samples & 0x800000, samples - (1 << 24), samples)
+        audio = samples.astype(np.float32) / (1 << 23)
+    elif width == 4:
+        audio = np.frombuffer(raw, dtype="<i4").astype(np.float32) / (1 << 31)
+    else:
+        raise ValueError(f"unsupported sample width {width}")
+
+    if channels > 1:
+        audio = audio.reshape(-1, channels).mean(axis=1)
+    if rate != SAMPLE_RATE and len(audio):
+        # Linear interpolation is plenty for speech going into Whisper
+        n_out = int(round(len(audio) * SAMPLE_RATE / rate))
+        audio = np.interp(
+            np.arange(n_out) * (rate / SAMPLE_RATE),
+            np.arange(len(audio)),
+            audio,
+        ).astype(np.float32)
+    return np.ascontiguousarray(audio, dtype=np.float32)
+
+
+def find_audio_files(paths: Iterable[str]) -> Iterator[Path]:
+    """Audio files named directly, plus those anywhere under named directories (sorted)."""
+    for name in paths:
+        path = Path(name).expanduser()
+        if path.is_dir():
+            for child in sorted(path.rglob("*")):
+                if child.suffix.lower() in AUDIO_EXTENSIONS and child.is_file():
+                    yield child
+        else:
+            yield path  # Missing/unsupported files are reported as errors in the results
+
+
+def _init_worker(model_name: str, vad: bool, n_threads: int):
+    """Load the model once per worker process."""
+    global _transcriber, _n_threads
+    # stdout may be the JSONL output: send the transcriber's logging (Python and whisper.cpp) to stderr
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    sys.stdout = sys.stderr
+    from .transcriber import Transcriber
+    _transcriber = Transcriber(model_name=model_name, vad=vad)
+    _n_threads = n_threads
+    _transcriber.preload()
+
+
+def _transcribe_file(path: str) -> dict:
+    """Transcribe one file in a worker. Errors are returned, not raised, so one bad file doesn't stop the batch."""
+    result = {"path": path}
+    try:
+        audio = read_wav(Path(path))
+        start = time.time()
+        result["text"] = _transcriber.transcribe(audio, SAMPLE_RATE, n_threads=_n_threads)
+        result["transcribe_seconds"] = round(time.time() - start, 3)
+        result["duration_seconds"] = round(len(audio) / SAMPLE_RATE, 3)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def run_batch(
+    files: List[Path],
+    model_name: str = "base",
+    workers: Optional[int] = None,
+    n_threads: int = DEFAULT_THREADS,
+    vad: bool = True,
+) -> Iterator[dict]:
+    """
+    Transcribe files in parallel worker processes, yielding results as they finish.
+
+    Each worker loads its own model and reads its own files, so only paths and
+    text cross process boundaries. At most two files per worker are in flight,
+    so arbitrarily long file lists stream through in bounded memory.
+
+    Args:
+        files: Audio files
+        model_name: Whisper model size
+        workers: Worker processes (default: cores // n_threads)
+        n_threads: whisper.cpp threads per worker
+        vad: Trim silence before inference
+
+    Yields:
+        Result dicts: path, text, duration_seconds, transcribe_seconds (or path, error), in completion order
+
+    Raises:
+        ValueError: If n_threads or workers is below 1
+    """
+    if n_threads < 1 or (workers is not None and workers < 1):
+        raise ValueError(f"n_threads and workers must be at least 1 (got {n_threads}, {workers})")
+    if workers is None:
+        workers = max(1, (os.cpu_count() or 1) // n_threads)
+    pending = iter(files)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(model_name, vad, n_threads),
+    ) as pool:
+        in_flight = set()
+        while True:
+            for path in pending:
+                in_flight.add(pool.submit(_transcribe_file, str(path)))
+                if len(in_flight) >= workers * 2:
+                    break
+            if not in_flight:
+                return
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        prog="vibetotext batch",
+        description="Transcribe WAV files in parallel and write JSON lines",
+    )
+    parser.add_argument("paths", nargs="+", help="WAV files and/or directories (searched recursively)")
+    parser.add_argument(
+        "--model",
+        default="base",
+        choices=["tiny", "base", "small", "medium", "large"],
+        help="Whisper model size (default: base)",
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=DEFAULT_THREADS,
+        help=f"whisper.cpp threads per worker (default: {DEFAULT_THREADS})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes, each with its own model (default: CPU cores / --threads)",
+    )
+    parser.add_argument("-o", "--output", default="-", help="JSONL output file (default: stdout)")
+    parser.add_argument(
+        "--history",
+        action="store_true",
+        help="Also add the transcriptions to history, timestamped with each file's modification time",
+    )
+    parser.add_argument("--mode", default="transcribe", help="History mode label (default: transcribe)")
+    parser.add_argument("--no-vad", action="store_true", help="Disable trimming silence before transcription")
+    args = parser.parse_args(argv)
+    if args.threads < 1:
+        parser.error("--threads must be at least 1")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    files = list(find_audio_files(args.paths))
+    if not files:
+        print("[BATCH] No audio files found", file=sys.stderr)
+        return 1
+    workers = args.workers if args.workers is not None else max(1, (os.cpu_count() or 1) // args.threads)
+    print(
+        f"[BATCH] {len(files)} files, {workers} workers x {args.threads} threads, model '{args.model}'",
+        file=sys.stderr,
+    )
+
+    history = None
+    if args.history:
+        from .history import TranscriptionHistory
+        history = TranscriptionHistory()
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w")
+    log_stdout = sys.stdout
+    if out is sys.stdout:
+        sys.stdout = sys.stderr  # Keep other output (e.g. history logging) out of the JSONL
+    start = time.time()
+    audio_seconds = 0.0
+    errors = 0
+    entries = []
+    try:
+        results = run_batch(files, args.model, workers, args.threads, vad=not args.no_vad)
+        for i, result in enumerate(results, 1):
+            result["model"] = args.model
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+
+            if "error" in result:
+                errors += 1
+                print(f"[BATCH] {i}/{len(files)} {result['path']}: {result['error']}", file=sys.stderr)
+                continue
+            audio_seconds += result["duration_seconds"]
+            print(f"[BATCH] {i}/{len(files)} {result['path']} ({result['duration_seconds']:.1f}s)", file=sys.stderr)
+
+            if history is not None and result["text"]:
+                entries.append({
+                    "text": result["text"],
+                    "mode": args.mode,
+                    "timestamp": datetime.fromtimestamp(os.path.getmtime(result["path"])),
+                    "duration_seconds": result["duration_seconds"],
+                })
+                if len(entries) >= HISTORY_CHUNK:
+                    history.add_entries(entries)
+                    entries = []
+    finally:
+        if history is not None:
+            history.add_entries(entries)
+            history.close()  # Waits for the writer to commit everything queued
+        sys.stdout = log_stdout
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.time() - start
+    print(
+        f"[BATCH] Done: {len(files) - errors} transcribed, {errors} failed, "
+        f"{audio_seconds:.0f}s of audio in {elapsed:.1f}s ({audio_seconds / max(elapsed, 1e-9):.1f}x real time)",
+        file=sys.stderr,
+    )
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
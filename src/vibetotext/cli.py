@@ -1,25 +1,23 @@
 """Main CLI entry point."""
 
 import argparse
-import json
 import os
 import sys
 import tempfile
 import time
 import traceback
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
-from .recorder import AudioRecorder, HotkeyListener
-from .transcriber import Transcriber
-from .context import search_context, format_context
-from .greppy import search_files, format_files_for_context
-from .llm import cleanup_text, generate_implementation_plan
-from .output import paste_at_cursor
-from .history import TranscriptionHistory
-from .history_ui import toggle_history, refresh_history
+# Highest --level-rate accepted; faster than any display refreshes
+MAX_LEVEL_RATE = 240
 
 
 def main():
+    # `vibetotext batch ...` transcribes files instead of running the hotkey loop
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        from .batch import main as batch_main
+        sys.exit(batch_main(sys.argv[2:]))
+
     parser = argparse.ArgumentParser(
         description="Voice-to-text with automatic code context injection"
     )
@@ -81,8 +79,88 @@ def main():
         action="store_true",
         help="Use hold-to-record mode instead of tap-to-toggle (default: toggle mode)",
     )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Transcribe while recording so long dictations finish quickly on release",
+    )
+    parser.add_argument(
+        "--no-vad",
+        action="store_true",
+        help="Disable trimming silence before transcription",
+    )
+    parser.add_argument(
+        "--level-rate",
+        type=float,
+        default=None,
+        help=f"Waveform updates per second, up to {MAX_LEVEL_RATE:g} (default: 30, the overlay frame rate)",
+    )
+    parser.add_argument(
+        "--stream-output",
+        action="store_true",
+        help="Paste cleanup/plan output progressively as Gemini generates it",
+    )
+    parser.add_argument(
+        "--draft-model",
+        default=None,
+        choices=["tiny", "base", "small", "medium", "large"],
+        help="Tiered mode: draft utterances under 4s of speech with this fast model and paste the draft "
+             "when it looks reliable. Otherwise the paste waits for --model: unreliable drafts are "
+             "re-transcribed first, and longer utterances skip the draft. A pasted draft is never replaced",
+    )
+    parser.add_argument(
+        "--latency-slo",
+        type=float,
+        default=None,
+        help="Route each recording to the largest model expected to transcribe it within this many "
+             "seconds, given its length, measured speed and CPU load (decisions: ~/.vibetotext/routing.jsonl)",
+    )
+    parser.add_argument(
+        "--route-models",
+        default=None,
+        help="Comma-separated model sizes --latency-slo may choose from (default: tiny,base and --model)",
+    )
+    parser.add_argument(
+        "--whisper-server",
+        action="store_true",
+        help="Keep the Whisper model loaded in a background server process that survives restarts",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Print import time per module and startup phase timings once ready",
+    )
 
     args = parser.parse_args()
+    if args.level_rate is not None and not 0 < args.level_rate <= MAX_LEVEL_RATE:
+        parser.error(f"--level-rate must be above 0 and at most {MAX_LEVEL_RATE:g}")
+    route_models = ["tiny", "base", args.model]
+    if args.route_models:
+        route_models = [name.strip() for name in args.route_models.split(",") if name.strip()]
+        unknown = set(route_models) - {"tiny", "base", "small", "medium", "large"}
+        if unknown or not route_models:
+            parser.error(f"--route-models: unknown model size(s) {', '.join(sorted(unknown)) or '(none given)'}")
+    if args.latency_slo is not None and not args.latency_slo > 0:
+        parser.error("--latency-slo must be above 0 seconds")
+
+    profiler = None
+    if args.profile_startup:
+        from .profiling import StartupProfiler
+        profiler = StartupProfiler()
+        profiler.install()
+
+    # Imported after argument parsing so --help is instant and --profile-startup sees them.
+    # Gemini (llm) is imported on the first cleanup/plan.
+    from .recorder import LEVEL_RATE, AudioRecorder, HotkeyListener
+    from .transcriber import TieredTranscriber, Transcriber, same_text
+    from .router import ModelRouter
+    from .streaming import TranscriptionStream
+    from .pipeline import PipelineExecutor
+    from .context import get_project_root, search_context, format_context
+    from .greppy import DEFAULT_CODEBASE, SpeculativeSearch, prewarm, search_files, format_files_for_context
+    from .output import paste_at_cursor, paste_stream
+    from .history import TranscriptionHistory
+    from .config import get_config
 
     # Initialize UI if enabled
     ui = None
@@ -95,20 +173,26 @@ def main():
         except Exception as e:
             print(f"UI disabled: {e}")
 
-    # Load config for saved audio device
-    config_file = Path.home() / ".vibetotext" / "config.json"
-    saved_device = None
-    try:
-        if config_file.exists():
-            with open(config_file, "r") as f:
-                config = json.load(f)
-                saved_device = config.get("audio_device_index")
-    except Exception:
-        pass
+    # Saved audio device (config.json is watched; changes from the UI apply on the next recording)
+    config = get_config()
+    saved_device = config.get("audio_device_index")
 
     # Initialize components
-    recorder = AudioRecorder(device=saved_device)
-    transcriber = Transcriber(model_name=args.model)  # Custom dictionary is hot-reloaded from config
+    if profiler:
+        profiler.mark("imports")
+    level_rate = LEVEL_RATE if args.level_rate is None else args.level_rate
+    recorder = AudioRecorder(device=saved_device, level_rate=level_rate)
+    config.subscribe(lambda cfg: setattr(recorder, "device", cfg.get("audio_device_index")))
+    if args.latency_slo:
+        transcriber = ModelRouter(route_models, args.latency_slo, vad=not args.no_vad, server=args.whisper_server)
+    else:
+        transcriber = Transcriber(model_name=args.model, vad=not args.no_vad, server=args.whisper_server)  # Custom dictionary is hot-reloaded from config
+    tiered = None
+    if args.draft_model:
+        draft = Transcriber(model_name=args.draft_model, vad=not args.no_vad, server=args.whisper_server)
+        tiered = TieredTranscriber(draft, transcriber)
+        # Runs LLM calls on the draft while the refine pass is still transcribing
+        speculation_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="vibetotext-speculate")
     history = TranscriptionHistory()
 
     # Log available audio devices
@@ -142,10 +226,12 @@ def main():
 
     # Track current mode
     current_mode = [None]  # Use list to allow mutation in nested function
+    current_stream = [None]  # Active TranscriptionStream when --streaming is on
+    current_search = [None]  # SpeculativeSearch fed by the stream in greppy mode
 
     # Set up audio level callback for UI
     if ui:
-        recorder.on_level = ui.update_waveform
+        ui.connect_recorder(recorder)
 
     if toggle_mode:
         print(f"vibetotext ready. Tap hotkey to start/stop recording, ESC to cancel.")
@@ -157,8 +243,21 @@ def main():
     print(f"  [{args.plan_hotkey}] = implementation plan with Gemini")
     print("Press Ctrl+C to exit.\n")
 
-    # Preload model
-    _ = transcriber.model
+    if profiler:
+        profiler.mark("setup (UI, audio devices, history)")
+
+    # Preload model and start the Greppy worker so the first search doesn't pay index load
+    (tiered or transcriber).preload()
+    if profiler:
+        profiler.mark("whisper model load")
+    greppy_paths = [args.codebase or DEFAULT_CODEBASE]
+    if not args.no_context:
+        greppy_paths.append(str(get_project_root()))
+    prewarm(greppy_paths)
+    if profiler:
+        profiler.mark("greppy prewarm (background)")
+        profiler.uninstall()
+        print(profiler.report(), flush=True)
 
     def on_start(mode):
         try:
@@ -168,15 +267,19 @@ def main():
             print(f"Recording ({mode_label})...", end="", flush=True)
             if ui:
                 ui.show_recording()
-            # Reload config to pick up any microphone changes from UI
-            try:
-                if config_file.exists():
-                    with open(config_file, "r") as f:
-                        cfg = json.load(f)
-                        recorder.device = cfg.get("audio_device_index")
-            except Exception:
-                pass
+            # Pick up a microphone change from the UI made since the watcher last looked (one stat)
+            config.refresh(force=True)
             recorder.start()
+            if args.streaming:
+                # Greppy mode: start searching on partial text while the user is still talking
+                search = None
+                if mode == "greppy":
+                    search = SpeculativeSearch(limit=args.greppy_limit, codebase=args.codebase)
+                current_search[0] = search
+                current_stream[0] = TranscriptionStream(
+                    transcriber, recorder.capture, sample_rate=recorder.sample_rate,
+                    on_partial=search.update if search else None,
+                )
         except Exception as e:
             error_log = os.path.join(tempfile.gettempdir(), "vibetotext_crash.log")
             error_msg = f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] Error in on_start (mode={mode}):\n"
@@ -194,20 +297,92 @@ def main():
             if ui:
                 ui.hide_recording()
             audio = recorder.stop()
+            stream, current_stream[0] = current_stream[0], None
+            search, current_search[0] = current_search[0], None
             print(" done.")
 
             if len(audio) == 0:
                 print("No audio recorded.")
+                if stream:
+                    stream.cancel()
                 return
 
-            # Transcribe
+            if stream:
+                stream.close(audio)
+
+            # Hand off to the pipeline so the hotkey listener is free immediately
+            job = pipeline.submit(mode, audio, stream, search)
+            if job is None:
+                print(f"[ERROR] {pipeline.max_pending} recordings still processing, dropping this one.")
+                if stream:
+                    stream.cancel()
+
+        except Exception as e:
+            # Log error to file and print to console
+            error_log = os.path.join(tempfile.gettempdir(), "vibetotext_crash.log")
+            error_msg = f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] Error in on_stop (mode={mode}):\n"
+            error_msg += traceback.format_exc()
+
+            with open(error_log, "a") as f:
+                f.write(error_msg + "\n")
+
+            print(f"\n[ERROR] {e}")
+            print(f"[ERROR] Full traceback logged to: {error_log}")
+
+            # Hide UI if still showing
+            if ui:
+                try:
+                    ui.hide_recording()
+                except Exception:
+                    pass
+
+    def paste_streamed(job, chunks):
+        """Paste LLM output as it streams in, once every earlier recording has been pasted."""
+        pipeline.wait_turn(job)
+        output = paste_stream(chunks, stop=lambda: job.cancelled)
+        job.pasted = bool(output)
+        return output or None
+
+    def speculate(job, draft, prefetched):
+        """Start the mode's follow-up work on a tiered draft while the refine pass runs."""
+        if job.mode == "greppy":
+            # resolve() reuses this search if the refined text mostly matches the draft
+            if job.search is None:
+                job.search = SpeculativeSearch(limit=args.greppy_limit, codebase=args.codebase)
+            job.search.update(draft)
+        elif job.mode in ("cleanup", "plan") and not args.stream_output:
+            from .llm import cleanup_text, generate_implementation_plan
+            generate = cleanup_text if job.mode == "cleanup" else generate_implementation_plan
+            prefetched[draft] = speculation_pool.submit(generate, draft)
+
+    def prefetched_result(prefetched, text):
+        """LLM output computed from the tiered draft, if the final transcript matches the draft."""
+        for draft, future in prefetched.items():
+            if same_text(draft, text):
+                return future.result()
+        return None
+
+    def process_recording(job):
+        """Transcribe and post-process one recording (runs on a pipeline worker)."""
+        mode = job.mode
+        try:
+            # Transcribe (streaming mode only has the tail left to do)
             print("Transcribing...", end="", flush=True)
-            text = transcriber.transcribe(audio)
+            stream = job.stream
+            prefetched = {}  # Tiered draft -> Future of the LLM output generated from it
+            if stream:
+                text = stream.result()
+                if stream.error:
+                    text = transcriber.transcribe(job.audio)
+            elif tiered:
+                text = tiered.transcribe(job.audio, on_draft=lambda draft: speculate(job, draft, prefetched))
+            else:
+                text = transcriber.transcribe(job.audio)
             print(" done.")
 
             if not text:
                 print("No speech detected.")
-                return
+                return None
 
             # Filter out Whisper blank audio / silence markers
             text_lower = text.strip().lower()
@@ -219,14 +394,21 @@ def main():
             )
             if text_lower in noise_markers:
                 print("No speech detected (blank audio).")
-                return
+                return None
 
             print(f"Transcribed: {text}")
+            job.text = text
+
+            if job.cancelled:
+                return None
 
             if mode == "greppy":
                 # Greppy mode: search for relevant files and attach them
                 print("Searching with Greppy...", end="", flush=True)
-                files = search_files(text, limit=args.greppy_limit, codebase=args.codebase)
+                if job.search:
+                    files = job.search.resolve(text)
+                else:
+                    files = search_files(text, limit=args.greppy_limit, codebase=args.codebase)
                 print(f" found {len(files)} files.")
 
                 if files:
@@ -240,7 +422,11 @@ def main():
             elif mode == "cleanup":
                 # Cleanup mode: use Gemini to refine rambling into clear prompt
                 print("Cleaning up with Gemini...", end="", flush=True)
-                refined = cleanup_text(text)
+                from .llm import cleanup_text, stream_cleanup_text
+                if args.stream_output:
+                    refined = paste_streamed(job, stream_cleanup_text(text))
+                else:
+                    refined = prefetched_result(prefetched, text) or cleanup_text(text)
                 if refined:
                     print(" done.")
                     print(f"Refined: {refined[:100]}..." if len(refined) > 100 else f"Refined: {refined}")
@@ -252,7 +438,11 @@ def main():
             elif mode == "plan":
                 # Plan mode: use Gemini to generate implementation plan
                 print("Generating implementation plan...", end="", flush=True)
-                plan = generate_implementation_plan(text)
+                from .llm import generate_implementation_plan, stream_implementation_plan
+                if args.stream_output:
+                    plan = paste_streamed(job, stream_implementation_plan(text))
+                else:
+                    plan = prefetched_result(prefetched, text) or generate_implementation_plan(text)
                 if plan:
                     print(" done.")
                     print(f"Plan: {plan[:150]}..." if len(plan) > 150 else f"Plan: {plan}")
@@ -272,18 +462,12 @@ def main():
                 else:
                     output = text
 
-            # Save to history
-            history.add_entry(text, mode)
-            print(f"[DEBUG] Saved to history: {text[:50]}... mode={mode}")
-
-            # Paste at cursor
-            paste_at_cursor(output)
-            print("Pasted at cursor.\n")
+            return output
 
         except Exception as e:
             # Log error to file and print to console
             error_log = os.path.join(tempfile.gettempdir(), "vibetotext_crash.log")
-            error_msg = f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] Error in on_stop (mode={mode}):\n"
+            error_msg = f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] Error processing recording (mode={mode}):\n"
             error_msg += traceback.format_exc()
 
             with open(error_log, "a") as f:
@@ -291,16 +475,44 @@ def main():
 
             print(f"\n[ERROR] {e}")
             print(f"[ERROR] Full traceback logged to: {error_log}")
-
-            # Hide UI if still showing
-            if ui:
-                try:
+            return None
+
+    def deliver(job, output):
+        """Save and paste a finished recording (called in recording order)."""
+        # Save to history
+        history.add_entry(job.text, job.mode)
+        print(f"[DEBUG] Saved to history: {job.text[:50]}... mode={job.mode}")
+
+        # Paste at cursor (streamed output is already there)
+        if job.pasted:
+            print("Streamed to cursor.\n")
+            return
+        paste_at_cursor(output)
+        print("Pasted at cursor.\n")
+
+    def on_cancel(mode):
+        try:
+            if mode is not None:
+                # ESC while recording: discard the recording
+                if ui:
                     ui.hide_recording()
-                except Exception:
-                    pass
+                recorder.stop()
+                current_search[0] = None
+                stream, current_stream[0] = current_stream[0], None
+                if stream:
+                    stream.cancel()
+                print(" canceled.")
+            elif pipeline.pending:
+                # ESC while idle: drop anything not yet pasted
+                canceled = pipeline.cancel_pending()
+                print(f"[PIPELINE] Canceled {canceled} pending recording(s).")
+        except Exception as e:
+            print(f"\n[ERROR] Failed to cancel: {e}")
+
+    pipeline = PipelineExecutor(process_recording, deliver)
 
     # Start listening
-    hotkey_listener = listener.start(on_start, on_stop)
+    hotkey_listener = listener.start(on_start, on_stop, on_cancel)
 
     # Run main loop (process UI events if enabled)
     try:
@@ -310,6 +522,7 @@ def main():
             time.sleep(0.05)
     except KeyboardInterrupt:
         print("\nExiting.")
+        pipeline.shutdown(wait=False)
         if ui:
             ui.stop_ui()
         sys.exit(0)
@@ -0,0 +1,149 @@
+"""Shared, hot-reloaded view of ~/.vibetotext/config.json."""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, List, Optional
+
+CONFIG_PATH = Path.home() / ".vibetotext" / "config.json"
+
+
+class ConfigService:
+    """
+    Parsed config.json, reloaded only when the file changes.
+
+    Change detection is a stat() of the file (mtime, size, inode), done at
+    most every CHECK_INTERVAL seconds on access, so readers on hot paths (every
+    transcription, every hotkey press) no longer open and parse the file.
+    Subscribers are called with the new config after each reload; a
+    background watcher (started with the first subscriber) makes sure they
+    hear about edits even when nothing is reading. version increments on every
+    reload, for callers that cache values derived from the config.
+
+    The history app writes the file while we may be reading it; a file that
+    doesn't parse keeps the previous values and is retried on the next check.
+    """
+
+    CHECK_INTERVAL = 0.5
+    WATCH_INTERVAL = 1.0
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Args:
+            path: Config file. Defaults to ~/.vibetotext/config.json
+        """
+        self.path = Path(path) if path is not None else CONFIG_PATH
+        self.version = 0
+        self._data = {}
+        self._signature = None  # (mtime_ns, size, inode) of the loaded file; None = missing
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+        self._subscribers: List[Callable[[dict], None]] = []
+        self._watcher = None
+        self.refresh(force=True)
+
+    def _stat_signature(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Reload the file if it changed since the last load.
+
+        Args:
+            force: Check now even if the last check was less than CHECK_INTERVAL ago
+
+        Returns:
+            True if the config was reloaded
+        """
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last_check < self.CHECK_INTERVAL:
+                return False
+            self._last_check = now
+            signature = self._stat_signature()
+            if signature == self._signature and self.version:
+                return False
+
+            if signature is None:
+                data = {}
+            else:
+                try:
+                    with open(self.path, "r") as f:
+                        data = json.load(f)
+                    if not isinstance(data, dict):
+                        raise ValueError("top level is not an object")
+                except (OSError, ValueError) as e:
+                    print(f"[CONFIG] Could not read {self.path} ({e}), keeping previous settings")
+                    return False  # Signature not updated, so the next check retries
+            self._data = data
+            self._signature = signature
+            self.version += 1
+            subscribers = list(self._subscribers)
+
+        for callback in subscribers:
+            try:
+                callback(data)
+            except Exception as e:
+                print(f"[CONFIG] Subscriber failed: {e}")
+        return True
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """A config value (checks the file for changes first, at most every CHECK_INTERVAL)."""
+        self.refresh()
+        return self._data.get(key, default)
+
+    @property
+    def data(self) -> dict:
+        """The whole config (checks the file for changes first). Don't mutate it."""
+        self.refresh()
+        return self._data
+
+    def snapshot(self) -> tuple:
+        """(version, config) as a consistent pair (checks the file for changes first)."""
+        self.refresh()
+        with self._lock:
+            return self.version, self._data
+
+    def subscribe(self, callback: Callable[[dict], None]) -> Callable[[dict], None]:
+        """
+        Call callback(config) after every reload, and start the background watcher.
+
+        Returns:
+            callback, for unsubscribe()
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+            if self._watcher is None:
+                self._watcher = threading.Thread(target=self._watch, name="vibetotext-config", daemon=True)
+                self._watcher.start()
+        return callback
+
+    def unsubscribe(self, callback: Callable[[dict], None]):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def _watch(self):
+        while True:
+            time.sleep(self.WATCH_INTERVAL)
+            self.refresh()
+
+
+_config = None
+_config_lock = threading.Lock()
+
+
+def get_config() -> ConfigService:
+    """The shared ConfigService for ~/.vibetotext/config.json."""
+    global _config
+    if _config is None:
+        with _config_lock:
+            if _config is None:
+                _config = ConfigService()
+    return _config
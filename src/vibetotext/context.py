@@ -1,10 +1,11 @@
 """Greppy integration for code context."""
 
 import subprocess
-import json
 from pathlib import Path
 from typing import List, Optional
 
+from .greppy import run_search
+
 
 def get_project_root() -> Optional[Path]:
     """Get current project root (git root or cwd)."""
@@ -34,42 +35,17 @@ def search_context(query: str, limit: int = 5) -> List[dict]:
     """
     project_root = get_project_root()
 
-    try:
-        # Rust greppy: query first, then options, use --json for reliable parsing
-        result = subprocess.run(
-            ["greppy", "search", query, "-n", str(limit), "-p", str(project_root), "--json"],
-            capture_output=True,
-            text=True,
-            timeout=30,
-        )
+    snippets = []
+    for item in run_search(query, limit, str(project_root)):
+        filepath = item.get("file_path", "")
+        start_line = item.get("start_line", 1)
+        end_line = item.get("end_line", start_line)
+        content = item.get("content", "")
+
+        header = f"{filepath}:{start_line}-{end_line}"
+        snippets.append({"header": header, "content": content.split("\n")})
 
-        if result.returncode != 0:
-            return []
-
-        # Parse JSON output (one object per line)
-        snippets = []
-        for line in result.stdout.strip().split("\n"):
-            if not line.strip():
-                continue
-            try:
-                item = json.loads(line)
-                filepath = item.get("file_path", "")
-                start_line = item.get("start_line", 1)
-                end_line = item.get("end_line", start_line)
-                content = item.get("content", "")
-
-                header = f"{filepath}:{start_line}-{end_line}"
-                snippets.append({"header": header, "content": content.split("\n")})
-            except json.JSONDecodeError:
-                continue
-
-        return snippets
-
-    except subprocess.TimeoutExpired:
-        return []
-    except FileNotFoundError:
-        # Greppy not installed
-        return []
+    return snippets
 
 
 def format_context(snippets: List[dict]) -> str:
@@ -1,13 +1,328 @@
 """Greppy semantic search integration (Rust CLI)."""
 
+import atexit
+import itertools
 import json
+import os
+import queue
+import shlex
 import subprocess
-from typing import List, Tuple
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Tuple
 
 
 # Default codebase path (will be configurable later)
 DEFAULT_CODEBASE = "/Users/dylan/Desktop/projects/datafeeds"
 
+# Long-lived greppy worker: reads one JSON request per line on stdin and answers
+# each with one JSON line on stdout. Set GREPPY_WORKER_CMD="" to always use one-shot searches.
+WORKER_COMMAND = os.environ.get("GREPPY_WORKER_CMD", "greppy serve --stdio")
+
+SEARCH_TIMEOUT = 30
+WARMUP_TIMEOUT = 300  # The worker's first response waits for the index to load
+READ_WORKERS = 4
+CONTENT_CACHE_BYTES = 8 * 1024 * 1024
+
+# Shared by speculative searches and parallel file reads
+_pool = ThreadPoolExecutor(max_workers=READ_WORKERS, thread_name_prefix="vibetotext-greppy")
+
+
+class GreppyWorker:
+    """
+    Keeps one greppy process (and its loaded index) alive across queries.
+
+    Protocol, one JSON object per line:
+        -> {"id": 1, "op": "search", "query": "...", "limit": 10, "path": "/repo"}
+        <- {"id": 1, "results": [{"file_path": ..., "start_line": ..., "end_line": ..., "content": ...}]}
+        -> {"id": 2, "op": "warm", "path": "/repo"}
+        <- {"id": 2, "ok": true}
+    Errors come back as {"id": n, "error": "..."}.
+
+    A new process is sent a warm request first and is ready once it answers,
+    which may take up to warmup_timeout while it loads the index. That wait
+    happens on a background thread (or in warm()) without holding the request
+    lock; until the process is ready, search() returns None at once so the
+    query falls back to a one-shot search. Requests to a ready process wait
+    timeout. A process that crashes or stops responding is killed and a
+    replacement started and warmed in the background, and the current query
+    falls back. If the worker can't be started, or exits before ever answering
+    (a greppy build without worker mode), search() returns None for
+    RETRY_SECONDS so callers don't pay a failed spawn on every query.
+    """
+
+    RETRY_SECONDS = 60
+
+    def __init__(
+        self,
+        command: Optional[str] = None,
+        timeout: float = SEARCH_TIMEOUT,
+        warmup_timeout: float = WARMUP_TIMEOUT,
+    ):
+        """
+        Args:
+            command: Worker command line (defaults to WORKER_COMMAND)
+            timeout: Seconds to wait for each response
+            warmup_timeout: Seconds to wait for a new process's first response
+        """
+        self.command = shlex.split(command if command is not None else WORKER_COMMAND)
+        self.timeout = timeout
+        self.warmup_timeout = warmup_timeout
+        self._proc = None
+        self._lines = None
+        self._ready = False  # Has the current process answered its warm-up request?
+        self._warmed = threading.Event()  # Set when the current process's warm-up ends, either way
+        self._next_id = 0
+        self._retry_at = 0.0
+        self._lock = threading.Lock()  # One request in flight at a time
+
+    @property
+    def alive(self) -> bool:
+        return self._proc is not None and self._proc.poll() is None
+
+    def _start(self) -> bool:
+        """Spawn the worker process. Returns False if it couldn't be started."""
+        if not self.command or time.time() < self._retry_at:
+            return False
+        try:
+            self._proc = subprocess.Popen(
+                self.command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                bufsize=1,
+            )
+        except (FileNotFoundError, OSError) as e:
+            print(f"[GREPPY] Could not start worker ({e}), using one-shot searches")
+            self._proc = None
+            self._retry_at = time.time() + self.RETRY_SECONDS
+            return False
+
+        # Read stdout on a thread so responses can be waited on with a timeout
+        self._ready = False
+        self._warmed = threading.Event()
+        self._lines = queue.Queue()
+        threading.Thread(target=self._read_stdout, args=(self._proc, self._lines), daemon=True).start()
+        return True
+
+    @staticmethod
+    def _read_stdout(proc, lines):
+        for line in proc.stdout:
+            lines.put(line)
+        lines.put(None)  # EOF - process exited
+
+    def _kill(self):
+        if self._proc is not None:
+            try:
+                self._proc.kill()
+                self._proc.wait(timeout=1)
+            except Exception:
+                pass
+        self._proc = None
+
+    def _send(self, payload: dict) -> int:
+        """Write one request. Caller holds the lock. Returns the request id."""
+        self._next_id += 1
+        self._proc.stdin.write(json.dumps({"id": self._next_id, **payload}) + "\n")
+        self._proc.stdin.flush()
+        return self._next_id
+
+    @staticmethod
+    def _wait(lines: queue.Queue, request_id: int, timeout: float) -> dict:
+        """Wait for the response to request_id, skipping anything else the process prints."""
+        deadline = time.time() + timeout
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                raise TimeoutError("greppy worker did not respond")
+            try:
+                line = lines.get(timeout=remaining)
+            except queue.Empty:
+                raise TimeoutError("greppy worker did not respond") from None
+            if line is None:
+                raise EOFError("greppy worker exited")
+            try:
+                response = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Ignore stray log output
+            if response.get("id") == request_id:
+                return response
+
+    def _start_warming(self, path: str):
+        """Start a worker and warm it for path on a background thread. Caller holds the lock."""
+        if self._start():
+            threading.Thread(target=self._warm_up, args=(path,), daemon=True).start()
+
+    def _warm_up(self, path: str) -> bool:
+        """
+        Send a new process its warm request and wait for the answer without holding the lock.
+
+        Nothing else reads the process's output meanwhile: requests only go to a ready process.
+        """
+        with self._lock:
+            proc, lines, warmed = self._proc, self._lines, self._warmed
+            if proc is None:
+                warmed.set()
+                return False
+            try:
+                request_id = self._send({"op": "warm", "path": path})
+            except OSError:
+                request_id = None  # Already exited; _wait sees the EOF
+        try:
+            response = self._wait(lines, request_id, self.warmup_timeout)
+        except (TimeoutError, EOFError) as e:
+            with self._lock:
+                if self._proc is proc:  # Not already replaced or closed
+                    self._kill()
+                    if isinstance(e, EOFError):
+                        # Exited before ever answering: no worker mode, or it can't load the index
+                        print(f"[GREPPY] Worker unavailable ({e}), using one-shot searches")
+                        self._retry_at = time.time() + self.RETRY_SECONDS
+                    else:
+                        print(f"[GREPPY] Worker {e} while loading the index, restarting it on the next query")
+            return False
+        finally:
+            warmed.set()
+        with self._lock:
+            if self._proc is proc:
+                self._ready = True
+        return "error" not in response
+
+    def _call(self, payload: dict) -> Optional[dict]:
+        """
+        Send a request to the ready worker.
+
+        Returns None (use a one-shot search) if there isn't one: a missing worker
+        is started and warmed in the background, and one still warming is left to it.
+        """
+        with self._lock:
+            if not self.alive:
+                self._start_warming(payload["path"])
+                return None
+            if not self._ready:
+                return None
+            try:
+                return self._wait(self._lines, self._send(payload), self.timeout)
+            except (TimeoutError, EOFError, OSError) as e:
+                # Hung or crashed: replace it in the background rather than make this query wait for a reload
+                print(f"[GREPPY] Worker failed ({e}), restarting it")
+                self._kill()
+                self._start_warming(payload["path"])
+                return None
+
+    def search(self, query: str, limit: int, path: str) -> Optional[List[dict]]:
+        """
+        Run a search on the worker.
+
+        Returns:
+            Raw result dicts, or None if the worker is unavailable or still loading the index
+        """
+        response = self._call({"op": "search", "query": query, "limit": limit, "path": path})
+        if response is None or "error" in response:
+            return None
+        return response.get("results", [])
+
+    def warm(self, path: str) -> bool:
+        """
+        Start the worker and have it load the index for path ahead of the first query.
+
+        Waits for the load (up to warmup_timeout) without blocking searches,
+        which fall back to one-shot searches until the worker is ready.
+        """
+        with self._lock:
+            started = not self.alive
+            if started and not self._start():
+                return False
+            warmed = self._warmed
+        if started:
+            return self._warm_up(path)
+        warmed.wait(self.warmup_timeout)  # Already set if the process is ready
+        if not self._ready:
+            return False
+        # Ready: have it load this path's index too (if it warmed for another path)
+        response = self._call({"op": "warm", "path": path})
+        return response is not None and "error" not in response
+
+    def close(self):
+        with self._lock:
+            if self._proc is not None:
+                try:
+                    self._proc.stdin.close()
+                except Exception:
+                    pass
+            self._kill()
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def get_worker() -> GreppyWorker:
+    """Shared worker used by search_files and context.search_context."""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = GreppyWorker()
+            atexit.register(_worker.close)
+        return _worker
+
+
+def prewarm(paths: List[str]):
+    """Start the worker and load indexes in the background so the first query is fast."""
+    def warm_all():
+        worker = get_worker()
+        for path in paths:
+            if worker.warm(str(path)):
+                print(f"[GREPPY] Worker warmed for {path}")
+
+    threading.Thread(target=warm_all, daemon=True).start()
+
+
+def run_search(query: str, limit: int, path: str) -> List[dict]:
+    """
+    Run a Greppy search, preferring the persistent worker.
+
+    Falls back to a one-shot `greppy search --json` subprocess if the worker
+    is unavailable.
+
+    Returns:
+        Raw result dicts (file_path, start_line, end_line, content)
+    """
+    results = get_worker().search(query, limit, path)
+    if results is not None:
+        return results
+
+    try:
+        # Rust greppy: query first, then options
+        result = subprocess.run(
+            ["greppy", "search", query, "-n", str(limit), "-p", path, "--json"],
+            capture_output=True,
+            text=True,
+            timeout=SEARCH_TIMEOUT
+        )
+    except subprocess.TimeoutExpired:
+        return []
+    except FileNotFoundError:
+        return []
+
+    if result.returncode != 0:
+        return []
+
+    # Parse JSON output (one object per line)
+    items = []
+    for line in result.stdout.strip().split("\n"):
+        if not line.strip():
+            continue
+        try:
+            items.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return items
+
 
 def search_files(query: str, limit: int = 10, codebase: str = None) -> List[Tuple[str, int]]:
     """
@@ -24,42 +339,152 @@ def search_files(query: str, limit: int = 10, codebase: str = None) -> List[Tupl
     if codebase is None:
         codebase = DEFAULT_CODEBASE
 
-    try:
-        # Rust greppy: query first, then options
-        result = subprocess.run(
-            ["greppy", "search", query, "-n", str(limit), "-p", codebase, "--json"],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
+    files = []
+    seen_files = set()
 
-        if result.returncode != 0:
-            return []
+    for item in run_search(query, limit, codebase):
+        filepath = item.get("file_path", "")
+        line_num = item.get("start_line", 1)
 
-        files = []
-        seen_files = set()
+        if filepath and filepath not in seen_files:
+            seen_files.add(filepath)
+            files.append((filepath, line_num))
 
-        # Parse JSON output (one object per line)
-        for line in result.stdout.strip().split("\n"):
-            if not line.strip():
-                continue
-            try:
-                item = json.loads(line)
-                filepath = item.get("file_path", "")
-                line_num = item.get("start_line", 1)
+    return files[:limit]
 
-                if filepath and filepath not in seen_files:
-                    seen_files.add(filepath)
-                    files.append((filepath, line_num))
-            except json.JSONDecodeError:
-                continue
 
-        return files[:limit]
+def _words(text: str) -> set:
+    return {w.strip(".,!?;:'\"()[]{}").lower() for w in text.split()} - {""}
 
-    except subprocess.TimeoutExpired:
-        return []
-    except FileNotFoundError:
-        return []
+
+class SpeculativeSearch:
+    """
+    Runs Greppy on partial transcript text while transcription is still finishing.
+
+    Feed it partial text with update() as streaming windows complete; the latest
+    text is searched in the background (one search at a time, newest query wins).
+    resolve() reuses the speculative result when the partial text already covers
+    most of the final transcript, so the critical path becomes
+    max(search, transcription tail) rather than their sum.
+    """
+
+    REUSE_THRESHOLD = 0.8  # Fraction of final-transcript words the speculative query must contain
+
+    def __init__(self, limit: int = 10, codebase: str = None):
+        self.limit = limit
+        self.codebase = codebase
+        self._lock = threading.Lock()
+        self._query = None  # Query of the most recently started search
+        self._future: Optional[Future] = None
+        self._next = None  # Newer query waiting for the running search to finish
+
+    def update(self, query: str):
+        """Search for query in the background (non-blocking)."""
+        with self._lock:
+            if not query or query == self._query:
+                return
+            if self._future is not None and not self._future.done():
+                self._next = query
+                return
+            self._start(query)
+
+    def _start(self, query: str):
+        """Start a search. Caller holds the lock."""
+        self._query = query
+        self._next = None
+        self._future = _pool.submit(search_files, query, self.limit, self.codebase)
+        self._future.add_done_callback(self._on_done)
+
+    def _on_done(self, future: Future):
+        with self._lock:
+            if self._next is not None:
+                self._start(self._next)
+
+    def resolve(self, final_query: str) -> List[Tuple[str, int]]:
+        """
+        Get results for the final transcript, reusing the speculative search when close enough.
+
+        Args:
+            final_query: The finished transcript
+
+        Returns:
+            List of (filepath, line_number) tuples
+        """
+        with self._lock:
+            self._next = None  # Not started yet, so no faster than searching the final text
+            query, future = self._query, self._future
+
+        if future is not None:
+            final_words = _words(final_query)
+            coverage = len(final_words & _words(query)) / max(1, len(final_words))
+            if coverage >= self.REUSE_THRESHOLD:
+                try:
+                    files = future.result(timeout=SEARCH_TIMEOUT)
+                    print(f"[GREPPY] Reusing speculative search ({coverage:.0%} of final query)")
+                    return files
+                except Exception:
+                    pass
+
+        return search_files(final_query, limit=self.limit, codebase=self.codebase)
+
+
+class FileContentCache:
+    """
+    Bounded LRU cache of file heads for format_files_for_context.
+
+    Entries are validated against the file's (mtime, size) on every lookup, so
+    an edited file is re-read, and evicted least-recently-used first once the
+    cached text exceeds max_bytes. Only the first max_lines lines are ever read.
+    """
+
+    def __init__(self, max_bytes: int = CONTENT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # (path, max_lines) -> (mtime_ns, size, content)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, filepath: str, max_lines: int) -> str:
+        """Return the first max_lines lines of filepath (raises OSError if unreadable)."""
+        stat = os.stat(filepath)
+        key = (filepath, max_lines)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+
+        # Stream just the lines we need (plus one to detect truncation)
+        with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+            lines = list(itertools.islice(f, max_lines + 1))
+
+        content = ''.join(lines[:max_lines])
+        if len(lines) > max_lines:
+            content += f"\n... (truncated at {max_lines} lines)"
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old[2])
+            self._entries[key] = (stat.st_mtime_ns, stat.st_size, content)
+            self._bytes += len(content)
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted[2])
+
+        return content
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+_content_cache = FileContentCache()
 
 
 def read_file_content(filepath: str, max_lines: int = 500) -> str:
@@ -74,18 +499,7 @@ def read_file_content(filepath: str, max_lines: int = 500) -> str:
         File content as string
     """
     try:
-        path = Path(filepath)
-        if not path.exists():
-            return ""
-
-        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-            lines = f.readlines()[:max_lines]
-
-        content = ''.join(lines)
-        if len(lines) == max_lines:
-            content += f"\n... (truncated at {max_lines} lines)"
-
-        return content
+        return _content_cache.get(filepath, max_lines)
     except Exception:
         return ""
 
@@ -104,9 +518,11 @@ def format_files_for_context(files: List[Tuple[str, int]], max_lines_per_file: i
     if not files:
         return ""
 
+    # Read the hit list in parallel
+    contents = _pool.map(lambda f: read_file_content(f[0], max_lines=max_lines_per_file), files)
+
     parts = []
-    for filepath, line_num in files:
-        content = read_file_content(filepath, max_lines=max_lines_per_file)
+    for (filepath, line_num), content in zip(files, contents):
         if content:
             # Use relative path if possible
             try:
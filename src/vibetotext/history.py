@@ -1,13 +1,16 @@
 """Transcription history storage and analytics using SQLite."""
 
+import atexit
 import json
+import queue
+import re
 import sqlite3
 import threading
 from collections import Counter
 from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional, Tuple
 
 
 # Common English stopwords to exclude from word frequency
@@ -32,8 +35,106 @@ STOPWORDS = {
 }
 
 
+def _tokenize(text: str) -> List[str]:
+    """Split text into lowercase words for frequency analysis, dropping stopwords and short words."""
+    words = text.lower().split()
+    words = [w.strip(".,!?;:'\"()[]{}") for w in words]
+    return [w for w in words if w and len(w) > 2 and w not in STOPWORDS]
+
+
+class _ConnectionManager:
+    """
+    Long-lived SQLite connections for one database in WAL mode.
+
+    A single writer connection (serialized by a lock) and a small pool of
+    read-only connections. With WAL, readers see a consistent snapshot
+    without blocking the writer and vice versa, so the analytics queries
+    and history inserts no longer contend, and no operation pays connect cost.
+    """
+
+    READ_POOL_SIZE = 4
+    CACHE_SIZE_KB = 8192
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._writer = self._connect(isolation_level="IMMEDIATE")  # Acquire lock immediately on write
+        self._writer.execute("PRAGMA journal_mode=WAL")
+        self._write_lock = threading.Lock()
+
+        self._readers = queue.LifoQueue()
+        self._all_readers = []
+        self._pool_lock = threading.Lock()
+
+    def _connect(self, isolation_level=None) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            str(self.path),
+            timeout=30.0,  # Wait up to 30 seconds for locks
+            isolation_level=isolation_level,
+            check_same_thread=False,  # Shared across threads, guarded by the manager
+        )
+        conn.row_factory = sqlite3.Row
+        # NORMAL is durable across application crashes in WAL mode; only an OS crash can lose the last commits
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA cache_size=-{self.CACHE_SIZE_KB}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
+    @contextmanager
+    def write(self):
+        """Exclusive use of the writer connection. Rolls back if the block raises."""
+        with self._write_lock:
+            try:
+                yield self._writer
+            except BaseException:
+                self._writer.rollback()
+                raise
+
+    @contextmanager
+    def read(self):
+        """Borrow a reader connection from the pool (autocommit, so every query sees the latest commit)."""
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            with self._pool_lock:
+                if len(self._all_readers) < self.READ_POOL_SIZE:
+                    conn = self._connect()
+                    self._all_readers.append(conn)
+                else:
+                    conn = None
+            if conn is None:
+                conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    def close(self):
+        with self._write_lock:
+            self._writer.close()
+        with self._pool_lock:
+            for conn in self._all_readers:
+                conn.close()
+            self._all_readers.clear()
+
+
 class TranscriptionHistory:
-    """Manages persistent storage of transcription history using SQLite."""
+    """Manages persistent storage of transcription history using SQLite.
+
+    Inserts are queued and written by a single background thread in batches
+    (one transaction per batch), so add_entry never blocks the caller.
+    Call flush() to wait for queued entries, and close() on exit.
+    """
+
+    MAX_BATCH = 500
+    BACKFILL_CHUNK = 5000
+    # Bump when the derived tables' contents change so they get rebuilt from entries
+    WORD_COUNTS_VERSION = "1"
+    ROLLUPS_VERSION = "1"
+    FTS_VERSION = "1"
+    # Queries with a word matching more entries than this return the newest matches instead
+    # of bm25-ranked ones: ranking reads every match of every word, too slow for common words
+    SEARCH_RANK_LIMIT = 2000
+    TYPING_WPM = 40  # Baseline for time-saved estimates
 
     def __init__(self, path: Optional[Path] = None):
         """
@@ -45,12 +146,32 @@ class TranscriptionHistory:
         if path is None:
             path = Path.home() / ".vibetotext" / "history.db"
         self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connections = _ConnectionManager(self.path)
+        self._fts = False  # Set by _ensure_storage if this SQLite build has FTS5
         self._ensure_storage()
+
+        with self._read_connection() as conn:
+            self._row_count = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+        # Single background writer draining queued rows (and flush markers)
+        self._queue = queue.Queue()
+        self._closed = False
+        self._writer = threading.Thread(target=self._writer_loop, name="vibetotext-history-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+        if self._get_meta("word_counts_version") != self.WORD_COUNTS_VERSION:
+            self._queue.put(self._backfill_word_counts)
+        if self._get_meta("rollups_version") != self.ROLLUPS_VERSION:
+            self._queue.put(self._backfill_rollups)
+        if self._fts and self._get_meta("fts_version") != self.FTS_VERSION:
+            self._queue.put(self._rebuild_fts)
+
         self._migrate_from_json()
 
     def _ensure_storage(self):
-        """Create storage directory and database if they don't exist."""
-        self.path.parent.mkdir(parents=True, exist_ok=True)
+        """Create the database schema if it doesn't exist."""
         with self._get_connection() as conn:
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS entries (
@@ -63,11 +184,98 @@ class TranscriptionHistory:
                     wpm INTEGER
                 )
             """)
+            # (timestamp, id) keys keyset pagination; id breaks ties between equal timestamps
+            conn.execute("DROP INDEX IF EXISTS idx_timestamp")
             conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_timestamp ON entries(timestamp DESC)
+                CREATE INDEX IF NOT EXISTS idx_timestamp_id ON entries(timestamp, id)
             """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_mode_timestamp_id ON entries(mode, timestamp, id)
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+            """)
+            # Word frequency, maintained at insert time by the writer thread
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS word_counts (
+                    word TEXT NOT NULL,
+                    mode TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    PRIMARY KEY (word, mode, day)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_word_counts_mode_day ON word_counts(mode, day)
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS word_totals (
+                    word TEXT PRIMARY KEY,
+                    count INTEGER NOT NULL
+                ) WITHOUT ROWID
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_word_totals_count ON word_totals(count DESC)
+            """)
+            # Per-day rollups (by mode), maintained at insert time so statistics don't scan entries
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS daily_stats (
+                    day TEXT NOT NULL,
+                    mode TEXT NOT NULL,
+                    sessions INTEGER NOT NULL,
+                    words INTEGER NOT NULL,
+                    duration_seconds REAL NOT NULL,
+                    words_with_duration INTEGER NOT NULL,
+                    wpm_sum INTEGER NOT NULL,
+                    wpm_count INTEGER NOT NULL,
+                    max_wpm INTEGER,
+                    longest_session REAL,
+                    PRIMARY KEY (day, mode)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("DROP TABLE IF EXISTS hourly_stats")  # Former hour-of-week rollup, never read
             conn.commit()
 
+            try:
+                self._ensure_fts(conn)
+                conn.commit()
+                self._fts = True
+            except sqlite3.OperationalError as e:
+                conn.rollback()
+                print(f"[HISTORY] Full-text search unavailable ({e}), falling back to LIKE")
+
+    @staticmethod
+    def _ensure_fts(conn: sqlite3.Connection):
+        """Create the FTS5 index over entries.text, kept in sync by triggers."""
+        # External content: the index stores only tokens, text is read back from entries
+        conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+                text,
+                content='entries',
+                content_rowid='id',
+                tokenize='porter unicode61'
+            )
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS entries_fts_insert AFTER INSERT ON entries BEGIN
+                INSERT INTO entries_fts(rowid, text) VALUES (new.id, new.text);
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS entries_fts_delete AFTER DELETE ON entries BEGIN
+                INSERT INTO entries_fts(entries_fts, rowid, text) VALUES ('delete', old.id, old.text);
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS entries_fts_update AFTER UPDATE OF text ON entries BEGIN
+                INSERT INTO entries_fts(entries_fts, rowid, text) VALUES ('delete', old.id, old.text);
+                INSERT INTO entries_fts(rowid, text) VALUES (new.id, new.text);
+            END
+        """)
+
     def _migrate_from_json(self):
         """Migrate existing JSON history to SQLite (one-time operation)."""
         json_path = self.path.with_suffix(".json")
@@ -75,10 +283,8 @@ class TranscriptionHistory:
             return
 
         # Check if we already have entries (don't migrate twice)
-        with self._get_connection() as conn:
-            count = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
-            if count > 0:
-                return
+        if self._row_count > 0:
+            return
 
         try:
             with open(json_path, "r") as f:
@@ -90,20 +296,10 @@ class TranscriptionHistory:
 
             print(f"[HISTORY] Migrating {len(entries)} entries from JSON to SQLite...")
 
-            with self._get_connection() as conn:
-                for entry in entries:
-                    conn.execute("""
-                        INSERT INTO entries (text, mode, timestamp, word_count, duration_seconds, wpm)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    """, (
-                        entry.get("text", ""),
-                        entry.get("mode", "transcribe"),
-                        entry.get("timestamp", datetime.now().isoformat()),
-                        entry.get("word_count", len(entry.get("text", "").split())),
-                        entry.get("duration_seconds"),
-                        entry.get("wpm"),
-                    ))
-                conn.commit()
+            self.add_entries(entries)
+            if not self.flush(timeout=60):
+                print("[HISTORY] Migration timed out, keeping JSON file")
+                return
 
             # Rename old JSON file as backup
             backup_path = json_path.with_suffix(".json.migrated")
@@ -113,19 +309,228 @@ class TranscriptionHistory:
         except Exception as e:
             print(f"[HISTORY] Migration failed: {e}")
 
-    @contextmanager
     def _get_connection(self):
-        """Get a database connection with proper settings."""
-        conn = sqlite3.connect(
-            str(self.path),
-            timeout=30.0,  # Wait up to 30 seconds for locks
-            isolation_level="IMMEDIATE",  # Acquire lock immediately on write
-        )
-        conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-        finally:
-            conn.close()
+        """Get the shared writer connection (use as a context manager)."""
+        return self._connections.write()
+
+    def _read_connection(self):
+        """Get a pooled reader connection (use as a context manager)."""
+        return self._connections.read()
+
+    @staticmethod
+    def _make_row(
+        text: str,
+        mode: str,
+        timestamp=None,
+        duration_seconds: Optional[float] = None,
+        word_count: Optional[int] = None,
+        wpm: Optional[int] = None,
+    ) -> tuple:
+        """Build an entries row, filling in word count and WPM."""
+        if timestamp is None:
+            timestamp = datetime.now()
+        if isinstance(timestamp, datetime):
+            timestamp = timestamp.isoformat()
+
+        if word_count is None:
+            word_count = len(text.split())
+
+        # Calculate WPM if we have duration
+        if wpm is None and duration_seconds and duration_seconds > 0:
+            minutes = duration_seconds / 60
+            wpm = round(word_count / minutes) if minutes > 0 else None
+
+        return (text, mode, timestamp, word_count, duration_seconds, wpm)
+
+    def _writer_loop(self):
+        """Drain the queue, inserting everything that has piled up in one transaction."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            rows, jobs, flushes, stop = [], [], [], False
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    flushes.append(item)
+                elif callable(item):
+                    jobs.append(item)
+                else:
+                    rows.append(item)
+                if stop or len(rows) >= self.MAX_BATCH:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if rows:
+                try:
+                    with self._get_connection() as conn:
+                        self._insert_rows(conn, rows)
+                        conn.commit()
+                    self._row_count += len(rows)
+                    print(f"[HISTORY] Saved {len(rows)} entr{'y' if len(rows) == 1 else 'ies'} to {self.path}, "
+                          f"total entries: {self._row_count}")
+                except Exception as e:
+                    print(f"[HISTORY] Error saving: {e}")
+
+            # Maintenance jobs (e.g. backfills), each in its own transaction
+            for job in jobs:
+                try:
+                    with self._get_connection() as conn:
+                        job(conn)
+                        conn.commit()
+                except Exception as e:
+                    print(f"[HISTORY] Background job failed: {e}")
+
+            for event in flushes:
+                event.set()
+            if stop:
+                return
+
+    def _insert_rows(self, conn: sqlite3.Connection, rows: List[tuple]):
+        """Insert a batch of rows. Runs on the writer thread inside its transaction."""
+        conn.executemany("""
+            INSERT INTO entries (text, mode, timestamp, word_count, duration_seconds, wpm)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, rows)
+        self._update_word_counts(conn, rows)
+        self._update_rollups(conn, rows)
+
+    def _update_word_counts(self, conn: sqlite3.Connection, rows: List[tuple]):
+        """Add the words of new rows to word_counts (per mode and day) and word_totals."""
+        counts = Counter()
+        for text, mode, timestamp, *_ in rows:
+            day = timestamp[:10]
+            for word in _tokenize(text):
+                counts[(word, mode, day)] += 1
+
+        totals = Counter()
+        for (word, _, _), count in counts.items():
+            totals[word] += count
+
+        conn.executemany("""
+            INSERT INTO word_counts (word, mode, day, count) VALUES (?, ?, ?, ?)
+            ON CONFLICT(word, mode, day) DO UPDATE SET count = count + excluded.count
+        """, [(word, mode, day, count) for (word, mode, day), count in counts.items()])
+        conn.executemany("""
+            INSERT INTO word_totals (word, count) VALUES (?, ?)
+            ON CONFLICT(word) DO UPDATE SET count = count + excluded.count
+        """, totals.items())
+
+    def _backfill_word_counts(self, conn: sqlite3.Connection):
+        """Rebuild the word tables from every entry (one-time job on the writer thread)."""
+        print("[HISTORY] Building word frequency table...")
+        conn.execute("DELETE FROM word_counts")
+        conn.execute("DELETE FROM word_totals")
+
+        cursor = conn.execute("SELECT text, mode, timestamp FROM entries")
+        while True:
+            rows = cursor.fetchmany(self.BACKFILL_CHUNK)
+            if not rows:
+                break
+            self._update_word_counts(conn, [tuple(row) for row in rows])
+
+        self._set_meta(conn, "word_counts_version", self.WORD_COUNTS_VERSION)
+        print("[HISTORY] Word frequency table ready")
+
+    def _update_rollups(self, conn: sqlite3.Connection, rows: List[tuple]):
+        """Add new rows to daily_stats (per day and mode)."""
+        daily = {}
+        for text, mode, timestamp, word_count, duration_seconds, wpm in rows:
+            word_count = word_count or 0
+
+            d = daily.setdefault((timestamp[:10], mode), [0, 0, 0.0, 0, 0, 0, None, None])
+            d[0] += 1
+            d[1] += word_count
+            if duration_seconds is not None:
+                d[2] += duration_seconds
+                d[3] += word_count
+                d[7] = duration_seconds if d[7] is None else max(d[7], duration_seconds)
+            if wpm is not None:
+                d[4] += wpm
+                d[5] += 1
+                d[6] = wpm if d[6] is None else max(d[6], wpm)
+
+        conn.executemany("""
+            INSERT INTO daily_stats (day, mode, sessions, words, duration_seconds, words_with_duration,
+                                     wpm_sum, wpm_count, max_wpm, longest_session)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(day, mode) DO UPDATE SET
+                sessions = sessions + excluded.sessions,
+                words = words + excluded.words,
+                duration_seconds = duration_seconds + excluded.duration_seconds,
+                words_with_duration = words_with_duration + excluded.words_with_duration,
+                wpm_sum = wpm_sum + excluded.wpm_sum,
+                wpm_count = wpm_count + excluded.wpm_count,
+                max_wpm = MAX(COALESCE(max_wpm, excluded.max_wpm), COALESCE(excluded.max_wpm, max_wpm)),
+                longest_session = MAX(COALESCE(longest_session, excluded.longest_session),
+                                      COALESCE(excluded.longest_session, longest_session))
+        """, [(*key, *values) for key, values in daily.items()])
+
+    def _backfill_rollups(self, conn: sqlite3.Connection):
+        """Rebuild the rollup tables from every entry (one-time job on the writer thread)."""
+        print("[HISTORY] Building analytics rollups...")
+        conn.execute("DELETE FROM daily_stats")
+
+        cursor = conn.execute("SELECT text, mode, timestamp, word_count, duration_seconds, wpm FROM entries")
+        while True:
+            rows = cursor.fetchmany(self.BACKFILL_CHUNK)
+            if not rows:
+                break
+            self._update_rollups(conn, [tuple(row) for row in rows])
+
+        self._set_meta(conn, "rollups_version", self.ROLLUPS_VERSION)
+        print("[HISTORY] Analytics rollups ready")
+
+    def _rebuild_fts(self, conn: sqlite3.Connection):
+        """Index entries written before the FTS table existed (one-time job on the writer thread)."""
+        print("[HISTORY] Building search index...")
+        conn.execute("INSERT INTO entries_fts(entries_fts) VALUES ('rebuild')")
+        self._set_meta(conn, "fts_version", self.FTS_VERSION)
+        print("[HISTORY] Search index ready")
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        with self._read_connection() as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+            return row["value"] if row else None
+
+    @staticmethod
+    def _set_meta(conn: sqlite3.Connection, key: str, value: str):
+        conn.execute("""
+            INSERT INTO meta (key, value) VALUES (?, ?)
+            ON CONFLICT(key) DO UPDATE SET value = excluded.value
+        """, (key, value))
+
+    @property
+    def entry_count(self) -> int:
+        """Number of saved entries (cached; excludes entries still queued)."""
+        return self._row_count
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every entry queued so far has been written.
+
+        Returns:
+            True if flushed, False on timeout
+        """
+        if self._closed:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        """Write any queued entries, stop the writer and close all database connections."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._writer.join()
+        self._connections.close()
 
     def add_entry(
         self,
@@ -143,34 +548,32 @@ class TranscriptionHistory:
             timestamp: When transcription occurred (defaults to now)
             duration_seconds: Audio recording duration in seconds
         """
-        if timestamp is None:
-            timestamp = datetime.now()
-
-        word_count = len(text.split())
+        self._queue.put(self._make_row(text, mode, timestamp, duration_seconds))
 
-        # Calculate WPM if we have duration
-        wpm = None
-        if duration_seconds and duration_seconds > 0:
-            minutes = duration_seconds / 60
-            wpm = round(word_count / minutes) if minutes > 0 else None
-
-        # Save in background thread to not block pasting
-        def save_async():
-            try:
-                with self._get_connection() as conn:
-                    conn.execute("""
-                        INSERT INTO entries (text, mode, timestamp, word_count, duration_seconds, wpm)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    """, (text, mode, timestamp.isoformat(), word_count, duration_seconds, wpm))
-                    conn.commit()
+    def add_entries(self, entries: Iterable[dict]) -> int:
+        """
+        Bulk-add entries through the same batched writer (non-blocking; call flush() to wait).
 
-                    count = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
-                    print(f"[HISTORY] Saved entry to {self.path}, total entries: {count}")
-            except Exception as e:
-                print(f"[HISTORY] Error saving: {e}")
+        Args:
+            entries: Dicts with text and optional mode, timestamp (datetime or ISO string),
+                     duration_seconds, word_count and wpm
 
-        thread = threading.Thread(target=save_async, daemon=True)
-        thread.start()
+        Returns:
+            Number of entries queued
+        """
+        count = 0
+        for entry in entries:
+            text = entry.get("text", "")
+            self._queue.put(self._make_row(
+                text,
+                entry.get("mode", "transcribe"),
+                entry.get("timestamp"),
+                entry.get("duration_seconds"),
+                entry.get("word_count"),
+                entry.get("wpm"),
+            ))
+            count += 1
+        return count
 
     def get_entries(self, limit: Optional[int] = None) -> List[dict]:
         """
@@ -182,7 +585,7 @@ class TranscriptionHistory:
         Returns:
             List of entry dicts with text, mode, timestamp, word_count
         """
-        with self._get_connection() as conn:
+        with self._read_connection() as conn:
             if limit:
                 rows = conn.execute(
                     "SELECT * FROM entries ORDER BY timestamp DESC LIMIT ?",
@@ -195,6 +598,159 @@ class TranscriptionHistory:
 
             return [dict(row) for row in rows]
 
+    @staticmethod
+    def _fts_query(query: str) -> Optional[str]:
+        """
+        Turn free text into a safe FTS5 MATCH expression.
+
+        Every word is quoted, so FTS syntax in user input (AND, NEAR, *, -, :)
+        is matched literally. Words are ANDed.
+        """
+        words = re.findall(r"\w+", query)
+        if not words:
+            return None
+        return " ".join(f'"{w}"' for w in words)
+
+    def search(
+        self,
+        query: str,
+        mode: Optional[str] = None,
+        since: Optional[str] = None,
+        limit: int = 50,
+        highlight: tuple = ("[", "]"),
+    ) -> List[dict]:
+        """
+        Full-text search over history, best matches first.
+
+        Args:
+            query: Words to search for (all must match; stemmed, so "fixing" finds "fixed")
+            mode: Only return entries recorded in this mode
+            since: Only return entries on or after this ISO timestamp or day (YYYY-MM-DD)
+            limit: Maximum number of results
+            highlight: Strings placed before and after each matched term in the snippet
+
+        Returns:
+            List of entry dicts with an added snippet (matched terms highlighted) and
+            rank (bm25, lower is better). Queries with a word matching more than
+            SEARCH_RANK_LIMIT entries return the newest matches with rank None.
+        """
+        if not self._fts:
+            return self._search_like(query, mode, since, limit)
+
+        match = self._fts_query(query)
+        if match is None:
+            return []
+
+        with self._read_connection() as conn:
+            # bm25 reads each word's whole match list (for its IDF), so rank only if every
+            # word is rare enough. Finding a word's Nth newest match is cheap.
+            too_common = any(
+                conn.execute("""
+                    SELECT rowid FROM entries_fts WHERE entries_fts MATCH ?
+                    ORDER BY rowid DESC LIMIT 1 OFFSET ?
+                """, (word, self.SEARCH_RANK_LIMIT)).fetchone() is not None
+                for word in match.split(" ")
+            )
+            order, rank = ("f.rowid DESC", "NULL") if too_common else ("f.rank", "f.rank")
+
+            # FTS5 returns matches already in this order, so filters and snippets
+            # are only evaluated until `limit` rows are found
+            rows = conn.execute(f"""
+                SELECT e.*, snippet(entries_fts, 0, :open, :close, '…', 16) AS snippet, {rank} AS rank
+                FROM entries_fts f JOIN entries e ON e.id = f.rowid
+                WHERE entries_fts MATCH :match
+                    AND (:mode IS NULL OR e.mode = :mode)
+                    AND (:since IS NULL OR e.timestamp >= :since)
+                ORDER BY {order} LIMIT :limit
+            """, {
+                "open": highlight[0], "close": highlight[1], "match": match,
+                "mode": mode, "since": since, "limit": limit,
+            }).fetchall()
+
+            return [dict(row) for row in rows]
+
+    def _search_like(self, query: str, mode: Optional[str], since: Optional[str], limit: int) -> List[dict]:
+        """Substring search, newest first, for SQLite builds without FTS5."""
+        words = re.findall(r"\w+", query)
+        if not words:
+            return []
+
+        clauses = ["text LIKE ?"] * len(words)
+        params = [f"%{w}%" for w in words]
+        if mode is not None:
+            clauses.append("mode = ?")
+            params.append(mode)
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+
+        with self._read_connection() as conn:
+            rows = conn.execute(f"""
+                SELECT *, text AS snippet, NULL AS rank FROM entries
+                WHERE {" AND ".join(clauses)}
+                ORDER BY timestamp DESC LIMIT ?
+            """, (*params, limit)).fetchall()
+            return [dict(row) for row in rows]
+
+    def get_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[Tuple[str, int]] = None,
+        mode: Optional[str] = None,
+    ) -> Tuple[List[dict], Optional[Tuple[str, int]]]:
+        """
+        One page of entries, newest first, using keyset pagination.
+
+        Each page is an index range read that starts where the previous one
+        ended, so deep pages cost the same as the first.
+
+        Args:
+            limit: Maximum number of entries in the page
+            cursor: The cursor returned with the previous page (None for the first page)
+            mode: Only return entries recorded in this mode
+
+        Returns:
+            (entries, next_cursor); next_cursor is None after the last page
+        """
+        clauses, params = [], []
+        if mode is not None:
+            clauses.append("mode = ?")
+            params.append(mode)
+        if cursor is not None:
+            clauses.append("(timestamp, id) < (?, ?)")
+            params.extend(cursor)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._read_connection() as conn:
+            rows = conn.execute(f"""
+                SELECT * FROM entries {where}
+                ORDER BY timestamp DESC, id DESC LIMIT ?
+            """, (*params, limit)).fetchall()
+
+        entries = [dict(row) for row in rows]
+        if len(entries) < limit:
+            return entries, None
+        last = entries[-1]
+        return entries, (last["timestamp"], last["id"])
+
+    def iter_entries(self, page_size: int = 500, mode: Optional[str] = None) -> Iterator[dict]:
+        """
+        Yield every entry, newest first, reading one page at a time.
+
+        Memory stays bounded by page_size however large the history is, and no
+        database connection is held between pages.
+
+        Args:
+            page_size: Entries read per query
+            mode: Only yield entries recorded in this mode
+        """
+        cursor = None
+        while True:
+            entries, cursor = self.get_page(page_size, cursor, mode)
+            yield from entries
+            if cursor is None:
+                return
+
     def get_statistics(self) -> dict:
         """
         Compute statistics from all history.
@@ -202,14 +758,17 @@ class TranscriptionHistory:
         Returns:
             Dict with total_words, total_sessions, common_words, avg_wpm, time_saved_minutes
         """
-        with self._get_connection() as conn:
-            # Get aggregate stats
+        with self._read_connection() as conn:
+            # Aggregates come from the daily rollups (one row per day and mode)
             stats = conn.execute("""
                 SELECT
-                    COUNT(*) as total_sessions,
-                    COALESCE(SUM(word_count), 0) as total_words,
-                    COALESCE(SUM(duration_seconds), 0) as total_duration
-                FROM entries
+                    COALESCE(SUM(sessions), 0) as total_sessions,
+                    COALESCE(SUM(words), 0) as total_words,
+                    COALESCE(SUM(duration_seconds), 0) as total_duration,
+                    COALESCE(SUM(words_with_duration), 0) as words_with_duration,
+                    COALESCE(SUM(wpm_sum), 0) as wpm_sum,
+                    COALESCE(SUM(wpm_count), 0) as wpm_count
+                FROM daily_stats
             """).fetchone()
 
             total_sessions = stats["total_sessions"]
@@ -226,35 +785,11 @@ class TranscriptionHistory:
                     "total_duration_seconds": 0,
                 }
 
-            # Calculate average WPM
-            wpm_stats = conn.execute("""
-                SELECT AVG(wpm) as avg_wpm FROM entries WHERE wpm IS NOT NULL
-            """).fetchone()
-            avg_wpm = round(wpm_stats["avg_wpm"]) if wpm_stats["avg_wpm"] else 0
-
-            # Time saved calculation
-            typing_wpm = 40
-            words_with_duration = conn.execute("""
-                SELECT COALESCE(SUM(word_count), 0) as words
-                FROM entries WHERE duration_seconds IS NOT NULL
-            """).fetchone()["words"]
-
-            time_to_type_minutes = words_with_duration / typing_wpm
-            time_dictating_minutes = total_duration / 60
-            time_saved_minutes = max(0, time_to_type_minutes - time_dictating_minutes)
-
-            # Get all text for word frequency analysis
-            rows = conn.execute("SELECT text FROM entries").fetchall()
-
-            all_words = []
-            for row in rows:
-                words = row["text"].lower().split()
-                words = [w.strip(".,!?;:'\"()[]{}") for w in words]
-                words = [w for w in words if w and len(w) > 2 and w not in STOPWORDS]
-                all_words.extend(words)
+            avg_wpm = round(stats["wpm_sum"] / stats["wpm_count"]) if stats["wpm_count"] else 0
+            time_saved_minutes = self._time_saved(stats["words_with_duration"], total_duration)
 
-            word_counts = Counter(all_words)
-            common_words = word_counts.most_common(20)
+            # Word frequency comes from the maintained word_totals table
+            common_words = self.get_common_words(20, conn=conn)
 
             return {
                 "total_words": total_words,
@@ -265,8 +800,61 @@ class TranscriptionHistory:
                 "total_duration_seconds": round(total_duration, 1),
             }
 
+    @classmethod
+    def _time_saved(cls, words: int, duration_seconds: float) -> float:
+        """Minutes saved dictating these words instead of typing them at TYPING_WPM."""
+        return max(0, words / cls.TYPING_WPM - duration_seconds / 60)
+
+    def get_common_words(
+        self,
+        limit: int = 20,
+        mode: Optional[str] = None,
+        since: Optional[str] = None,
+        conn: Optional[sqlite3.Connection] = None,
+    ) -> List[tuple]:
+        """
+        Most frequently dictated words (excluding stopwords).
+
+        Args:
+            limit: Number of words to return
+            mode: Only count entries recorded in this mode
+            since: Only count entries on or after this day (YYYY-MM-DD)
+
+        Returns:
+            List of (word, count) tuples, most common first
+        """
+        if conn is None:
+            with self._read_connection() as conn:
+                return self.get_common_words(limit, mode, since, conn)
+
+        if mode is None and since is None:
+            rows = conn.execute(
+                "SELECT word, count FROM word_totals ORDER BY count DESC, word LIMIT ?",
+                (limit,)
+            ).fetchall()
+        else:
+            clauses, params = [], []
+            if mode is not None:
+                clauses.append("mode = ?")
+                params.append(mode)
+            if since is not None:
+                clauses.append("day >= ?")
+                params.append(since)
+            rows = conn.execute(f"""
+                SELECT word, SUM(count) AS count FROM word_counts
+                WHERE {" AND ".join(clauses)}
+                GROUP BY word ORDER BY count DESC, word LIMIT ?
+            """, (*params, limit)).fetchall()
+
+        return [(row["word"], row["count"]) for row in rows]
+
     def clear(self):
         """Clear all history."""
+        self.flush()
         with self._get_connection() as conn:
             conn.execute("DELETE FROM entries")
+            conn.execute("DELETE FROM word_counts")
+            conn.execute("DELETE FROM word_totals")
+            conn.execute("DELETE FROM daily_stats")
             conn.commit()
+            self._row_count = 0
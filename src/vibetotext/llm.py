@@ -1,9 +1,14 @@
 """LLM integration for text cleanup and refinement."""
 
+import hashlib
+import json
 import os
+import re
+import sqlite3
+import threading
+import time
 from pathlib import Path
-import google.generativeai as genai
-from typing import Optional
+from typing import Iterator, Optional
 
 # Load .env file if it exists
 try:
@@ -14,13 +19,33 @@ try:
 except ImportError:
     pass
 
-# Configure Gemini (try both common env var names)
+DEFAULT_MODEL = "gemini-3-flash-preview"
+
+# Gemini credentials (try both common env var names)
 _api_key = os.environ.get("GEMINI_API_KEY") or os.environ.get("GOOGLE_API_KEY")
-if _api_key:
-    genai.configure(api_key=_api_key)
-else:
+# Optional endpoint override, e.g. http://127.0.0.1:8080 for a local (fake) server; uses REST
+_api_endpoint = os.environ.get("GEMINI_API_ENDPOINT")
+if not _api_key:
     print("[LLM] Warning: No GEMINI_API_KEY or GOOGLE_API_KEY set. Plan/cleanup modes will fail.")
 
+_genai = None
+_genai_lock = threading.Lock()
+
+
+def _get_genai():
+    """Import and configure google.generativeai on first use (the import alone takes ~1s)."""
+    global _genai
+    if _genai is None:
+        with _genai_lock:
+            if _genai is None:
+                import google.generativeai as genai
+                if _api_endpoint:
+                    genai.configure(api_key=_api_key, transport="rest", client_options={"api_endpoint": _api_endpoint})
+                else:
+                    genai.configure(api_key=_api_key)
+                _genai = genai
+    return _genai
+
 
 CLEANUP_PROMPT = """You are an expert prompt optimizer and thought clarifier. The user has recorded a rambling voice message and needs you to transform it into a clear, well-structured prompt or request.
 
@@ -92,41 +117,340 @@ User's voice request:
 Plan:"""
 
 
-def cleanup_text(text: str) -> Optional[str]:
+CLEANUP_CONFIG = {
+    "temperature": 0.3,  # Lower temperature for more focused output
+    "max_output_tokens": 2048,
+}
+
+PLAN_CONFIG = {
+    "temperature": 0.4,  # Slightly higher for creative structure
+    "max_output_tokens": 4096,  # Longer output for detailed plans
+}
+
+
+class ResponseCache:
+    """
+    On-disk cache of LLM responses, so re-running cleanup/plan on the same
+    transcript returns instantly instead of paying for another generation.
+
+    Entries are content-addressed: the key hashes the prompt template, model,
+    generation config and the input text (runs of whitespace folded; case is
+    kept, since the output follows it), so changing any of them misses.
+    Entries expire after a TTL, and the least recently used ones are evicted
+    once the stored responses exceed max_bytes. Hit/miss counts are persisted
+    alongside.
     """
-    Use Gemini to clean up rambling text into a clear, refined prompt.
 
-    Args:
-        text: The raw transcribed text from the user's rambling
+    TTL_SECONDS = 7 * 24 * 3600
+    MAX_BYTES = 8 * 1024 * 1024
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        ttl_seconds: float = TTL_SECONDS,
+        max_bytes: int = MAX_BYTES,
+    ):
+        """
+        Args:
+            path: Cache database file. Defaults to ~/.vibetotext/llm_cache.db
+            ttl_seconds: Age after which an entry is no longer served
+            max_bytes: Total response size kept before LRU eviction
+        """
+        if path is None:
+            path = Path.home() / ".vibetotext" / "llm_cache.db"
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()  # One connection, shared by the pipeline workers
+        self._conn = sqlite3.connect(str(self.path), timeout=10.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created REAL NOT NULL,
+                    accessed REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON responses(accessed)")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS counters (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                )
+            """)
+
+    @staticmethod
+    def make_key(template: str, model_name: str, config: dict, text: str) -> str:
+        """Hash of everything that determines the response."""
+        normalized = re.sub(r"\s+", " ", text).strip()
+        payload = json.dumps([template, model_name, config, normalized], sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a response, counting the hit or miss.
+
+        Returns:
+            The cached response, or None if missing or expired
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT response FROM responses WHERE key = ? AND created >= ?",
+                (key, now - self.ttl_seconds),
+            ).fetchone()
+            if row:
+                self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self._count("hits" if row else "misses")
+        return row[0] if row else None
+
+    def put(self, key: str, response: str):
+        """Store a response, then drop expired entries and evict down to max_bytes."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("""
+                INSERT INTO responses (key, response, size, created, accessed) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    response = excluded.response, size = excluded.size,
+                    created = excluded.created, accessed = excluded.accessed
+            """, (key, response, len(response.encode("utf-8")), now, now))
+            self._conn.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl_seconds,))
+            # Keep the most recently used entries whose sizes add up to max_bytes
+            self._conn.execute("""
+                DELETE FROM responses WHERE key IN (
+                    SELECT key FROM (
+                        SELECT key, SUM(size) OVER (ORDER BY accessed DESC, key) AS running
+                        FROM responses
+                    ) WHERE running > ?
+                )
+            """, (self.max_bytes,))
+
+    def _count(self, name: str):
+        self._conn.execute("""
+            INSERT INTO counters (name, value) VALUES (?, 1)
+            ON CONFLICT(name) DO UPDATE SET value = value + 1
+        """, (name,))
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current cache size."""
+        with self._lock:
+            counters = dict(self._conn.execute("SELECT name, value FROM counters").fetchall())
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        hits, misses = counters.get("hits", 0), counters.get("misses", 0)
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 3) if hits + misses else 0.0,
+            "entries": entries,
+            "bytes": size,
+        }
+
+    def clear(self):
+        """Drop all cached responses and reset the counters."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.execute("DELETE FROM counters")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class LLMClient:
+    """
+    Long-lived Gemini client.
 
-    Returns:
-        Cleaned up, refined text or None if failed
+    The GenerativeModel - and with it the SDK's underlying connection - is
+    created once and reused for every request instead of per call.
     """
-    if not _api_key:
-        print("Gemini cleanup error: No API key configured")
+
+    def __init__(self, model_name: str = DEFAULT_MODEL):
+        """
+        Args:
+            model_name: Gemini model to use
+        """
+        self.model_name = model_name
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    self._model = _get_genai().GenerativeModel(self.model_name)
+        return self._model
+
+    def generate(self, prompt: str, config: dict) -> Optional[str]:
+        """
+        Generate a complete response.
+
+        Args:
+            prompt: Full prompt text
+            config: GenerationConfig fields (temperature, max_output_tokens, ...)
+
+        Returns:
+            Stripped response text, or None if empty
+        """
+        response = self.model.generate_content(
+            prompt,
+            generation_config=_get_genai().types.GenerationConfig(**config),
+        )
+        if response.text:
+            return response.text.strip()
         return None
 
-    try:
-        model = genai.GenerativeModel("gemini-3-flash-preview")
+    def stream(self, prompt: str, config: dict) -> Iterator[str]:
+        """
+        Generate a response, yielding text chunks as they arrive.
 
-        prompt = CLEANUP_PROMPT.format(text=text)
+        Args:
+            prompt: Full prompt text
+            config: GenerationConfig fields (temperature, max_output_tokens, ...)
 
-        response = model.generate_content(
+        Yields:
+            Text chunks (unstripped; concatenate them for the full response)
+        """
+        response = self.model.generate_content(
             prompt,
-            generation_config=genai.types.GenerationConfig(
-                temperature=0.3,  # Lower temperature for more focused output
-                max_output_tokens=2048,
-            )
+            generation_config=_get_genai().types.GenerationConfig(**config),
+            stream=True,
         )
+        for chunk in response:
+            try:
+                text = chunk.text
+            except ValueError:
+                continue  # Chunk without text parts (e.g. only a finish reason)
+            if text:
+                yield text
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> LLMClient:
+    """The shared LLMClient."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = LLMClient()
+    return _client
+
+
+_cache = None
+_cache_failed = False
+
+
+def get_cache() -> Optional[ResponseCache]:
+    """The shared ResponseCache, or None if it couldn't be opened (requests then go uncached)."""
+    global _cache, _cache_failed
+    if _cache is None and not _cache_failed:
+        with _client_lock:
+            if _cache is None and not _cache_failed:
+                try:
+                    _cache = ResponseCache()
+                except Exception as e:
+                    print(f"[LLM] Response cache unavailable: {e}")
+                    _cache_failed = True
+    return _cache
+
+
+def _cache_key(template: str, config: dict, text: str) -> Optional[str]:
+    cache = get_cache()
+    if cache is None:
+        return None
+    return cache.make_key(template, get_client().model_name, config, text)
 
-        if response.text:
-            return response.text.strip()
+
+def _cache_get(key: Optional[str]) -> Optional[str]:
+    if key is None:
+        return None
+    try:
+        return get_cache().get(key)
+    except Exception as e:
+        print(f"[LLM] Cache read failed: {e}")
         return None
 
+
+def _cache_put(key: Optional[str], response: Optional[str]):
+    if key is None or not response:
+        return
+    try:
+        get_cache().put(key, response)
     except Exception as e:
-        print(f"Gemini cleanup error: {e}")
+        print(f"[LLM] Cache write failed: {e}")
+
+
+def _generate(template: str, config: dict, text: str, label: str) -> Optional[str]:
+    key = _cache_key(template, config, text)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
+    if not _api_key:
+        print(f"Gemini {label} error: No API key configured")
         return None
 
+    try:
+        response = get_client().generate(template.format(text=text), config)
+    except Exception as e:
+        print(f"Gemini {label} error: {e}")
+        return None
+    _cache_put(key, response)
+    return response
+
+
+def _stream(template: str, config: dict, text: str, label: str) -> Iterator[str]:
+    key = _cache_key(template, config, text)
+    cached = _cache_get(key)
+    if cached is not None:
+        yield cached
+        return
+
+    if not _api_key:
+        print(f"Gemini {label} error: No API key configured")
+        return
+
+    chunks = []
+    try:
+        for chunk in get_client().stream(template.format(text=text), config):
+            chunks.append(chunk)
+            yield chunk
+    except Exception as e:
+        # Whatever was already yielded stands; the caller sees the stream end early
+        print(f"Gemini {label} error: {e}")
+        return
+    # Only complete responses are cached (stored stripped, like generate())
+    _cache_put(key, "".join(chunks).strip())
+
+
+def cleanup_text(text: str) -> Optional[str]:
+    """
+    Use Gemini to clean up rambling text into a clear, refined prompt.
+
+    Args:
+        text: The raw transcribed text from the user's rambling
+
+    Returns:
+        Cleaned up, refined text or None if failed
+    """
+    return _generate(CLEANUP_PROMPT, CLEANUP_CONFIG, text, "cleanup")
+
+
+def stream_cleanup_text(text: str) -> Iterator[str]:
+    """cleanup_text, yielding the refined text in chunks as Gemini generates it."""
+    return _stream(CLEANUP_PROMPT, CLEANUP_CONFIG, text, "cleanup")
+
 
 def generate_implementation_plan(text: str) -> Optional[str]:
     """
@@ -138,27 +462,9 @@ def generate_implementation_plan(text: str) -> Optional[str]:
     Returns:
         Structured markdown implementation plan or None if failed
     """
-    if not _api_key:
-        print("Gemini plan error: No API key configured")
-        return None
-
-    try:
-        model = genai.GenerativeModel("gemini-3-flash-preview")
+    return _generate(IMPLEMENTATION_PLAN_PROMPT, PLAN_CONFIG, text, "plan generation")
 
-        prompt = IMPLEMENTATION_PLAN_PROMPT.format(text=text)
 
-        response = model.generate_content(
-            prompt,
-            generation_config=genai.types.GenerationConfig(
-                temperature=0.4,  # Slightly higher for creative structure
-                max_output_tokens=4096,  # Longer output for detailed plans
-            )
-        )
-
-        if response.text:
-            return response.text.strip()
-        return None
-
-    except Exception as e:
-        print(f"Gemini plan generation error: {e}")
-        return None
+def stream_implementation_plan(text: str) -> Iterator[str]:
+    """generate_implementation_plan, yielding the plan in chunks as Gemini generates it."""
+    return _stream(IMPLEMENTATION_PLAN_PROMPT, PLAN_CONFIG, text, "plan generation")
@@ -5,9 +5,12 @@ import time
 import os
 import platform
 import tempfile
+from typing import Callable, Iterable, Optional
 import pyperclip
 
 SYSTEM = platform.system()
+STREAM_PASTE_MIN_CHARS = 80  # Streamed text is pasted at line breaks or in pieces at least this long
+STREAM_PASTE_DELAY = 0.05  # Give the target app time to read the clipboard before it changes again
 LOG_FILE = os.path.join(tempfile.gettempdir(), "vibetotext_output_debug.log")
 
 
@@ -232,3 +235,70 @@ def paste_at_cursor(text: str):
         else:
             log_debug(" Auto-paste failed, text is in clipboard")
             play_notification_sound()
+
+
+def paste_stream(chunks: Iterable[str], stop: Optional[Callable[[], bool]] = None) -> str:
+    """
+    Paste text progressively while it is still being generated.
+
+    Text is pasted at line breaks, or once STREAM_PASTE_MIN_CHARS have built up,
+    so output starts appearing with the first tokens instead of after the
+    whole response. Leading and trailing whitespace is dropped, as with the
+    stripped non-streamed output, and the clipboard holds the whole text at
+    the end. Without auto-paste (no Accessibility permission, or the paste
+    keystroke fails), the text is collected and left on the clipboard instead.
+
+    Args:
+        chunks: Text chunks as they arrive
+        stop: Called between chunks; return True to stop pasting (e.g. job cancelled)
+
+    Returns:
+        The full text, stripped ("" if nothing arrived)
+    """
+    if SYSTEM == 'Darwin' and not has_accessibility_permission():
+        text = "".join(chunks).strip()
+        paste_at_cursor(text)
+        return text
+
+    parts = []  # Everything accepted so far, excluding held-back whitespace
+    pending = ""
+    auto_paste = True
+
+    def paste_piece(piece):
+        nonlocal auto_paste
+        if not parts:
+            time.sleep(0.1)  # Wait for hotkey modifiers to be fully released
+        if auto_paste:
+            pyperclip.copy(piece)
+            if simulate_paste():
+                time.sleep(STREAM_PASTE_DELAY)
+            else:
+                log_debug(" Streamed paste failed, collecting the rest for the clipboard")
+                auto_paste = False
+        parts.append(piece)
+
+    for chunk in chunks:
+        if stop and stop():
+            log_debug(" Streamed paste stopped")
+            return "".join(parts)
+        pending += chunk
+        if not parts:
+            pending = pending.lstrip()
+        if "\n" in chunk or len(pending) >= STREAM_PASTE_MIN_CHARS:
+            # Hold back trailing whitespace until more text follows it
+            piece = pending.rstrip()
+            if piece:
+                paste_piece(piece)
+                pending = pending[len(piece):]
+
+    piece = pending.rstrip()
+    if piece and not (stop and stop()):
+        paste_piece(piece)
+
+    text = "".join(parts)
+    if text:
+        pyperclip.copy(text)
+        log_debug(f" Streamed {len(text)} chars in {len(parts)} pieces")
+        if not auto_paste:
+            play_notification_sound()
+    return text
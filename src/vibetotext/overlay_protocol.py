@@ -0,0 +1,106 @@
+"""Wire protocol between vibetotext and the waveform overlay process.
+
+The overlay scripts (ui_standalone.py, ui_tkinter.py) run as standalone
+scripts or bundled binaries, so they import this module by path from their
+own directory; vibetotext/ui.py imports it as part of the package. Standard
+library only, so the overlay doesn't pull in the rest of vibetotext.
+
+The parent writes binary frames to the overlay's stdin: a header (message
+type, payload length) followed by the payload. Waveform levels go through a
+shared memory segment instead once the overlay has attached to it and said
+so on stdout; until then they are sent as MSG_LEVELS frames too.
+"""
+
+import os
+import struct
+import sys
+from multiprocessing import resource_tracker, shared_memory
+
+MSG_LEVELS = 1  # NUM_BARS float32 levels
+MSG_SHOW = 2  # int32 screen_x, screen_y, screen_w, screen_h
+MSG_HIDE = 3
+MSG_STOP = 4
+NUM_BARS = 25
+HEADER = struct.Struct("<BH")
+LEVELS = struct.Struct(f"<{NUM_BARS}f")
+SHOW = struct.Struct("<4i")
+# Shared level buffer: uint32 seqlock counter (odd while a write is in progress), then the levels
+SEQ = struct.Struct("<I")
+LEVEL_BUFFER_SIZE = SEQ.size + LEVELS.size
+# Written by the overlay on stdout once it has attached to the level buffer
+ACK_SHARED_LEVELS = b"levels-attached\n"
+
+
+def _read_exact(stream, size):
+    """Read exactly size bytes, or None at EOF."""
+    data = stream.read(size)
+    return data if len(data) == size else None
+
+
+def read_messages(stream, on_message):
+    """Decode frames until the parent closes the pipe, then report MSG_STOP."""
+    try:
+        while True:
+            header = _read_exact(stream, HEADER.size)
+            if header is None:
+                break
+            msg_type, length = HEADER.unpack(header)
+            payload = _read_exact(stream, length) if length else b""
+            if payload is None:
+                break
+            if msg_type == MSG_LEVELS:
+                on_message(msg_type, struct.unpack(f"<{length // 4}f", payload))
+            elif msg_type == MSG_SHOW:
+                on_message(msg_type, SHOW.unpack(payload))
+            else:
+                on_message(msg_type, None)
+    except Exception:
+        pass
+    on_message(MSG_STOP, None)
+
+
+class SharedLevels:
+    """Reads the parent's shared level buffer (see LEVEL_BUFFER_SIZE for the layout)."""
+
+    def __init__(self, name):
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+        except TypeError:
+            self._shm = shared_memory.SharedMemory(name=name)
+            if os.name == "posix":  # Only POSIX registers segments with the resource tracker
+                # The parent owns the segment; don't let this process's resource tracker unlink it at exit
+                resource_tracker.unregister(self._shm._name, "shared_memory")
+        self.seq = 0
+
+    def read(self):
+        """Latest levels, or None if nothing new has been written since the last read."""
+        buf = self._shm.buf
+        for _ in range(3):
+            seq = SEQ.unpack_from(buf, 0)[0]
+            if seq & 1:
+                continue  # Write in progress
+            levels = LEVELS.unpack_from(buf, SEQ.size)
+            if SEQ.unpack_from(buf, 0)[0] != seq:
+                continue  # Torn read
+            if seq == self.seq:
+                return None
+            self.seq = seq
+            return levels
+        return None
+
+
+def open_shared_levels(argv=None):
+    """Attach to the level buffer named on the command line, if any, and tell the parent."""
+    argv = sys.argv if argv is None else argv
+    if len(argv) < 2:
+        return None
+    try:
+        shared = SharedLevels(argv[1])
+    except Exception:
+        return None  # Without the ack, the parent keeps sending levels as MSG_LEVELS frames
+    try:
+        sys.stdout.buffer.write(ACK_SHARED_LEVELS)
+        sys.stdout.buffer.flush()
+    except Exception:
+        pass  # No stdout (windowed build): frames keep coming as well, which is harmless
+    return shared
@@ -0,0 +1,157 @@
+"""Background processing of finished recordings so the hotkey thread never blocks."""
+
+import itertools
+import queue
+import threading
+import time
+from typing import Callable, Optional
+
+import numpy as np
+
+
+class Job:
+    """One finished recording waiting to be transcribed, post-processed and pasted."""
+
+    def __init__(self, seq: int, mode: str, audio: np.ndarray, stream=None, search=None):
+        self.seq = seq
+        self.mode = mode
+        self.audio = audio
+        self.stream = stream  # TranscriptionStream when recorded with --streaming
+        self.search = search  # SpeculativeSearch fed from the stream's partial text (greppy mode)
+        self.text = None  # Set by the process step once transcribed
+        self.pasted = False  # Set by the process step if it already pasted the output (streamed)
+        self.created = time.time()
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        """Skip any remaining stages and don't paste the result."""
+        self._cancelled.set()
+        if self.stream:
+            self.stream.cancel()
+
+
+class PipelineExecutor:
+    """
+    Runs finished recordings through transcription/Greppy/LLM on worker threads.
+
+    Results are delivered (saved and pasted) strictly in the order recordings
+    were submitted, even when a later job finishes first. The queue depth is
+    bounded so a stuck backend can't pile up work indefinitely.
+    """
+
+    def __init__(
+        self,
+        process: Callable[[Job], Optional[str]],
+        deliver: Callable[[Job, str], None],
+        workers: int = 2,
+        max_pending: int = 4,
+    ):
+        """
+        Args:
+            process: Turns a job into output text (None = nothing to paste).
+                     Runs on a worker thread; should check job.cancelled between stages.
+            deliver: Called with (job, output) in submission order
+            workers: Number of worker threads
+            max_pending: Max jobs queued or in progress; submit() refuses more
+        """
+        self.process = process
+        self.deliver = deliver
+        self.max_pending = max_pending
+
+        self._queue = queue.Queue()
+        self._seq = itertools.count()
+        self._pending = {}  # seq -> Job, until delivered or skipped
+        self._results = {}  # seq -> output, waiting for earlier jobs
+        self._next_delivery = 0
+        self._cond = threading.Condition()
+        self._deliver_lock = threading.Lock()  # Serializes delivery so order holds across workers
+
+        self._workers = []
+        for i in range(workers):
+            thread = threading.Thread(target=self._worker, name=f"vibetotext-pipeline-{i}", daemon=True)
+            thread.start()
+            self._workers.append(thread)
+
+    @property
+    def pending(self) -> int:
+        """Number of jobs queued or in progress."""
+        with self._cond:
+            return len(self._pending)
+
+    def submit(self, mode: str, audio: np.ndarray, stream=None, search=None) -> Optional[Job]:
+        """
+        Queue a finished recording (non-blocking).
+
+        Returns:
+            The Job, or None if the queue is full
+        """
+        with self._cond:
+            if len(self._pending) >= self.max_pending:
+                return None
+            job = Job(next(self._seq), mode, audio, stream, search)
+            self._pending[job.seq] = job
+        self._queue.put(job)
+        return job
+
+    def cancel_pending(self) -> int:
+        """Cancel every job that hasn't been delivered yet. Returns how many were cancelled."""
+        with self._cond:
+            jobs = list(self._pending.values())
+        for job in jobs:
+            job.cancel()
+        return len(jobs)
+
+    def wait_turn(self, job: Job, timeout: Optional[float] = None) -> bool:
+        """Block until every job submitted before this one has been delivered."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._next_delivery >= job.seq, timeout)
+
+    def shutdown(self, wait: bool = True):
+        """Stop the workers, optionally after draining the queue."""
+        for _ in self._workers:
+            self._queue.put(None)
+        if wait:
+            for thread in self._workers:
+                thread.join()
+
+    def _worker(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+
+            output = None
+            if not job.cancelled:
+                try:
+                    output = self.process(job)
+                except Exception as e:
+                    print(f"[PIPELINE] Job {job.seq} ({job.mode}) failed: {e}")
+            self._complete(job, output)
+
+    def _complete(self, job: Job, output: Optional[str]):
+        """Record a result and deliver everything that is now next in line."""
+        with self._deliver_lock:
+            with self._cond:
+                self._results[job.seq] = output
+
+            while True:
+                with self._cond:
+                    if self._next_delivery not in self._results:
+                        return
+                    seq = self._next_delivery
+                    output = self._results.pop(seq)
+                    ready = self._pending.pop(seq)
+
+                if output is not None and not ready.cancelled:
+                    try:
+                        self.deliver(ready, output)
+                    except Exception as e:
+                        print(f"[PIPELINE] Delivering job {seq} failed: {e}")
+
+                with self._cond:
+                    self._next_delivery = seq + 1
+                    self._cond.notify_all()
@@ -0,0 +1,106 @@
+"""Startup profiling - where the time before "ready" goes (--profile-startup)."""
+
+import builtins
+import importlib.util
+import sys
+import threading
+import time
+from typing import Dict, List, Tuple
+
+
+class StartupProfiler:
+    """
+    Times module imports and named startup phases.
+
+    install() wraps builtins.__import__ so each first-time import on the main
+    thread is timed, cumulative (including the modules it imports) and self
+    (excluding them), like `python -X importtime`. Already-loaded modules and
+    imports on other threads pass straight through.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._imports: Dict[str, List[float]] = {}  # module -> [cumulative, self] seconds
+        self._stack: List[float] = []  # Time spent in child imports, per open import
+        self._phases: List[Tuple[str, float]] = []
+        self._last_mark = self.started
+        self._original_import = None
+
+    def install(self):
+        """Start timing imports."""
+        if self._original_import is None:
+            self._original_import = builtins.__import__
+            builtins.__import__ = self._import
+
+    def uninstall(self):
+        """Stop timing imports."""
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def mark(self, phase: str):
+        """Record the time since the previous mark as a named phase."""
+        now = time.perf_counter()
+        self._phases.append((phase, now - self._last_mark))
+        self._last_mark = now
+
+    @staticmethod
+    def _module_name(name: str, globals, fromlist, level: int):
+        """The module this import statement would load, or None if it is already loaded."""
+        if level:
+            package = (globals or {}).get("__package__")
+            try:
+                name = importlib.util.resolve_name("." * level + name, package)
+            except (ImportError, ValueError):
+                return None
+        if name not in sys.modules:
+            return name
+        # `from package import submodule`
+        for item in fromlist or ():
+            submodule = f"{name}.{item}"
+            if item != "*" and submodule not in sys.modules:
+                return submodule
+        return None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        module = None
+        if threading.current_thread() is threading.main_thread():
+            module = self._module_name(name, globals, fromlist, level)
+        if module is None:
+            return self._original_import(name, globals, locals, fromlist, level)
+
+        start = time.perf_counter()
+        self._stack.append(0.0)
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            totals = self._imports.setdefault(module, [0.0, 0.0])
+            totals[0] += elapsed
+            totals[1] += elapsed - children
+
+    def report(self, top: int = 20) -> str:
+        """
+        Format the slowest imports and the startup phases.
+
+        Args:
+            top: Number of imports to list, slowest (cumulative) first
+
+        Returns:
+            Multi-line report
+        """
+        total_imports = sum(self_time for _, self_time in self._imports.values())
+        lines = [f"[STARTUP] {len(self._imports)} modules imported in {total_imports * 1000:.0f} ms"]
+        lines.append(f"  {'cumulative':>10}  {'self':>8}  module")
+        ranked = sorted(self._imports.items(), key=lambda item: item[1][0], reverse=True)
+        for module, (cumulative, self_time) in ranked[:top]:
+            lines.append(f"  {cumulative * 1000:8.1f}ms  {self_time * 1000:6.1f}ms  {module}")
+
+        lines.append("[STARTUP] Phases:")
+        for phase, seconds in self._phases:
+            lines.append(f"  {seconds * 1000:8.1f}ms  {phase}")
+        lines.append(f"  {(self._last_mark - self.started) * 1000:8.1f}ms  total to ready")
+        return "\n".join(lines)
@@ -1,7 +1,6 @@
 """Audio recording with hotkey trigger."""
 
 import numpy as np
-import sounddevice as sd
 from typing import Optional
 import threading
 import queue
@@ -12,6 +11,13 @@ import time
 # Persistent log file for debugging
 _LOG_FILE = os.path.join(tempfile.gettempdir(), 'vibetotext_debug.log')
 
+# Recordings auto-stop after this long; also sizes the preallocated capture buffer
+MAX_RECORDING_SECONDS = 60
+# Waveform updates per second; the overlays redraw at ~30fps
+LEVEL_RATE = 30
+# Input counts as sound when rms * 100 >= this. Increased to filter out fan noise and ambient sounds
+SILENCE_THRESHOLD = 0.15
+
 
 def _log(msg: str):
     """Write timestamped message to debug log."""
@@ -23,23 +29,132 @@ def _log(msg: str):
         pass
 
 
+class CaptureBuffer:
+    """Preallocated float32 sample storage that the audio callback writes into in place.
+
+    Sized for a whole recording up front so the real-time thread never
+    allocates, and read back as zero-copy views. Streaming transcription reads
+    the live view while recording is still in progress.
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Args:
+            capacity: Number of samples to preallocate
+        """
+        self._data = np.zeros(capacity, dtype=np.float32)
+        self.frames = 0  # Samples written so far
+        self._exported = False
+
+    @property
+    def capacity(self) -> int:
+        return len(self._data)
+
+    def reset(self):
+        """Start a new recording.
+
+        If the previous recording was handed out by export(), it may still be in
+        use (e.g. being transcribed), so switch to a fresh array instead of
+        overwriting it.
+        """
+        if self._exported:
+            self._data = np.zeros(len(self._data), dtype=np.float32)
+            self._exported = False
+        self.frames = 0
+
+    def write(self, block: np.ndarray):
+        """Copy a (frames, 1) or (frames,) block in at the write position."""
+        end = self.frames + len(block)
+        if end > len(self._data):
+            self._grow(end)
+        self._data[self.frames:end] = block[:, 0] if block.ndim == 2 else block
+        self.frames = end  # Publish only after the samples are in place
+
+    def _grow(self, needed: int):
+        """Double the buffer. Only happens if a recording outlives its expected length."""
+        data = np.zeros(max(needed, 2 * len(self._data)), dtype=np.float32)
+        data[:self.frames] = self._data[:self.frames]
+        self._data = data
+
+    def view(self, start: int = 0, end: Optional[int] = None) -> np.ndarray:
+        """Zero-copy view of the samples captured in [start, end)."""
+        if end is None:
+            end = self.frames
+        return self._data[start:end]
+
+    def export(self) -> np.ndarray:
+        """Zero-copy view of the whole recording, kept intact across the next reset()."""
+        self._exported = True
+        return self._data[:self.frames]
+
+
 class AudioRecorder:
     """Records audio from microphone."""
 
     NUM_BARS = 25
     FFT_SIZE = 512
     SMOOTHING = 0.7  # 70% previous, 30% new (like Web Audio smoothingTimeConstant)
-    SILENCE_THRESHOLD = 0.15  # Increased to filter out fan noise and ambient sounds
+    SILENCE_THRESHOLD = SILENCE_THRESHOLD
     MIN_FREQ_BIN = 4  # Skip sub-bass rumble (~125Hz at 16kHz SR)
 
-    def __init__(self, sample_rate: int = 16000, device: int | None = None):
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        device: int | None = None,
+        max_seconds: float = MAX_RECORDING_SECONDS,
+        level_rate: float = LEVEL_RATE,
+    ):
+        """
+        Args:
+            sample_rate: Sample rate to record at
+            device: Input device index (None = system default)
+            max_seconds: Expected longest recording; sizes the capture buffer
+            level_rate: Max waveform updates per second pushed to on_level (above 0)
+        """
+        if level_rate <= 0:
+            raise ValueError(f"level_rate must be above 0 (got {level_rate})")
         self.sample_rate = sample_rate
         self.device = device
         self.recording = False
         self.audio_queue = queue.Queue()
-        self._audio_data = []
-        self.on_level = None  # Callback for audio level updates
+        # A little headroom past max_seconds covers the auto-stop timer firing late
+        self.capture = CaptureBuffer(int((max_seconds + 2) * sample_rate))
+        self.on_level = None  # Callback for audio level updates (gets a NUM_BARS array; copy to keep it)
         self._prev_levels = np.zeros(self.NUM_BARS)  # For smoothing
+        self.level_rate = level_rate
+        # Samples between level computations; the callback only accumulates energy in between
+        self._level_interval = max(1, int(sample_rate / level_rate))
+        self._energy = 0.0  # Sum of squares since the last level computation
+        self._energy_samples = 0
+        self._next_level_frame = 0  # Capture position at which levels are next due
+
+        # Spectrum-to-bars mapping is fixed per recorder, so build it once
+        self._window = np.hanning(self.FFT_SIZE).astype(np.float32)
+        self._fft_buf = np.zeros(self.FFT_SIZE, dtype=np.float32)
+        self._bar_weights = self._build_bar_weights()
+
+    def _build_bar_weights(self) -> np.ndarray:
+        """Build a (NUM_BARS, bins) matrix that averages each bar's frequency bins.
+
+        Bars use an exponential frequency band mapping (more bars for low/mid),
+        and the first few bars are scaled down to reduce bass.
+        """
+        num_bins = self.FFT_SIZE // 2 + 1
+        usable_bins = num_bins - self.MIN_FREQ_BIN
+        weights = np.zeros((self.NUM_BARS, num_bins))
+
+        for i in range(self.NUM_BARS):
+            # Map bar index to frequency range with power curve
+            lo = int(self.MIN_FREQ_BIN + usable_bins * ((i / self.NUM_BARS) ** 2.5))
+            hi = int(self.MIN_FREQ_BIN + usable_bins * (((i + 1) / self.NUM_BARS) ** 2.5))
+            hi = max(hi, lo + 1)  # At least one bin per bar
+
+            # Bass reduction for first few bars
+            gain = 0.5 + (i * 0.125) if i < 4 else 1.0  # 0.5, 0.625, 0.75, 0.875
+
+            weights[i, lo:hi] = gain / (hi - lo)
+
+        return weights
 
     def _callback(self, indata, frames, time, status):
         """Callback for sounddevice stream.
@@ -51,67 +166,67 @@ class AudioRecorder:
         if not self.recording:
             return  # Exit early if not recording (helps with clean shutdown)
 
-        self._audio_data.append(indata.copy())
-
-        # Calculate waveform visualization using FFT frequency analysis
-        if self.on_level:
-            audio = indata.flatten()
-
-            # Gate on RMS - treat very quiet input as silence
-            rms = np.sqrt(np.mean(audio**2))
-            base_level = min(1.0, rms * 100)
-
-            if base_level < self.SILENCE_THRESHOLD:
-                # Smooth decay to zero
-                self._prev_levels *= self.SMOOTHING
-                self.on_level(self._prev_levels.tolist())
-                return
-
-            # Zero-pad to FFT_SIZE if needed, then compute FFT
-            if len(audio) < self.FFT_SIZE:
-                audio = np.pad(audio, (0, self.FFT_SIZE - len(audio)))
-            else:
-                audio = audio[:self.FFT_SIZE]
-
-            # Apply Hanning window to reduce spectral leakage
-            window = np.hanning(len(audio))
-            spectrum = np.abs(np.fft.rfft(audio * window))
-
-            # Convert to dB-like scale (mimics getByteFrequencyData)
-            spectrum = np.clip(spectrum, 1e-10, None)
-            spectrum_db = 20 * np.log10(spectrum)
-            # Normalize: map roughly -60dB..0dB to 0..1
-            spectrum_norm = np.clip((spectrum_db + 60) / 60, 0, 1)
-
-            usable_bins = len(spectrum_norm) - self.MIN_FREQ_BIN
-            levels = np.zeros(self.NUM_BARS)
-
-            # Exponential frequency band mapping (more bars for low/mid)
-            for i in range(self.NUM_BARS):
-                # Map bar index to frequency range with power curve
-                lo = int(self.MIN_FREQ_BIN + usable_bins * ((i / self.NUM_BARS) ** 2.5))
-                hi = int(self.MIN_FREQ_BIN + usable_bins * (((i + 1) / self.NUM_BARS) ** 2.5))
-                hi = max(hi, lo + 1)  # At least one bin per bar
-
-                avg = np.mean(spectrum_norm[lo:hi])
-
-                # Bass reduction for first few bars
-                if i < 4:
-                    avg *= 0.5 + (i * 0.125)  # 0.5, 0.625, 0.75, 0.875
-
-                levels[i] = avg
-
-            # Temporal smoothing
-            levels = self._prev_levels * self.SMOOTHING + levels * (1 - self.SMOOTHING)
-            self._prev_levels = levels
-
-            self.on_level(levels.tolist())
+        self.capture.write(indata)
+
+        # Per block, only accumulate energy; the spectrum is computed at most level_rate times per second
+        audio = indata[:, 0]
+        energy = float(np.dot(audio, audio))
+        self._energy += energy
+        self._energy_samples += len(audio)
+        on_level = self.on_level
+        if on_level and self.capture.frames >= self._next_level_frame:
+            # Keep a steady cadence whatever the block size; skip ahead rather than catch up
+            self._next_level_frame = max(self._next_level_frame + self._level_interval, self.capture.frames)
+            on_level(self._compute_levels())
+
+    def _compute_levels(self) -> np.ndarray:
+        """Update the smoothed bar levels from the latest samples and the energy since the last update."""
+        # Gate on RMS - treat very quiet input as silence
+        rms = np.sqrt(self._energy / self._energy_samples) if self._energy_samples else 0.0
+        self._energy = 0.0
+        self._energy_samples = 0
+        base_level = min(1.0, rms * 100)
+
+        if base_level < self.SILENCE_THRESHOLD:
+            # Smooth decay to zero
+            self._prev_levels *= self.SMOOTHING
+            return self._prev_levels
+
+        # Calculate waveform visualization using FFT frequency analysis on the latest
+        # FFT_SIZE samples, zero-padded (in a preallocated buffer) if fewer were captured
+        end = self.capture.frames
+        latest = self.capture.view(max(0, end - self.FFT_SIZE), end)
+        n = len(latest)
+        self._fft_buf[:n] = latest
+        self._fft_buf[n:] = 0.0
+
+        # Apply Hanning window to reduce spectral leakage
+        spectrum = np.abs(np.fft.rfft(self._fft_buf * self._window))
+
+        # Convert to dB-like scale (mimics getByteFrequencyData)
+        spectrum = np.clip(spectrum, 1e-10, None)
+        spectrum_db = 20 * np.log10(spectrum)
+        # Normalize: map roughly -60dB..0dB to 0..1
+        spectrum_norm = np.clip((spectrum_db + 60) / 60, 0, 1)
+
+        # Average each bar's bins (bass reduction folded into the weights)
+        levels = self._bar_weights @ spectrum_norm
+
+        # Temporal smoothing, in place so callers holding the array see updates
+        self._prev_levels *= self.SMOOTHING
+        self._prev_levels += levels * (1 - self.SMOOTHING)
+        return self._prev_levels
 
     def start(self):
         """Start recording."""
+        import sounddevice as sd
+
         _log("START: Beginning recording")
-        self._audio_data = []
-        self._prev_levels = np.zeros(self.NUM_BARS)
+        self.capture.reset()
+        self._prev_levels[:] = 0.0
+        self._energy = 0.0
+        self._energy_samples = 0
+        self._next_level_frame = 0
         self.recording = True
 
         # Log audio device info
@@ -140,7 +255,11 @@ class AudioRecorder:
         _log("START: Stream started successfully")
 
     def stop(self) -> np.ndarray:
-        """Stop recording and return audio data."""
+        """Stop recording and return audio data.
+
+        The returned array is a zero-copy view of the capture buffer; it stays
+        valid after the next start().
+        """
         _log("STOP: Setting recording=False")
         self.recording = False
 
@@ -163,18 +282,17 @@ class AudioRecorder:
         except Exception as e:
             _log(f"STOP: stream.close() FAILED: {e}")
 
-        if not self._audio_data:
+        if self.capture.frames == 0:
             _log("STOP: No audio data captured!")
             print("[AUDIO] No audio data captured!")
             return np.array([], dtype=np.float32)
 
-        # Concatenate all recorded chunks
-        audio = np.concatenate(self._audio_data, axis=0).flatten()
+        audio = self.capture.export()
 
-        # Log audio stats
+        # Log audio stats (without temporaries the size of the recording)
         duration = len(audio) / self.sample_rate
-        max_amplitude = np.max(np.abs(audio)) if len(audio) > 0 else 0
-        rms = np.sqrt(np.mean(audio**2)) if len(audio) > 0 else 0
+        max_amplitude = max(float(audio.max()), -float(audio.min()))
+        rms = np.sqrt(np.dot(audio, audio) / len(audio))
         _log(f"STOP: Captured {duration:.2f}s, max_amp={max_amplitude:.4f}, rms={rms:.6f}")
         print(f"[AUDIO] Captured {duration:.2f}s, {len(audio)} samples")
         print(f"[AUDIO] Max amplitude: {max_amplitude:.4f}, RMS: {rms:.6f}")
@@ -185,12 +303,12 @@ class AudioRecorder:
 class HotkeyListener:
     """Listens for multiple hotkeys to toggle recording."""
 
-    def __init__(self, hotkeys: dict = None, max_recording_seconds: int = 60, toggle_mode: bool = True):
+    def __init__(self, hotkeys: dict = None, max_recording_seconds: int = MAX_RECORDING_SECONDS, toggle_mode: bool = True):
         """
         Args:
             hotkeys: Dict mapping hotkey strings to mode names.
                      e.g. {"ctrl+shift": "transcribe", "cmd+shift": "greppy"}
-            max_recording_seconds: Auto-stop recording after this many seconds (default: 60)
+            max_recording_seconds: Auto-stop recording after this many seconds (default: MAX_RECORDING_SECONDS)
             toggle_mode: If True, tap hotkey to start/stop. If False, hold to record.
         """
         if hotkeys is None:
@@ -200,6 +318,7 @@ class HotkeyListener:
         self.toggle_mode = toggle_mode
         self.on_start = None  # Called with mode name
         self.on_stop = None   # Called with mode name
+        self.on_cancel = None  # Called on ESC with the canceled mode, or None if not recording
         self._pressed = set()
         self._recording = False
         self._active_mode = None
@@ -225,12 +344,13 @@ class HotkeyListener:
             if self.on_stop:
                 self.on_stop(mode)
 
-    def start(self, on_start, on_stop):
+    def start(self, on_start, on_stop, on_cancel=None):
         """Start listening for hotkeys."""
         from pynput import keyboard
 
         self.on_start = on_start
         self.on_stop = on_stop
+        self.on_cancel = on_cancel
 
         # Parse all hotkeys
         self._parsed_hotkeys = {}
@@ -250,12 +370,18 @@ class HotkeyListener:
             if key_name == 'esc' and self._recording:
                 print("[HOTKEY] ESC pressed - canceling recording")
                 self._cancel_timeout()
+                mode = self._active_mode
                 self._recording = False
                 self._active_mode = None
                 self._active_parts = None
                 self._pressed.clear()
                 self._combo_ready = True
+                if self.on_cancel:
+                    self.on_cancel(mode)
                 return
+            if key_name == 'esc' and self.on_cancel:
+                # Not recording - let the app cancel work still in flight
+                self.on_cancel(None)
 
             self._pressed.add(key_name)
             print(f"[KEY] Pressed: {key_name} | Holding: {sorted(self._pressed)}")  # Debug
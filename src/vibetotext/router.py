@@ -0,0 +1,185 @@
+"""Adaptive model routing - pick the Whisper model size and thread count per request."""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .transcriber import Transcriber, _trim
+
+MODEL_SIZES = ["tiny", "base", "small", "medium", "large"]  # Fastest first
+
+# Starting real-time factors (inference seconds per audio second at MAX_THREADS, idle CPU) until measured
+PRIOR_RTF = {"tiny": 0.04, "base": 0.08, "small": 0.25, "medium": 0.7, "large": 1.4}
+RTF_SMOOTHING = 0.3  # Weight of the newest run in the moving average
+MAX_THREADS = 4  # whisper.cpp's own default; more rarely helps for short clips
+DECISIONS_KEPT = 200
+DECISIONS_LOG = Path.home() / ".vibetotext" / "routing.jsonl"
+
+
+def _system_load() -> float:
+    """1-minute load average (runnable processes), 0.0 where unavailable (Windows)."""
+    try:
+        return os.getloadavg()[0]
+    except (AttributeError, OSError):
+        return 0.0
+
+
+class ModelRouter:
+    """
+    Chooses a model size and thread count for each transcription within a latency SLO.
+
+    The predicted latency of a size is its measured real-time factor times the
+    clip duration, times a slowdown for the current conditions: fewer threads
+    than MAX_THREADS when other processes occupy the cores, and CPU contention
+    ((load + threads) / cores, at least 1). The router picks the largest
+    allowed size predicted to finish within the SLO, falling back to the
+    smallest. Real-time factors start from
+    PRIOR_RTF and follow a moving average of actual runs (divided by the
+    slowdown at the time), so they adapt to the machine. Silence is trimmed
+    before routing, so durations and real-time factors are per second of
+    speech.
+
+    Every decision is kept in memory (decisions) and appended to a JSONL log
+    for inspection. Drop-in for Transcriber: transcribe(), preload(), model_name.
+    """
+
+    def __init__(
+        self,
+        models: List[str],
+        slo_seconds: float,
+        vad: bool = True,
+        server: bool = False,
+        log_path: Optional[Path] = DECISIONS_LOG,
+    ):
+        """
+        Args:
+            models: Model sizes the router may use (any order)
+            slo_seconds: Target transcription latency per request
+            vad: Passed to each Transcriber
+            server: Passed to each Transcriber (models live in the transcription server)
+            log_path: JSONL file decisions are appended to (None = memory only)
+        """
+        self.models = sorted(set(models), key=MODEL_SIZES.index)
+        self.slo_seconds = slo_seconds
+        self.log_path = Path(log_path) if log_path else None
+        self.cpus = os.cpu_count() or 1
+        self.vad = vad
+
+        self._transcribers: Dict[str, Transcriber] = {
+            name: Transcriber(model_name=name, vad=vad, server=server) for name in self.models
+        }
+        self._rtf = {name: PRIOR_RTF[name] for name in self.models}
+        self._lock = threading.Lock()
+        self.decisions = deque(maxlen=DECISIONS_KEPT)
+
+    @property
+    def model_name(self) -> str:
+        """The largest model the router may pick."""
+        return self.models[-1]
+
+    def preload(self):
+        """Load every routed model so a switch never pays the load on the critical path."""
+        for transcriber in self._transcribers.values():
+            transcriber.preload()
+
+    def choose(self, duration: float) -> dict:
+        """
+        Pick a model size and thread count for a clip.
+
+        Args:
+            duration: Clip length in seconds
+
+        Returns:
+            Decision dict: model, threads, load, slowdown, predicted (seconds)
+        """
+        load = _system_load()
+        # Leave the cores other processes are using; whisper.cpp scales poorly past a few threads
+        threads = max(1, min(MAX_THREADS, self.cpus - int(round(load))))
+        slowdown = max(1.0, (load + threads) / self.cpus) * MAX_THREADS / threads
+
+        with self._lock:
+            predicted = {name: self._rtf[name] * duration * slowdown for name in self.models}
+        fits = [name for name in self.models if predicted[name] <= self.slo_seconds]
+        model = fits[-1] if fits else self.models[0]
+        return {
+            "model": model,
+            "threads": threads,
+            "load": round(load, 2),
+            "slowdown": round(slowdown, 2),
+            "predicted": round(predicted[model], 3),
+        }
+
+    def transcribe(self, audio: np.ndarray, sample_rate: int = 16000, vad: Optional[bool] = None) -> str:
+        """
+        Transcribe with the routed model, then update its real-time factor.
+
+        Args:
+            audio: Audio data as numpy array (float32, mono)
+            sample_rate: Sample rate of audio
+            vad: Trim silence first (None = the router's setting; False for audio already trimmed)
+
+        Returns:
+            Transcribed text
+        """
+        audio = np.asarray(audio, dtype=np.float32)
+        if self.vad if vad is None else vad:
+            audio = _trim(audio, sample_rate)
+        duration = len(audio) / sample_rate
+        if duration == 0:
+            return ""
+
+        decision = self.choose(duration)
+        start = time.time()
+        transcriber = self._transcribers[decision["model"]]
+        text = transcriber.transcribe(audio, sample_rate, n_threads=decision["threads"], vad=False)
+        elapsed = time.time() - start
+
+        # An empty result (e.g. noise the model heard no words in) says nothing about model speed
+        if text:
+            rtf = elapsed / duration / decision["slowdown"]
+            with self._lock:
+                model = decision["model"]
+                self._rtf[model] += RTF_SMOOTHING * (rtf - self._rtf[model])
+
+        decision.update({
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "duration": round(duration, 2),
+            "actual": round(elapsed, 3),
+            "slo": self.slo_seconds,
+        })
+        self._record(decision)
+        print(
+            f"[ROUTER] {decision['model']} x{decision['threads']} threads for {duration:.1f}s "
+            f"(load {decision['load']}): predicted {decision['predicted']:.2f}s, took {elapsed:.2f}s"
+        )
+        return text
+
+    def _record(self, decision: dict):
+        with self._lock:
+            self.decisions.append(decision)
+        if self.log_path is None:
+            return
+        try:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.log_path, "a") as f:
+                f.write(json.dumps(decision) + "\n")
+        except OSError:
+            pass
+
+    def stats(self) -> dict:
+        """Current real-time factor estimates and how often each model was chosen."""
+        with self._lock:
+            rtf = {name: round(value, 4) for name, value in self._rtf.items()}
+            decisions = list(self.decisions)
+        chosen = {name: 0 for name in self.models}
+        missed = 0
+        for decision in decisions:
+            chosen[decision["model"]] += 1
+            missed += decision["actual"] > decision["slo"]
+        return {"rtf": rtf, "chosen": chosen, "slo_misses": missed, "requests": len(self.decisions)}
@@ -0,0 +1,183 @@
+"""Streaming transcription - transcribe while the user is still speaking."""
+
+import threading
+import time
+from typing import Callable, List, Optional
+
+import numpy as np
+
+
+def _normalize_word(word: str) -> str:
+    """Lowercase and strip punctuation so overlapping words compare equal."""
+    return word.lower().strip(".,!?;:'\"()[]{}-")
+
+
+def merge_overlap(prev_words: List[str], new_words: List[str], max_overlap: int = 8) -> List[str]:
+    """
+    Drop the words at the start of a new window that repeat the end of the text so far.
+
+    Consecutive windows share OVERLAP_SECONDS of audio, so Whisper usually
+    transcribes the same few words at the end of one window and the start of
+    the next.
+
+    Args:
+        prev_words: Words stitched together so far
+        new_words: Words transcribed from the next window
+        max_overlap: Longest run of repeated words to look for
+
+    Returns:
+        The words from new_words that should be appended
+    """
+    limit = min(max_overlap, len(prev_words), len(new_words))
+    prev_norm = [_normalize_word(w) for w in prev_words[-limit:]] if limit else []
+    new_norm = [_normalize_word(w) for w in new_words[:limit]]
+
+    for k in range(limit, 0, -1):
+        if prev_norm[-k:] == new_norm[:k]:
+            return new_words[k:]
+    return new_words
+
+
+class TranscriptionStream:
+    """
+    Transcribes one recording incrementally while it is being captured.
+
+    A background worker reads the recorder's CaptureBuffer, cuts it into
+    fixed-size windows (with overlap), transcribes each window as soon as it is
+    complete and stitches the text together. When recording stops, only the
+    audio captured since the last window is left to transcribe, so
+    release-to-paste latency stays roughly constant however long the dictation is.
+
+    Create the stream right after AudioRecorder.start(), and call close() with
+    the audio returned by AudioRecorder.stop() before the next start().
+    """
+
+    WINDOW_SECONDS = 10.0
+    OVERLAP_SECONDS = 1.0
+    MAX_OVERLAP_WORDS = 8
+    CUT_FRAME_MS = 20  # Frame size used to find a quiet point to cut a window
+    POLL_SECONDS = 0.1  # How often the worker checks the capture buffer for a full window
+
+    def __init__(
+        self,
+        transcriber,
+        capture,
+        sample_rate: int = 16000,
+        window_seconds: Optional[float] = None,
+        overlap_seconds: Optional[float] = None,
+        on_partial: Optional[Callable[[str], None]] = None,
+    ):
+        """
+        Start a stream and its worker thread.
+
+        Args:
+            transcriber: Transcriber used for each window
+            capture: The recorder's CaptureBuffer
+            sample_rate: Sample rate of the captured audio
+            window_seconds: Window length (default: WINDOW_SECONDS)
+            overlap_seconds: Audio shared by consecutive windows (default: OVERLAP_SECONDS)
+            on_partial: Called from the worker with the stitched text after each window
+        """
+        self.transcriber = transcriber
+        self.capture = capture
+        self.sample_rate = sample_rate
+        self.window_size = int((window_seconds or self.WINDOW_SECONDS) * sample_rate)
+        self.overlap_size = int((overlap_seconds if overlap_seconds is not None else self.OVERLAP_SECONDS) * sample_rate)
+        self.on_partial = on_partial
+        self.error = None  # Set if the worker failed; caller should fall back to a full transcription
+
+        self._words: List[str] = []
+        self._final_audio = None
+        self._cancelled = False
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+        self._thread.start()
+
+    @property
+    def text(self) -> str:
+        """Text stitched together so far."""
+        return " ".join(self._words)
+
+    def close(self, audio: np.ndarray):
+        """
+        Mark capture as finished (non-blocking).
+
+        Args:
+            audio: The complete recording returned by AudioRecorder.stop()
+        """
+        self._final_audio = audio
+        self._wake.set()
+
+    def result(self) -> str:
+        """Wait for the worker to transcribe the tail and return the full text."""
+        self._thread.join()
+        return self.text
+
+    def finish(self, audio: np.ndarray) -> str:
+        """close() and result() in one call."""
+        self.close(audio)
+        return self.result()
+
+    def cancel(self):
+        """Stop the worker without transcribing anything else."""
+        self._cancelled = True
+        self._wake.set()
+
+    def _find_cut(self, audio: np.ndarray) -> int:
+        """Pick the quietest frame near the end of a window so words aren't split."""
+        frame = max(1, self.sample_rate * self.CUT_FRAME_MS // 1000)
+        search = min(len(audio) // 2, max(self.overlap_size, frame))
+        region = audio[len(audio) - search:]
+        n_frames = len(region) // frame
+        if n_frames < 2:
+            return len(audio)
+        frames = region[:n_frames * frame].reshape(n_frames, frame)
+        energy = np.einsum("ij,ij->i", frames, frames)
+        quietest = int(np.argmin(energy))
+        return len(audio) - search + (quietest + 1) * frame
+
+    def _transcribe_window(self, audio: np.ndarray):
+        """Transcribe one window and append its new words."""
+        text = self.transcriber.transcribe(audio, sample_rate=self.sample_rate)
+        if not text:
+            return
+        new_words = merge_overlap(self._words, text.split(), self.MAX_OVERLAP_WORDS)
+        self._words.extend(new_words)
+        if new_words and self.on_partial:
+            try:
+                self.on_partial(self.text)
+            except Exception:
+                pass
+
+    def _worker(self):
+        """Transcribe each window as soon as the capture buffer holds it."""
+        start = 0  # Where the next window begins
+        covered = 0  # Samples already transcribed by previous windows
+
+        try:
+            while not self._cancelled:
+                final = self._final_audio
+                source = final if final is not None else self.capture.view()
+
+                if len(source) - start >= self.window_size:
+                    window = source[start:start + self.window_size]
+                    cut = start + self._find_cut(window)
+                    self._transcribe_window(source[start:cut])
+                    covered = cut
+                    # Next window starts OVERLAP_SECONDS before the cut
+                    start = max(0, cut - self.overlap_size)
+                    continue
+
+                if final is not None:
+                    # Final tail: only transcribe if there is audio the last window didn't cover
+                    if len(final) > covered:
+                        tail_start = time.time()
+                        self._transcribe_window(final[start:])
+                        print(f"[STREAM] Tail of {(len(final) - covered) / self.sample_rate:.2f}s "
+                              f"finished in {time.time() - tail_start:.2f}s")
+                    return
+
+                self._wake.wait(self.POLL_SECONDS)
+        except Exception as e:
+            self.error = e
+            print(f"[STREAM] Streaming transcription failed: {e}")
@@ -1,12 +1,19 @@
 """Whisper transcription using whisper.cpp for 2-4x faster inference."""
 
-import json
 import numpy as np
-from pathlib import Path
-from pywhispercpp.model import Model
+import re
+import threading
 import time
+from typing import Callable, Optional
 
-CONFIG_PATH = Path.home() / ".vibetotext" / "config.json"
+from .config import get_config
+from .vad import trim_silence
+
+# Tiered mode: speech at least this long goes straight to the refine model (a draft pass would only add
+# latency, since it is always refined); shorter drafts are kept without a refine pass if they look clean.
+# The --draft-model help in cli.py and __main__.py quotes this value
+REFINE_MIN_SECONDS = 4.0
+DRAFT_MIN_CONFIDENCE = 0.75
 
 # Technical vocabulary prompt to bias Whisper toward programming terms
 TECH_PROMPT = """This is a software engineer dictating code and technical documentation.
@@ -43,7 +50,13 @@ regex, cron, UUID, Base64, SHA, MD5, RSA, AES, TLS, SSL, HTTPS."""
 class Transcriber:
     """Transcribes audio using whisper.cpp (faster than Python Whisper)."""
 
-    def __init__(self, model_name: str = "base", custom_words: list[str] | None = None):
+    def __init__(
+        self,
+        model_name: str = "base",
+        custom_words: list[str] | None = None,
+        vad: bool = True,
+        server: bool = False,
+    ):
         """
         Initialize transcriber.
 
@@ -51,22 +64,38 @@ class Transcriber:
             model_name: Whisper model size. Options: tiny, base, small, medium, large
                        Bigger = more accurate but slower.
                        'base' is a good balance for real-time use.
-            custom_words: Deprecated - custom words are now loaded from config on each transcription.
+            custom_words: Deprecated - custom words are now read from config (hot-reloaded).
+            vad: Trim silence before inference and skip it entirely when there is no speech.
+            server: Transcribe in the shared transcription server process (started if needed),
+                    which keeps the model loaded across restarts. Falls back to an
+                    in-process model if the server is unavailable.
         """
         self.model_name = model_name
+        self.vad = vad
         self._model = None
+        self._config = get_config()
+        self._prompt = None
+        self._prompt_version = None  # Config version the cached prompt was built from
         self._last_custom_words = None
+        # whisper.cpp contexts aren't thread-safe; pipeline workers and streams share this model
+        self._lock = threading.Lock()
+        self._client = None
+        if server:
+            from .whisper_server import TranscriptionClient
+            self._client = TranscriptionClient()
 
-    def _load_custom_words(self) -> list[str]:
-        """Load custom dictionary from config file."""
-        try:
-            if CONFIG_PATH.exists():
-                with open(CONFIG_PATH, "r") as f:
-                    config = json.load(f)
-                    return config.get("custom_dictionary", [])
-        except Exception:
-            pass
-        return []
+    def _current_prompt(self) -> str:
+        """The vocabulary prompt, rebuilt only after the config changes."""
+        version, config = self._config.snapshot()  # Picks up config.json edits (hot reload)
+        if self._prompt_version != version:
+            custom_words = config.get("custom_dictionary", [])
+            if custom_words != self._last_custom_words:
+                self._last_custom_words = custom_words
+                if custom_words:
+                    print(f"[WHISPER.CPP] Custom dictionary: {len(custom_words)} words ({', '.join(custom_words)})")
+            self._prompt = self._build_prompt(custom_words)
+            self._prompt_version = version
+        return self._prompt
 
     def _build_prompt(self, custom_words: list[str]) -> str:
         """Build the full vocabulary prompt including custom words."""
@@ -82,19 +111,51 @@ class Transcriber:
     def model(self):
         """Lazy load the model."""
         if self._model is None:
-            print(f"Loading whisper.cpp model '{self.model_name}'...")
-            start = time.time()
-            self._model = Model(self.model_name, print_progress=False)
-            print(f"Model loaded in {time.time() - start:.2f}s")
+            with self._lock:
+                if self._model is None:
+                    print(f"Loading whisper.cpp model '{self.model_name}'...")
+                    start = time.time()
+                    from pywhispercpp.model import Model  # Deferred: loads the whisper.cpp extension
+                    self._model = Model(self.model_name, print_progress=False)
+                    print(f"Model loaded in {time.time() - start:.2f}s")
         return self._model
 
-    def transcribe(self, audio: np.ndarray, sample_rate: int = 16000) -> str:
+    def _server_failed(self, error: Exception):
+        """Stop using the transcription server after an error; later calls use the in-process model."""
+        print(f"[WHISPER.CPP] Transcription server unavailable ({error}), loading model in-process")
+        client, self._client = self._client, None
+        if client is not None:
+            client.close()
+
+    def preload(self):
+        """Load the model now (in the transcription server if enabled) so the first transcription is fast."""
+        client = self._client
+        if client is not None:
+            try:
+                start = time.time()
+                load_seconds = client.load(self.model_name)
+                state = "loaded" if load_seconds else "already loaded"
+                print(f"Model '{self.model_name}' {state} in transcription server ({time.time() - start:.2f}s)")
+                return
+            except Exception as e:
+                self._server_failed(e)
+        _ = self.model
+
+    def transcribe(
+        self,
+        audio: np.ndarray,
+        sample_rate: int = 16000,
+        n_threads: Optional[int] = None,
+        vad: Optional[bool] = None,
+    ) -> str:
         """
         Transcribe audio to text.
 
         Args:
             audio: Audio data as numpy array (float32, mono)
             sample_rate: Sample rate of audio (Whisper expects 16000)
+            n_threads: whisper.cpp threads for this call (None = the model's current setting)
+            vad: Trim silence first (None = this transcriber's setting; False for audio already trimmed)
 
         Returns:
             Transcribed text
@@ -102,30 +163,39 @@ class Transcriber:
         if len(audio) == 0:
             return ""
 
-        # Whisper expects float32 audio normalized to [-1, 1]
-        audio = audio.astype(np.float32)
+        # Whisper expects float32 audio normalized to [-1, 1] (no copy if it already is)
+        audio = np.asarray(audio, dtype=np.float32)
 
-        # Reload custom words from config (hot reload support)
-        custom_words = self._load_custom_words()
-        if custom_words != self._last_custom_words:
-            self._last_custom_words = custom_words
-            if custom_words:
-                print(f"[WHISPER.CPP] Custom dictionary: {len(custom_words)} words ({', '.join(custom_words)})")
+        # Whisper compute scales with audio length - don't spend it on silence
+        if self.vad if vad is None else vad:
+            audio = _trim(audio, sample_rate)
+            if len(audio) == 0:
+                return ""
 
-        prompt = self._build_prompt(custom_words)
+        prompt = self._current_prompt()
 
         start = time.time()
 
         # Transcribe with whisper.cpp
         # Note: pywhispercpp uses initial_prompt parameter for vocabulary hints
-        segments = self.model.transcribe(
-            audio,
-            language="en",
-            initial_prompt=prompt,
-        )
+        params = {"language": "en", "initial_prompt": prompt}
+        if n_threads:
+            params["n_threads"] = n_threads
+        texts = None
+        client = self._client
+        if client is not None:
+            try:
+                texts = client.transcribe(self.model_name, audio, **params)
+            except Exception as e:
+                self._server_failed(e)
+        if texts is None:
+            model = self.model
+            with self._lock:
+                segments = model.transcribe(audio, **params)
+            texts = [segment.text for segment in segments]
 
         # Combine all segments into one string
-        text = " ".join(segment.text for segment in segments).strip()
+        text = " ".join(texts).strip()
 
         # Filter out Whisper artifacts like [end], [BLANK_AUDIO], etc.
         text = self._filter_artifacts(text)
@@ -143,3 +213,150 @@ class Transcriber:
         # Clean up any extra whitespace left behind
         text = re.sub(r'\s+', ' ', text).strip()
         return text
+
+
+def _trim(audio: np.ndarray, sample_rate: int) -> np.ndarray:
+    """trim_silence(), logging what it removed. Empty if there is no speech."""
+    trimmed = trim_silence(audio, sample_rate)
+    if len(trimmed) == 0:
+        print("[VAD] No speech detected, skipping inference")
+    elif len(trimmed) < len(audio):
+        print(f"[VAD] Trimmed {len(audio) / sample_rate:.2f}s -> {len(trimmed) / sample_rate:.2f}s")
+    return trimmed
+
+
+def same_text(a: str, b: str) -> bool:
+    """Whether two transcripts match, ignoring case, punctuation and spacing."""
+    def normalize(text):
+        return re.sub(r"[^\w]+", " ", text).strip().casefold()
+    return normalize(a) == normalize(b)
+
+
+def draft_confidence(text: str, duration: float) -> float:
+    """
+    Heuristic 0-1 score of whether a draft transcript can be trusted without a refine pass.
+
+    pywhispercpp doesn't expose token probabilities, so this looks for the
+    usual signs of a small model going wrong instead: an implausible speaking
+    rate (dropped or invented words), repetition loops, and leftover
+    bracketed/non-speech markup.
+
+    Args:
+        text: Draft transcript
+        duration: Length of the audio in seconds
+
+    Returns:
+        Confidence, 1.0 = nothing suspicious
+    """
+    words = text.split()
+    if not words or duration <= 0:
+        return 0.0
+
+    score = 1.0
+    rate = len(words) / duration
+    if rate < 0.7 or rate > 4.5:  # Conversational speech is ~2-3 words/s
+        score -= 0.4
+    if len(words) >= 6 and len({w.lower().strip(".,!?") for w in words}) < len(words) / 2:
+        score -= 0.4  # Same few words over and over: hallucination loop
+    if re.search(r"[\[\]()*♪]", text):
+        score -= 0.3  # Non-speech annotations
+    return max(0.0, score)
+
+
+class TieredTranscriber:
+    """
+    Two-pass transcription: a small draft model first, a larger one only when needed.
+
+    Short utterances are drafted first. A draft that looks clean is kept,
+    giving small-model latency where the large model rarely changes the
+    result; otherwise it is handed to on_draft, so follow-up work (Greppy
+    search, LLM calls) can start on it while the refine pass runs. Long
+    utterances are always refined, so they skip the draft pass and go
+    straight to the refine model. Silence is trimmed once, up front, and the
+    trimmed audio is what both passes see.
+
+    The refine pass is synchronous: transcribe() returns a single final text,
+    so refined and long utterances (refine_min_seconds of speech or more)
+    take as long as the refine model alone. There is no draft that is
+    delivered first and replaced later.
+    """
+
+    def __init__(
+        self,
+        draft: Transcriber,
+        refine: Transcriber,
+        refine_min_seconds: float = REFINE_MIN_SECONDS,
+        min_confidence: float = DRAFT_MIN_CONFIDENCE,
+    ):
+        """
+        Args:
+            draft: Fast transcriber (e.g. tiny)
+            refine: Accurate transcriber (e.g. small/medium)
+            refine_min_seconds: Speech at least this long skips the draft and goes straight to refine
+            min_confidence: Shorter utterances are refined if draft_confidence is below this
+        """
+        self.draft = draft
+        self.refine = refine
+        self.refine_min_seconds = refine_min_seconds
+        self.min_confidence = min_confidence
+
+    @property
+    def model_name(self) -> str:
+        return self.refine.model_name
+
+    def preload(self):
+        """Load both models."""
+        self.draft.preload()
+        self.refine.preload()
+
+    def transcribe(
+        self,
+        audio: np.ndarray,
+        sample_rate: int = 16000,
+        on_draft: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        """
+        Transcribe audio, refining the draft with the larger model unless it can be skipped.
+
+        Args:
+            audio: Audio data as numpy array (float32, mono)
+            sample_rate: Sample rate of audio (Whisper expects 16000)
+            on_draft: Called with the draft text before the refine pass starts (not called when
+                      the draft is skipped or kept)
+
+        Returns:
+            Transcribed text (the refined text, or the draft if it was kept)
+        """
+        audio = np.asarray(audio, dtype=np.float32)
+        if self.draft.vad or self.refine.vad:
+            audio = _trim(audio, sample_rate)
+        if len(audio) == 0:
+            return ""
+
+        duration = len(audio) / sample_rate
+        if duration >= self.refine_min_seconds:
+            print(f"[TIERED] {duration:.1f}s of speech, skipping the {self.draft.model_name} draft")
+            return self.refine.transcribe(audio, sample_rate, vad=False)
+
+        draft = self.draft.transcribe(audio, sample_rate, vad=False)
+        if not draft:
+            # A small model can come back empty on real speech
+            return self.refine.transcribe(audio, sample_rate, vad=False)
+
+        confidence = draft_confidence(draft, duration)
+        if confidence >= self.min_confidence:
+            print(f"[TIERED] Keeping {self.draft.model_name} draft ({duration:.1f}s, confidence {confidence:.2f})")
+            return draft
+
+        if on_draft:
+            try:
+                on_draft(draft)
+            except Exception as e:
+                print(f"[TIERED] Draft callback failed: {e}")
+
+        refined = self.refine.transcribe(audio, sample_rate, vad=False)
+        if not refined:
+            return draft
+        if not same_text(draft, refined):
+            print(f"[TIERED] {self.refine.model_name} refined draft: {draft!r} -> {refined!r}")
+        return refined
@@ -1,6 +1,5 @@
 """Floating recording indicator with waveform - cross-platform version."""
 
-import json
 import os
 import platform
 import subprocess
@@ -8,62 +7,152 @@ import sys
 import tempfile
 import threading
 import queue
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# IPC is a stream of binary frames on the UI process's stdin, plus the shared level buffer (see overlay_protocol)
+from .overlay_protocol import (
+    ACK_SHARED_LEVELS,
+    HEADER,
+    LEVEL_BUFFER_SIZE,
+    LEVELS,
+    MSG_HIDE,
+    MSG_LEVELS,
+    MSG_SHOW,
+    MSG_STOP,
+    NUM_BARS,
+    SHOW,
+)
 
 # Platform detection
 IS_MACOS = platform.system() == "Darwin"
 IS_WINDOWS = platform.system() == "Windows"
 
-# Path for IPC - use platform-appropriate temp directory
-if IS_WINDOWS:
-    _ipc_file = os.path.join(os.environ.get("TEMP", tempfile.gettempdir()), "vibetotext_ui_ipc.json")
-else:
-    _ipc_file = os.path.join(tempfile.gettempdir(), "vibetotext_ui_ipc.json")
+
+class LevelBuffer:
+    """
+    Latest waveform levels in a shared memory segment the overlay process reads directly.
+
+    Layout: uint32 sequence counter, then NUM_BARS float32 levels. The counter
+    is a seqlock - odd while a write is in progress - so the single writer
+    (the audio callback) never waits and the reader retries a torn read. The
+    overlay reads it with overlay_protocol.SharedLevels.
+    """
+
+    SIZE = LEVEL_BUFFER_SIZE
+
+    def __init__(self):
+        self._shm = shared_memory.SharedMemory(create=True, size=self.SIZE)
+        self.name = self._shm.name
+        self._seq = np.ndarray((1,), dtype=np.uint32, buffer=self._shm.buf, offset=0)
+        self._levels = np.ndarray((NUM_BARS,), dtype=np.float32, buffer=self._shm.buf, offset=4)
+        self._seq[0] = 0
+        self._levels[:] = 0.0
+
+    def write(self, levels):
+        """Publish new levels in place (no allocation; safe from the audio callback)."""
+        self._seq[0] += 1  # Odd: write in progress
+        self._levels[:] = levels[:NUM_BARS]
+        self._seq[0] += 1
+
+    def close(self):
+        """Release and remove the segment."""
+        # Views into the buffer must go before the segment can be closed
+        del self._seq, self._levels
+        self._shm.close()
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+
 
 _ui_process = None
+_level_buffer = None  # LevelBuffer shared with the UI process; None = levels go over the pipe
+_level_lock = threading.Lock()  # Held while writing _level_buffer; stop_ui() takes it before closing the buffer
+_levels_attached = threading.Event()  # Set once the running UI process has attached to _level_buffer
+_ZERO_LEVELS = np.zeros(NUM_BARS, dtype=np.float32)
 _recording_active = False  # Guards async waveform writes; prevents race with hide_recording()
+_recorder = None  # AudioRecorder feeding update_waveform (see connect_recorder)
 
-# Non-blocking IPC queue and worker thread
-_ipc_queue = queue.Queue(maxsize=10)  # Small buffer, drop old frames if full
+# Sender thread: the only writer to the UI process's stdin, so a stalled overlay
+# never blocks the hotkey or audio threads
+_ipc_queue = queue.Queue(maxsize=64)  # Encoded control frames; None stops the thread
+_pending_levels = None  # Latest levels not yet sent; newer ones replace it
+_ipc_wake = threading.Event()
 _ipc_thread = None
-_ipc_stop_event = threading.Event()
+
+
+def _write(frame: bytes):
+    """Write one frame to the UI process (blocking - sender thread only)."""
+    process = _ui_process
+    if process is None or process.stdin is None:
+        return
+    try:
+        process.stdin.write(frame)
+    except Exception:
+        pass  # UI exited; it is restarted on the next show_recording()
 
 
 def _ipc_worker():
-    """Background thread that writes IPC data. Runs until stop event is set."""
-    while not _ipc_stop_event.is_set():
-        try:
-            # Wait for data with timeout so we can check stop event
-            data = _ipc_queue.get(timeout=0.1)
-            _write_ipc_sync(data)
-        except queue.Empty:
-            continue
-        except Exception:
-            pass
+    """Background thread that writes queued frames, then the latest levels. Runs until it dequeues None."""
+    global _pending_levels
+    while True:
+        _ipc_wake.wait()
+        _ipc_wake.clear()
+        while True:
+            try:
+                frame = _ipc_queue.get_nowait()
+            except queue.Empty:
+                break
+            if frame is None:
+                return
+            _write(frame)
+        levels, _pending_levels = _pending_levels, None
+        if levels is not None and _recording_active:
+            _write(HEADER.pack(MSG_LEVELS, LEVELS.size) + LEVELS.pack(*levels[:NUM_BARS]))
 
 
 def _ensure_ipc_thread():
     """Start the IPC worker thread if not running."""
     global _ipc_thread
     if _ipc_thread is None or not _ipc_thread.is_alive():
-        _ipc_stop_event.clear()
         _ipc_thread = threading.Thread(target=_ipc_worker, daemon=True)
         _ipc_thread.start()
 
 
-def _write_ipc_async(data):
-    """Queue data for async IPC write. Non-blocking, drops old data if queue full."""
+def _send_async(levels):
+    """Hand levels to the IPC worker. Non-blocking; replaces levels it hasn't sent yet."""
+    global _pending_levels
+    if _ui_process is None:
+        return
+    _pending_levels = levels
     _ensure_ipc_thread()
+    _ipc_wake.set()
+
+
+def _stop_ipc_thread(timeout: float = 0.5):
+    """Ask the IPC worker to exit after the frames already queued, and wait for it."""
+    if _ipc_thread is None:
+        return
     try:
-        # Use put_nowait to never block the audio thread
-        # If queue is full, drop the oldest item and add new one
-        if _ipc_queue.full():
-            try:
-                _ipc_queue.get_nowait()  # Drop oldest
-            except queue.Empty:
-                pass
-        _ipc_queue.put_nowait(data)
-    except Exception:
-        pass  # Never block or raise in audio callback path
+        _ipc_queue.put_nowait(None)
+    except queue.Full:
+        pass  # Worker is stuck on a write; stop_ui() retries once the overlay is gone
+    _ipc_wake.set()
+    _ipc_thread.join(timeout)
+
+
+def _send(msg_type: int, payload: bytes = b""):
+    """Queue one frame for the UI process. Non-blocking; dropped if the overlay has stopped reading."""
+    if _ui_process is None:
+        return
+    _ensure_ipc_thread()
+    try:
+        _ipc_queue.put_nowait(HEADER.pack(msg_type, len(payload)) + payload)
+    except queue.Full:
+        pass  # Overlay stalled; it is restarted on the next show_recording() if it exited
+    _ipc_wake.set()
 
 
 def _get_cursor_and_screen():
@@ -130,25 +219,6 @@ def _get_cursor_and_screen():
     return {"screen_x": 0, "screen_y": 0, "screen_w": 1920, "screen_h": 1080}
 
 
-def _write_ipc_sync(data):
-    """Write data to IPC file atomically (blocking - use from worker thread only)."""
-    try:
-        # Write to temp file first, then rename (atomic)
-        tmp_file = _ipc_file + ".tmp"
-        with open(tmp_file, "w") as f:
-            json.dump(data, f)
-        os.replace(tmp_file, _ipc_file)  # Atomic rename
-    except Exception:
-        pass
-
-
-def _write_ipc(data):
-    """Write data to IPC file - uses sync for control messages, async for waveform."""
-    # Control messages (show/hide/stop) use sync write for reliability
-    # Waveform updates use async to avoid blocking audio callback
-    _write_ipc_sync(data)
-
-
 def _find_ui_binary():
     """Find the UI binary - either bundled or as a script."""
     # Determine the UI binary name based on platform
@@ -195,9 +265,30 @@ def _find_ui_binary():
     return None, None
 
 
+def _ensure_level_buffer():
+    """Create the shared level buffer, falling back to pipe frames if shared memory is unavailable."""
+    global _level_buffer
+    if _level_buffer is None:
+        try:
+            _level_buffer = LevelBuffer()
+        except Exception as e:
+            print(f"[UI] Shared memory unavailable ({e}), sending levels over the pipe")
+    return _level_buffer
+
+
+def _watch_ui_output(process, attached: threading.Event):
+    """Drain the UI process's stdout, noting when it confirms it attached to the level buffer."""
+    try:
+        for line in process.stdout:
+            if line.strip() == ACK_SHARED_LEVELS.strip():
+                attached.set()
+    except Exception:
+        pass
+
+
 def _ensure_ui_process():
     """Start the UI process if not running."""
-    global _ui_process
+    global _ui_process, _levels_attached
 
     if _ui_process is not None and _ui_process.poll() is None:
         return
@@ -208,12 +299,11 @@ def _ensure_ui_process():
         print("[UI] Could not find UI binary or script, UI disabled")
         return
 
-    # Clear any old IPC file
-    if os.path.exists(_ipc_file):
-        os.remove(_ipc_file)
-
-    # Build command
-    cmd = [ui_exe] + (ui_args or []) + [_ipc_file]
+    # Build command; the UI attaches to the level buffer by name
+    cmd = [ui_exe] + (ui_args or [])
+    level_buffer = _ensure_level_buffer()
+    if level_buffer is not None:
+        cmd.append(level_buffer.name)
     print(f"[UI] Starting UI with command: {cmd}")
 
     # Start the UI process with error logging
@@ -229,56 +319,73 @@ def _ensure_ui_process():
     with open(error_log, "w") as err_file:
         _ui_process = subprocess.Popen(
             cmd,
+            stdin=subprocess.PIPE,
+            bufsize=0,  # Unbuffered, so every frame is written straight to the pipe
             stdout=subprocess.PIPE,
             stderr=err_file,
             startupinfo=startupinfo,
         )
     print(f"[UI] UI process started with PID: {_ui_process.pid}")
 
+    # Levels also go over the pipe until this process confirms it reads the shared buffer
+    _levels_attached = threading.Event()
+    threading.Thread(target=_watch_ui_output, args=(_ui_process, _levels_attached), daemon=True).start()
+
 
 def show_recording():
     """Show recording indicator at bottom center of screen."""
     global _recording_active
     print("[UI] show_recording() called")  # Debug
-    _recording_active = True
     _ensure_ui_process()
+    if _level_buffer is not None:
+        _level_buffer.write(_ZERO_LEVELS)  # Don't flash the previous recording's last frame
+    _recording_active = True
     screen_info = _get_cursor_and_screen()
-    _write_ipc({
-        "recording": True,
-        "level": 0.0,
-        **screen_info,
-    })
+    _send(MSG_SHOW, SHOW.pack(
+        screen_info["screen_x"],
+        screen_info["screen_y"],
+        screen_info["screen_w"],
+        screen_info["screen_h"],
+    ))
 
 
 def hide_recording():
     """Signal UI to stop recording and hide."""
-    global _recording_active
+    global _recording_active, _pending_levels
     _recording_active = False
-    # Drain any pending async waveform writes that carry recording=True
-    while not _ipc_queue.empty():
-        try:
-            _ipc_queue.get_nowait()
-        except queue.Empty:
-            break
-    _write_ipc({"recording": False})
-
-
-_update_counter = 0
+    _pending_levels = None  # Any levels that still slip through are ignored by a hidden UI
+    _send(MSG_HIDE)
 
 
 def update_waveform(levels):
-    """Update waveform with frequency band levels (list of 0.0 to 1.0).
+    """Update waveform with frequency band levels (array or list of 0.0 to 1.0).
 
     IMPORTANT: This is called from the audio callback thread.
     Must be non-blocking to avoid deadlock on stream.stop().
     """
     if not _recording_active:
         return  # Don't queue waveform updates after recording stopped
-    global _update_counter
-    _update_counter += 1
+    if _level_buffer is not None:
+        if not _level_lock.acquire(blocking=False):
+            return  # stop_ui() is closing the buffer
+        try:
+            if _level_buffer is not None:
+                _level_buffer.write(levels)
+        finally:
+            _level_lock.release()
+        if _levels_attached.is_set():
+            return  # The overlay reads the shared buffer at its own frame rate
+    # Until the overlay confirms it attached (or without shared memory), send frames.
     # Use async write to avoid blocking the audio callback thread
     # This prevents deadlock when stream.stop() waits for callback to complete
-    _write_ipc_async({"recording": True, "levels": levels, "seq": _update_counter})
+    _send_async(list(levels))  # Copy - the recorder reuses its array
+
+
+def connect_recorder(recorder):
+    """Feed the recorder's levels to the waveform until stop_ui()."""
+    global _recorder
+    _recorder = recorder
+    recorder.on_level = update_waveform
 
 
 def process_ui_events():
@@ -288,15 +395,18 @@ def process_ui_events():
 
 def stop_ui():
     """Stop the UI process and IPC worker thread."""
-    global _ui_process, _ipc_thread
-    _write_ipc({"stop": True})
-
-    # Stop the IPC worker thread
-    _ipc_stop_event.set()
-    if _ipc_thread is not None:
-        _ipc_thread.join(timeout=0.5)
-        _ipc_thread = None
-
+    global _ui_process, _ipc_thread, _level_buffer, _recording_active, _recorder, _pending_levels
+    # Stop level updates first: the audio callback may still be running
+    _recording_active = False
+    if _recorder is not None:
+        _recorder.on_level = None
+        _recorder = None
+    _pending_levels = None
+
+    # Let the worker send MSG_STOP and exit; a stalled overlay is terminated either way,
+    # which fails the worker's pending write
+    _send(MSG_STOP)
+    _stop_ipc_thread()
     if _ui_process is not None:
         try:
             _ui_process.terminate()
@@ -304,3 +414,16 @@ def stop_ui():
         except Exception:
             pass
         _ui_process = None
+    if _ipc_thread is not None and _ipc_thread.is_alive():
+        while not _ipc_queue.empty():  # Frames it never got to; make room for the stop marker
+            try:
+                _ipc_queue.get_nowait()
+            except queue.Empty:
+                break
+        _stop_ipc_thread()
+    _ipc_thread = None
+
+    with _level_lock:  # Waits out a write already in progress
+        level_buffer, _level_buffer = _level_buffer, None
+    if level_buffer is not None:
+        level_buffer.close()
@@ -1,23 +1,24 @@
 #!/usr/bin/env python3
 """Standalone UI process for the floating waveform indicator."""
 
-import json
 import os
 import sys
+import threading
 
 # PyObjC imports
 from AppKit import (
     NSApplication, NSApp, NSPanel, NSView, NSColor, NSBezierPath,
     NSBackingStoreBuffered, NSMakeRect, NSFloatingWindowLevel,
     NSWindowStyleMaskBorderless, NSWindowCollectionBehaviorCanJoinAllSpaces,
-    NSWindowCollectionBehaviorStationary, NSTimer, NSRunLoop,
-    NSDefaultRunLoopMode
+    NSWindowCollectionBehaviorStationary, NSTimer
 )
 from Foundation import NSObject
 from Quartz import kCGMaximumWindowLevelKey, CGWindowLevelForKey
 import objc
 
-IPC_FILE = sys.argv[1] if len(sys.argv) > 1 else "/tmp/vibetotext_ui_ipc.json"
+# Frame and shared-buffer protocol, shared with ui.py. Imported by path: this file runs as a script
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from overlay_protocol import MSG_HIDE, MSG_LEVELS, MSG_SHOW, MSG_STOP, open_shared_levels, read_messages  # noqa: E402
 
 
 class WaveformView(NSView):
@@ -88,7 +89,8 @@ class AppDelegate(NSObject):
         if self:
             self.levels = [0.0] * 25  # Match WaveformView
             self.recording = False
-            self.last_mtime = 0
+            self.shared_levels = open_shared_levels()
+            self.timer = None  # Reads shared levels at the frame rate while recording
             self.panel = None
             self.waveform_view = None
             self.base_width = 140
@@ -132,34 +134,27 @@ class AppDelegate(NSObject):
         # Show the panel
         self.panel.orderFrontRegardless()
 
-        # Start update timer
-        self.timer = NSTimer.scheduledTimerWithTimeInterval_target_selector_userInfo_repeats_(
-            0.033,  # ~30fps
-            self,
-            "update:",
-            None,
-            True
+        # Redraw whenever the parent sends a frame - no polling
+        threading.Thread(target=read_messages, args=(sys.stdin.buffer, self.post_message), daemon=True).start()
+
+    @objc.python_method
+    def post_message(self, msg_type, payload):
+        """Hand a decoded frame from the reader thread to the main thread."""
+        self.performSelectorOnMainThread_withObject_waitUntilDone_(
+            "handleMessage:", (msg_type, payload), False
         )
 
-    def update_(self, timer):
-        # Read IPC file every tick (don't rely on mtime which has low resolution)
+    def handleMessage_(self, message):
+        msg_type, payload = message
         try:
-            if os.path.exists(IPC_FILE):
-                with open(IPC_FILE, "r") as f:
-                    data = json.load(f)
-
-                if data.get("stop"):
-                    NSApp.terminate_(None)
-                    return
-
-                was_recording = self.recording
-                self.recording = data.get("recording", False)
+            if msg_type == MSG_STOP:
+                NSApp.terminate_(None)
+                return
 
+            if msg_type == MSG_SHOW:
                 # Position when recording starts
-                if self.recording and not was_recording:
-                    screen_x = data.get("screen_x", 0)
-                    screen_y = data.get("screen_y", 0)
-                    screen_w = data.get("screen_w", 1920)
+                if not self.recording:
+                    screen_x, screen_y, screen_w, _ = payload
                     width = self.base_width
                     height = self.base_height
                     # Center the widget at 2/3 of screen width
@@ -172,18 +167,48 @@ class AppDelegate(NSObject):
                         NSMakeRect(new_x, new_y, width, height), True
                     )
                     self.panel.orderFrontRegardless()
-
+                self.recording = True
+                self.start_timer()
+            elif msg_type == MSG_HIDE:
+                self.recording = False
+                self.stop_timer()
+                self.levels = [0.0] * 25
+            elif msg_type == MSG_LEVELS:
+                if not self.recording:
+                    return  # Late frame after hide
                 # Update frequency band levels
-                if "levels" in data and self.recording:
-                    self.levels = list(data["levels"])
-                elif not self.recording:
-                    self.levels = [0.0] * 25
+                self.levels = list(payload)
 
-                # Update view
-                self.waveform_view.setLevels_recording_(list(self.levels), self.recording)
+            # Update view
+            self.waveform_view.setLevels_recording_(list(self.levels), self.recording)
         except Exception as e:
             pass
 
+    @objc.python_method
+    def start_timer(self):
+        if self.shared_levels is None or self.timer is not None:
+            return
+        self.timer = NSTimer.scheduledTimerWithTimeInterval_target_selector_userInfo_repeats_(
+            0.033,  # ~30fps
+            self,
+            "tick:",
+            None,
+            True
+        )
+
+    @objc.python_method
+    def stop_timer(self):
+        if self.timer is not None:
+            self.timer.invalidate()
+            self.timer = None
+
+    def tick_(self, timer):
+        levels = self.shared_levels.read()
+        if levels is None or not self.recording:
+            return  # Nothing new - skip the redraw
+        self.levels = list(levels)
+        self.waveform_view.setLevels_recording_(list(self.levels), self.recording)
+
 
 def main():
     app = NSApplication.sharedApplication()
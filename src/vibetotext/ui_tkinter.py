@@ -1,16 +1,16 @@
 #!/usr/bin/env python3
 """Cross-platform floating waveform indicator using tkinter."""
 
-import json
 import os
+import queue
 import sys
+import threading
 import tkinter as tk
 from tkinter import Canvas
 
-IPC_FILE = sys.argv[1] if len(sys.argv) > 1 else os.path.join(
-    os.environ.get("TEMP", os.environ.get("TMPDIR", "/tmp")),
-    "vibetotext_ui_ipc.json"
-)
+# Frame and shared-buffer protocol, shared with ui.py. Imported by path: this file runs as a script
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from overlay_protocol import MSG_HIDE, MSG_LEVELS, MSG_SHOW, MSG_STOP, open_shared_levels, read_messages  # noqa: E402
 
 
 class WaveformWindow:
@@ -58,10 +58,21 @@ class WaveformWindow:
 
         # State
         self.levels = [0.0] * 25
+        self.latest_levels = None  # Last levels received while recording
         self.recording = False
-        self.last_data = {}
         self.hidden = True  # Start hidden — shown on first recording
 
+        # Levels are read straight from shared memory each frame; control messages arrive on stdin
+        self.shared_levels = open_shared_levels()
+
+        # Messages decoded by the stdin reader thread, drained on the Tk thread
+        self.messages = queue.Queue()
+        threading.Thread(
+            target=read_messages,
+            args=(sys.stdin.buffer, lambda *msg: self.messages.put(msg)),
+            daemon=True,
+        ).start()
+
         # Animation state
         self.base_width = 140
         self.base_height = 20
@@ -79,69 +90,44 @@ class WaveformWindow:
         self.update()
 
     def update(self):
-        """Update waveform from IPC file."""
-        # Read IPC data — narrow try/except so animation always runs
+        """Apply messages from the parent and advance the animation."""
+        # Handle IPC messages — narrow try/except so animation always runs
         try:
-            if os.path.exists(IPC_FILE):
-                with open(IPC_FILE, "r") as f:
-                    data = json.load(f)
+            while True:
+                try:
+                    msg_type, payload = self.messages.get_nowait()
+                except queue.Empty:
+                    break
 
-                if data.get("stop"):
+                if msg_type == MSG_STOP:
                     self.root.quit()
                     return
-
-                was_recording = self.recording
-                self.recording = data.get("recording", False)
-
-                # Reposition when recording starts
-                if self.recording and not was_recording:
-                    screen_x = data.get("screen_x", 0)
-                    screen_y = data.get("screen_y", 0)
-                    screen_w = data.get("screen_w", self.root.winfo_screenwidth())
-                    screen_h = data.get("screen_h", self.root.winfo_screenheight())
-
-                    # Reset scale for new recording
-                    self.current_scale = 1.0
-                    self.target_scale = 1.0
-                    self.scale_velocity = 0.0
-                    self.width = self.base_width
-                    self.height = self.base_height
-
-                    # Position with right edge at 74% of screen width
-                    right_edge_x = screen_x + int(screen_w * 0.74)
-                    x = right_edge_x - self.width
-
-                    # On Windows, y is from top; position near bottom
-                    y = screen_y + screen_h - self.height - 40
-                    # On macOS (fallback), y is from bottom
-                    if sys.platform == "darwin":
-                        y = screen_y + 20
-
-                    # Store anchors for animation
-                    self.anchor_right = right_edge_x
-                    self.anchor_top = y  # Top edge stays fixed when growing down
-
-                    self.root.geometry(f"{self.width}x{self.height}+{x}+{y}")
-                    self.canvas.config(width=self.width, height=self.height)
-                    self.root.deiconify()
-                    self.root.lift()
-                    self.hidden = False
-
-                # Update levels with decay
-                if "levels" in data and self.recording:
-                    new_levels = data["levels"]
-                    for i in range(len(self.levels)):
-                        if i < len(new_levels):
-                            if new_levels[i] > self.levels[i]:
-                                self.levels[i] = new_levels[i]
-                            else:
-                                self.levels[i] = self.levels[i] * 0.86 + new_levels[i] * 0.14
-                elif self.recording:
-                    self.levels = [l * 0.9 for l in self.levels]
-                else:
-                    self.levels = [0.0] * 25
-        except json.JSONDecodeError:
-            pass  # Partial/corrupt IPC file — retry next frame
+                elif msg_type == MSG_SHOW:
+                    self.show(*payload)
+                elif msg_type == MSG_HIDE:
+                    self.recording = False
+                    self.latest_levels = None
+                elif msg_type == MSG_LEVELS and self.recording:
+                    self.latest_levels = payload
+
+            if self.recording and self.shared_levels is not None:
+                levels = self.shared_levels.read()
+                if levels is not None:
+                    self.latest_levels = levels
+
+            # Update levels with decay
+            if self.latest_levels is not None and self.recording:
+                new_levels = self.latest_levels
+                for i in range(len(self.levels)):
+                    if i < len(new_levels):
+                        if new_levels[i] > self.levels[i]:
+                            self.levels[i] = new_levels[i]
+                        else:
+                            self.levels[i] = self.levels[i] * 0.86 + new_levels[i] * 0.14
+            elif self.recording:
+                self.levels = [l * 0.9 for l in self.levels]
+            else:
+                self.levels = [0.0] * 25
         except Exception:
             pass
 
@@ -190,6 +176,39 @@ class WaveformWindow:
         # Schedule next update (~30fps)
         self.root.after(33, self.update)
 
+    def show(self, screen_x, screen_y, screen_w, screen_h):
+        """Start a recording: reset the animation and position on the cursor's screen."""
+        if self.recording:
+            return
+        self.recording = True
+
+        # Reset scale for new recording
+        self.current_scale = 1.0
+        self.target_scale = 1.0
+        self.scale_velocity = 0.0
+        self.width = self.base_width
+        self.height = self.base_height
+
+        # Position with right edge at 74% of screen width
+        right_edge_x = screen_x + int(screen_w * 0.74)
+        x = right_edge_x - self.width
+
+        # On Windows, y is from top; position near bottom
+        y = screen_y + screen_h - self.height - 40
+        # On macOS (fallback), y is from bottom
+        if sys.platform == "darwin":
+            y = screen_y + 20
+
+        # Store anchors for animation
+        self.anchor_right = right_edge_x
+        self.anchor_top = y  # Top edge stays fixed when growing down
+
+        self.root.geometry(f"{self.width}x{self.height}+{x}+{y}")
+        self.canvas.config(width=self.width, height=self.height)
+        self.root.deiconify()
+        self.root.lift()
+        self.hidden = False
+
     def draw_waveform(self):
         """Draw the waveform bars."""
         self.canvas.delete("all")
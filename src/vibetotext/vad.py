@@ -0,0 +1,89 @@
+"""Voice activity detection - trim silence before Whisper inference."""
+
+import numpy as np
+
+from .recorder import SILENCE_THRESHOLD  # Same gate as the recorder's waveform
+
+FRAME_MS = 30
+# Unvoiced consonants (s, f, sh) are quiet but noisy - high zero-crossing rate
+ZCR_UNVOICED = 0.25
+HANGOVER_MS = 200  # Keep this much audio around speech so onsets and tails aren't clipped
+MAX_PAUSE_MS = 500  # Internal pauses longer than this are shortened to this
+MIN_SECONDS = 1.1  # whisper.cpp ignores input shorter than 1s, so pad up to this
+
+
+def speech_frames(audio: np.ndarray, sample_rate: int = 16000) -> np.ndarray:
+    """
+    Classify fixed-size frames as speech or silence.
+
+    A frame is speech if its RMS clears the silence gate, or if it is at least
+    half as loud and has the high zero-crossing rate of an unvoiced consonant.
+
+    Args:
+        audio: Audio data as numpy array (float32, mono)
+        sample_rate: Sample rate of audio
+
+    Returns:
+        Boolean array with one entry per FRAME_MS frame
+    """
+    frame = sample_rate * FRAME_MS // 1000
+    n_frames = len(audio) // frame
+    if n_frames == 0:
+        return np.zeros(0, dtype=bool)
+
+    frames = audio[:n_frames * frame].reshape(n_frames, frame)
+    level = np.sqrt(np.einsum("ij,ij->i", frames, frames) / frame) * 100
+    zcr = np.count_nonzero(np.diff(np.signbit(frames), axis=1), axis=1) / frame
+
+    loud = level >= SILENCE_THRESHOLD
+    unvoiced = (level >= SILENCE_THRESHOLD / 2) & (zcr >= ZCR_UNVOICED)
+    return loud | unvoiced
+
+
+def trim_silence(audio: np.ndarray, sample_rate: int = 16000) -> np.ndarray:
+    """
+    Drop leading/trailing silence and shorten long pauses.
+
+    Args:
+        audio: Audio data as numpy array (float32, mono)
+        sample_rate: Sample rate of audio
+
+    Returns:
+        The speech portion of the audio (empty if no speech frames were found).
+        Returns the input unchanged if there is nothing to trim.
+    """
+    speech = speech_frames(audio, sample_rate)
+    if not speech.any():
+        return audio[:0]
+
+    frame = sample_rate * FRAME_MS // 1000
+    hangover = HANGOVER_MS // FRAME_MS
+    max_pause = MAX_PAUSE_MS // FRAME_MS
+
+    # Widen speech regions by the hangover on both sides. "full" and a slice rather than "same":
+    # "same" returns max(len(speech), kernel length) frames, too many for clips shorter than the kernel
+    window = np.convolve(speech, np.ones(2 * hangover + 1), mode="full")
+    keep = window[hangover:hangover + len(speech)] > 0
+
+    # Shorten pauses between speech regions; leading/trailing silence stays dropped
+    idx = np.flatnonzero(keep)
+    gaps = np.flatnonzero(np.diff(idx) > 1)
+    for g in gaps:
+        gap_start = idx[g] + 1
+        keep[gap_start:gap_start + max_pause] = True
+
+    # The partial frame at the end belongs with the last full frame
+    keep_samples = np.repeat(keep, frame)
+    if len(keep_samples) < len(audio):
+        keep_samples = np.concatenate([keep_samples, np.full(len(audio) - len(keep_samples), keep[-1])])
+
+    if keep_samples.all():
+        return audio
+
+    trimmed = audio[keep_samples]
+
+    min_samples = int(MIN_SECONDS * sample_rate)
+    if len(trimmed) < min_samples:
+        trimmed = np.pad(trimmed, (0, min_samples - len(trimmed)))
+
+    return trimmed
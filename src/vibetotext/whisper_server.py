@@ -0,0 +1,412 @@
+"""Transcription server - keeps whisper.cpp models loaded across vibetotext restarts.
+
+The server is a separate, detached process that owns the loaded models and
+answers requests on a local socket (a named pipe on Windows). Audio is handed
+over in a shared memory segment owned by the client, so only the segment name
+and sample count cross the socket. Because the server outlives the client, a
+restart (dev.py hot reload) or crash of vibetotext reconnects to an
+already-loaded model instead of paying the load again.
+
+Run `python -m vibetotext.whisper_server` to start it by hand, or let
+TranscriptionClient spawn it on first use. `--stop` shuts a running server down.
+"""
+
+import argparse
+import atexit
+import os
+import secrets
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from multiprocessing import connection, resource_tracker, shared_memory
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+STATE_DIR = Path.home() / ".vibetotext"
+AUTHKEY_PATH = STATE_DIR / "whisper_server.key"
+if sys.platform == "win32":
+    ADDRESS = r"\\.\pipe\vibetotext-whisper"
+else:
+    ADDRESS = str(STATE_DIR / "whisper_server.sock")
+LOG_PATH = os.path.join(tempfile.gettempdir(), "vibetotext_whisper_server.log")
+
+IDLE_TIMEOUT = 3600  # Seconds without requests before the server exits and frees the models
+SPAWN_TIMEOUT = 15  # Seconds to wait for a spawned server to accept connections (models load later)
+
+
+def _authkey() -> bytes:
+    """Shared secret for the socket handshake, created on first use (readable by this user only)."""
+    STATE_DIR.mkdir(parents=True, exist_ok=True)
+    try:
+        return AUTHKEY_PATH.read_bytes()
+    except FileNotFoundError:
+        pass
+    key = secrets.token_bytes(32)
+    try:
+        fd = os.open(AUTHKEY_PATH, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        return AUTHKEY_PATH.read_bytes()  # Another process created it first
+    with os.fdopen(fd, "wb") as f:
+        f.write(key)
+    return key
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to a client's audio segment without taking ownership of it."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        # The client owns the segment; don't let this process's resource tracker unlink it at exit
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+class TranscriptionServer:
+    """
+    Serves transcription requests from loaded whisper.cpp models.
+
+    Each client connection gets a thread. Models are loaded on first use and
+    kept, one per size, each behind its own lock (whisper.cpp contexts aren't
+    thread-safe), so different sizes can transcribe concurrently.
+
+    Requests are tuples (op, *args); replies are ("ok", value) or ("error", message):
+        ("ping",) -> server info dict
+        ("load", model_name) -> seconds spent loading (0.0 if already loaded)
+        ("transcribe", model_name, shm_name, n_samples, kwargs) -> list of segment texts
+        ("shutdown",) -> None
+    """
+
+    def __init__(self, address: str = ADDRESS, idle_timeout: float = IDLE_TIMEOUT):
+        """
+        Args:
+            address: Socket path (or pipe name on Windows) to listen on
+            idle_timeout: Exit after this many seconds without requests (0 = never)
+        """
+        self.address = address
+        self.idle_timeout = idle_timeout
+        self.started = time.time()
+
+        self._models: Dict[str, object] = {}
+        self._model_locks: Dict[str, threading.Lock] = {}
+        self._models_lock = threading.Lock()
+
+        self._active = 0  # Requests in progress
+        self._last_request = time.monotonic()
+        self._state_lock = threading.Lock()
+        self._listener = None
+        self._stopping = threading.Event()
+
+    def _get_model(self, model_name: str):
+        """Load a model on first use. Returns (model, lock, seconds spent loading)."""
+        with self._models_lock:
+            lock = self._model_locks.setdefault(model_name, threading.Lock())
+        with lock:
+            model = self._models.get(model_name)
+            if model is not None:
+                return model, lock, 0.0
+            print(f"[SERVER] Loading whisper.cpp model '{model_name}'...", flush=True)
+            start = time.time()
+            from pywhispercpp.model import Model
+            model = Model(model_name, print_progress=False)
+            elapsed = time.time() - start
+            print(f"[SERVER] Model '{model_name}' loaded in {elapsed:.2f}s", flush=True)
+            self._models[model_name] = model
+            return model, lock, elapsed
+
+    def serve_forever(self):
+        """Accept connections until shutdown or idle timeout."""
+        if sys.platform != "win32":
+            STATE_DIR.mkdir(parents=True, exist_ok=True)
+            if os.path.exists(self.address):
+                if _ping(self.address):
+                    print("[SERVER] Already running", flush=True)
+                    return
+                os.unlink(self.address)  # Stale socket from a server that died
+
+        self._listener = connection.Listener(self.address, authkey=_authkey())
+        print(f"[SERVER] Listening on {self.address} (pid {os.getpid()})", flush=True)
+        if self.idle_timeout:
+            threading.Thread(target=self._idle_watch, daemon=True).start()
+
+        try:
+            while not self._stopping.is_set():
+                try:
+                    conn = self._listener.accept()
+                except (connection.AuthenticationError, EOFError, ConnectionError) as e:
+                    print(f"[SERVER] Rejected connection: {e}", flush=True)
+                    continue
+                except OSError:
+                    break  # Listener closed by stop()
+                threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+        finally:
+            self.stop()
+            print("[SERVER] Stopped", flush=True)
+
+    def stop(self):
+        """Stop accepting connections (serve_forever returns)."""
+        self._stopping.set()
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            try:
+                listener.close()  # Also removes the socket file
+            except OSError:
+                pass
+
+    def _idle_watch(self):
+        while not self._stopping.wait(30):
+            with self._state_lock:
+                idle = self._active == 0 and time.monotonic() - self._last_request > self.idle_timeout
+            if idle:
+                print(f"[SERVER] Idle for {self.idle_timeout}s, exiting", flush=True)
+                self.stop()
+                # Closing the listener doesn't wake accept() on the main thread
+                os._exit(0)
+
+    def _handle(self, conn):
+        segment = None  # Client's audio segment, kept attached while its name doesn't change
+        try:
+            while True:
+                try:
+                    request = conn.recv()
+                except (EOFError, OSError):
+                    return
+                with self._state_lock:
+                    self._active += 1
+                try:
+                    op = request[0]
+                    if op == "transcribe":
+                        _, model_name, shm_name, n_samples, kwargs = request
+                        if segment is None or segment.name != shm_name:
+                            if segment is not None:
+                                segment.close()
+                            segment = _attach(shm_name)
+                        reply = ("ok", self._transcribe(model_name, segment, n_samples, kwargs))
+                    elif op == "load":
+                        reply = ("ok", self._get_model(request[1])[2])
+                    elif op == "ping":
+                        reply = ("ok", {
+                            "pid": os.getpid(),
+                            "models": sorted(self._models),
+                            "uptime": time.time() - self.started,
+                        })
+                    elif op == "shutdown":
+                        conn.send(("ok", None))
+                        self.stop()
+                        os._exit(0)
+                    else:
+                        reply = ("error", f"unknown request {op!r}")
+                except Exception as e:
+                    reply = ("error", f"{type(e).__name__}: {e}")
+                finally:
+                    with self._state_lock:
+                        self._active -= 1
+                        self._last_request = time.monotonic()
+                try:
+                    conn.send(reply)
+                except (EOFError, OSError):
+                    return
+        finally:
+            if segment is not None:
+                segment.close()
+            conn.close()
+
+    def _transcribe(self, model_name: str, segment, n_samples: int, kwargs: dict) -> List[str]:
+        model, lock, _ = self._get_model(model_name)
+        audio = np.ndarray((n_samples,), dtype=np.float32, buffer=segment.buf)
+        try:
+            with lock:
+                segments = model.transcribe(audio, **kwargs)
+            return [s.text for s in segments]
+        finally:
+            del audio  # Release the view so the segment can be closed
+
+
+def _ping(address: str = ADDRESS) -> Optional[dict]:
+    """Server info if a server answers at address, else None."""
+    try:
+        conn = connection.Client(address, authkey=_authkey())
+    except (OSError, connection.AuthenticationError, EOFError):
+        return None
+    try:
+        conn.send(("ping",))
+        status, value = conn.recv()
+        return value if status == "ok" else None
+    except (OSError, EOFError):
+        return None
+    finally:
+        conn.close()
+
+
+def spawn_server(address: str = ADDRESS, timeout: float = SPAWN_TIMEOUT) -> bool:
+    """
+    Start a detached server process and wait until it accepts connections.
+
+    Returns:
+        True once a server answers, False if none came up within timeout
+    """
+    if getattr(sys, "frozen", False):
+        return False  # Bundled app: there is no interpreter to run the module with
+
+    env = os.environ.copy()
+    package_root = str(Path(__file__).resolve().parent.parent)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [package_root, env.get("PYTHONPATH")]))
+    kwargs = {}
+    if sys.platform == "win32":
+        kwargs["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs["start_new_session"] = True  # Outlive the vibetotext process (and its Ctrl+C)
+
+    with open(LOG_PATH, "a") as log:
+        subprocess.Popen(
+            [sys.executable, "-m", "vibetotext.whisper_server", "--address", address],
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            env=env,
+            close_fds=True,
+            **kwargs,
+        )
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if _ping(address):
+            return True
+        time.sleep(0.1)
+    return False
+
+
+class TranscriptionClient:
+    """
+    Client for the transcription server, spawning it if none is running.
+
+    Holds one connection and one shared memory segment for audio (grown as
+    needed). Requests are serialized, which costs nothing: the server runs
+    one transcription per model at a time anyway.
+    """
+
+    def __init__(self, address: str = ADDRESS, spawn: bool = True):
+        """
+        Args:
+            address: Server socket path (or pipe name on Windows)
+            spawn: Start a server if none is running
+        """
+        self.address = address
+        self.spawn = spawn
+        self._conn = None
+        self._segment = None
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def _connect(self):
+        try:
+            return connection.Client(self.address, authkey=_authkey())
+        except (OSError, EOFError):
+            if not self.spawn:
+                raise
+        print("[WHISPER.CPP] Starting transcription server...", flush=True)
+        if not spawn_server(self.address):
+            raise ConnectionError(f"transcription server did not start (see {LOG_PATH})")
+        return connection.Client(self.address, authkey=_authkey())
+
+    def _request(self, *request):
+        """Send a request and return the reply value, reconnecting once if the server went away."""
+        for attempt in range(2):
+            if self._conn is None:
+                self._conn = self._connect()
+            try:
+                self._conn.send(request)
+                status, value = self._conn.recv()
+                break
+            except (EOFError, OSError):
+                self._conn.close()
+                self._conn = None
+                if attempt:
+                    raise
+        if status != "ok":
+            raise RuntimeError(f"transcription server: {value}")
+        return value
+
+    def _audio_segment(self, nbytes: int) -> shared_memory.SharedMemory:
+        if self._segment is None or self._segment.size < nbytes:
+            if self._segment is not None:
+                self._segment.close()
+                self._segment.unlink()
+            # Round up so growing recordings don't reallocate every time
+            self._segment = shared_memory.SharedMemory(create=True, size=max(nbytes, 1 << 20) * 2)
+        return self._segment
+
+    def load(self, model_name: str) -> float:
+        """Make sure the server has model_name loaded. Returns seconds spent loading now."""
+        with self._lock:
+            return self._request("load", model_name)
+
+    def transcribe(self, model_name: str, audio: np.ndarray, **kwargs) -> List[str]:
+        """
+        Transcribe with the server's copy of model_name.
+
+        Args:
+            model_name: Whisper model size
+            audio: float32 mono audio
+            **kwargs: Passed to pywhispercpp Model.transcribe (language, initial_prompt, ...)
+
+        Returns:
+            Segment texts
+        """
+        audio = np.ascontiguousarray(audio, dtype=np.float32)
+        with self._lock:
+            segment = self._audio_segment(audio.nbytes)
+            segment.buf[:audio.nbytes] = audio.view(np.uint8)
+            return self._request("transcribe", model_name, segment.name, len(audio), kwargs)
+
+    def close(self):
+        """Disconnect and free the audio segment (the server keeps running)."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            if self._segment is not None:
+                self._segment.close()
+                self._segment.unlink()
+                self._segment = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="vibetotext transcription server")
+    parser.add_argument("--address", default=ADDRESS, help=f"Socket path to listen on (default: {ADDRESS})")
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=IDLE_TIMEOUT,
+        help=f"Exit after this many seconds without requests, 0 = never (default: {IDLE_TIMEOUT})",
+    )
+    parser.add_argument("--preload", nargs="*", default=[], help="Model sizes to load at startup")
+    parser.add_argument("--stop", action="store_true", help="Stop the running server and exit")
+    parser.add_argument("--status", action="store_true", help="Print the running server's status and exit")
+    args = parser.parse_args()
+
+    if args.status:
+        info = _ping(args.address)
+        print(info if info else "not running")
+        return
+    if args.stop:
+        client = TranscriptionClient(args.address, spawn=False)
+        try:
+            client._request("shutdown")
+            print("stopped")
+        except (OSError, EOFError):
+            print("not running")
+        return
+
+    server = TranscriptionServer(args.address, idle_timeout=args.idle_timeout)
+    for model_name in args.preload:
+        server._get_model(model_name)
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
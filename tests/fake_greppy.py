@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Stand-in for the greppy CLI, for tests.
+
+    fake_greppy.py serve [--load-delay S] [--crash-after N] [--hang-on WORD]
+        Worker mode: the line-delimited JSON protocol GreppyWorker speaks.
+    fake_greppy.py search QUERY -n LIMIT -p PATH --json
+        One-shot mode: one JSON result per line.
+    fake_greppy.py nothing
+        Exits at once, like a greppy build without worker mode.
+
+Results are one per query word: {"file_path": "<path>/<word>.py", ...}, plus
+the answering process's pid in "worker_pid" so tests can tell processes apart.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+
+def results(query: str, limit: int, path: str) -> list:
+    return [
+        {"file_path": f"{path}/{word}.py", "start_line": i + 1, "end_line": i + 2, "content": word, "worker_pid": os.getpid()}
+        for i, word in enumerate(query.split()[:limit])
+    ]
+
+
+def serve(args):
+    time.sleep(args.load_delay)  # Loading the index
+    answered = 0
+    for line in sys.stdin:
+        request = json.loads(line)
+        if args.hang_on and args.hang_on in request.get("query", ""):
+            continue  # Never answer
+        if request["op"] == "search":
+            response = {"id": request["id"], "results": results(request["query"], request["limit"], request["path"])}
+        elif request["op"] == "warm":
+            response = {"id": request["id"], "ok": True}
+        else:
+            response = {"id": request["id"], "error": f"unknown op {request['op']}"}
+        print("loading shard 1/1")  # Stray log line the client must skip
+        print(json.dumps(response), flush=True)
+        answered += 1
+        if args.crash_after and answered >= args.crash_after:
+            os._exit(1)
+
+
+def search(args):
+    for item in results(args.query, args.n, args.p):
+        print(json.dumps(item))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    commands = parser.add_subparsers(dest="command", required=True)
+    p = commands.add_parser("serve")
+    p.add_argument("--load-delay", type=float, default=0.0)
+    p.add_argument("--crash-after", type=int, default=0)
+    p.add_argument("--hang-on", default="")
+    p.set_defaults(run=serve)
+    p = commands.add_parser("search")
+    p.add_argument("query")
+    p.add_argument("-n", type=int, default=10)
+    p.add_argument("-p", default=".")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(run=search)
+    p = commands.add_parser("nothing")
+    p.set_defaults(run=lambda args: sys.exit(2))
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Stand-in for pywhispercpp, for tests: put tests/fake_pywhispercpp on the path."""
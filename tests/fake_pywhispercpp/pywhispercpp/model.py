@@ -0,0 +1,38 @@
+"""Stand-in for pywhispercpp.model: no weights, no inference.
+
+Model.transcribe() describes what it was given, one segment per fact, so
+tests can check the audio and parameters that reached it and which process
+(server or in-process) answered:
+
+    model=<name>, samples=<n>, sum=<sum of samples>, language=<language>, pid=<pid>
+"""
+
+import os
+import time
+
+import numpy as np
+
+MODELS = {"tiny", "base", "small", "medium", "large"}
+LOAD_SECONDS = 0.05
+
+
+class Segment:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class Model:
+    def __init__(self, model: str = "tiny", print_progress: bool = True, **params):
+        if model not in MODELS:
+            raise ValueError(f"unknown model {model!r}")
+        time.sleep(LOAD_SECONDS)  # Loading the weights
+        self.model = model
+
+    def transcribe(self, media: np.ndarray, n_threads: int = None, **params) -> list:
+        return [
+            Segment(f"model={self.model}"),
+            Segment(f"samples={len(media)}"),
+            Segment(f"sum={float(np.sum(media, dtype=np.float64)):.4f}"),
+            Segment(f"language={params.get('language')}"),
+            Segment(f"pid={os.getpid()}"),
+        ]
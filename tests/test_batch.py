@@ -0,0 +1,24 @@
+"""`vibetotext batch` argument checks."""
+
+import pytest
+
+from vibetotext import batch
+
+
+@pytest.mark.parametrize("args, message", [
+    (["--threads", "0"], "--threads must be at least 1"),
+    (["--threads", "-2"], "--threads must be at least 1"),
+    (["--workers", "0"], "--workers must be at least 1"),
+    (["--workers", "-1"], "--workers must be at least 1"),
+])
+def test_rejects_non_positive_counts(tmp_path, capsys, args, message):
+    with pytest.raises(SystemExit) as exit_info:
+        batch.main([str(tmp_path), *args])
+    assert exit_info.value.code == 2  # Usage error, before any worker starts
+    assert message in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("kwargs", [{"n_threads": 0}, {"workers": 0}, {"workers": -3}])
+def test_run_batch_rejects_non_positive_counts(kwargs):
+    with pytest.raises(ValueError):
+        next(batch.run_batch([], **kwargs))
@@ -0,0 +1,151 @@
+"""GreppyWorker against tests/fake_greppy.py."""
+
+import os
+import shlex
+import stat
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from vibetotext import greppy
+from vibetotext.greppy import GreppyWorker
+
+FAKE_GREPPY = Path(__file__).parent / "fake_greppy.py"
+
+
+def fake_command(*args: str) -> str:
+    return shlex.join([sys.executable, str(FAKE_GREPPY), *args])
+
+
+@pytest.fixture
+def make_worker():
+    workers = []
+
+    def make(*args, **kwargs):
+        worker = GreppyWorker(fake_command(*args), **kwargs)
+        workers.append(worker)
+        return worker
+
+    yield make
+    for worker in workers:
+        worker.close()
+
+
+@pytest.fixture
+def one_shot_greppy(tmp_path, monkeypatch):
+    """Put a `greppy` on PATH that runs the stand-in, for the one-shot fallback."""
+    script = tmp_path / "greppy"
+    script.write_text(f"#!/bin/sh\nexec {shlex.quote(sys.executable)} {shlex.quote(str(FAKE_GREPPY))} \"$@\"\n")
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+
+
+def test_search_round_trip(make_worker):
+    worker = make_worker("serve")
+    assert worker.warm("/repo")
+
+    results = worker.search("parse config files", 2, "/repo")
+    assert [r["file_path"] for r in results] == ["/repo/parse.py", "/repo/config.py"]
+
+    # Later queries reuse the same process
+    again = worker.search("hotkey", 10, "/repo")
+    assert again[0]["worker_pid"] == results[0]["worker_pid"]
+
+
+def wait_ready(worker, timeout=10):
+    """Wait for a background warm-up to finish; True if the worker is ready."""
+    worker._warmed.wait(timeout)
+    return worker._ready
+
+
+def test_warm_waits_for_index_load(make_worker):
+    worker = make_worker("serve", "--load-delay", "1.0", timeout=0.2, warmup_timeout=10)
+    assert worker.warm("/repo")
+    assert worker.search("fast now", 10, "/repo") is not None
+
+
+def test_search_falls_back_while_warming(make_worker):
+    worker = make_worker("serve", "--load-delay", "1.0", warmup_timeout=10)
+    warming = threading.Thread(target=worker.warm, args=("/repo",))
+    warming.start()
+    time.sleep(0.2)
+
+    # Doesn't queue behind the warm-up: returns at once so the caller uses a one-shot search
+    start = time.monotonic()
+    assert worker.search("early", 10, "/repo") is None
+    assert time.monotonic() - start < 0.5
+
+    warming.join()
+    assert worker.search("later", 10, "/repo")[0]["file_path"] == "/repo/later.py"
+
+
+def test_first_search_starts_worker_in_background(make_worker):
+    worker = make_worker("serve", "--load-delay", "0.5")
+    start = time.monotonic()
+    assert worker.search("first", 10, "/repo") is None  # One-shot for now
+    assert time.monotonic() - start < 0.4
+    assert wait_ready(worker)
+    assert worker.search("second", 10, "/repo") is not None
+
+
+def test_restart_after_crash(make_worker):
+    worker = make_worker("serve", "--crash-after", "2")  # Warm-up, then one search
+    assert worker.warm("/repo")
+    first = worker.search("one", 10, "/repo")
+
+    # The process exited after answering: this query falls back while a new one warms up
+    assert worker.search("two", 10, "/repo") is None
+    assert wait_ready(worker)
+    third = worker.search("three", 10, "/repo")
+    assert third[0]["file_path"] == "/repo/three.py"
+    assert third[0]["worker_pid"] != first[0]["worker_pid"]
+
+
+def test_timeout_restarts_worker(make_worker):
+    worker = make_worker("serve", "--hang-on", "stuck", timeout=0.3)
+    assert worker.warm("/repo")
+    first = worker.search("fine", 10, "/repo")
+
+    assert worker.search("stuck query", 10, "/repo") is None
+
+    # A hang is not "no worker mode": a fresh worker is warmed for the next query
+    assert wait_ready(worker)
+    after = worker.search("fine again", 10, "/repo")
+    assert after is not None
+    assert after[0]["worker_pid"] != first[0]["worker_pid"]
+
+
+def test_warm_up_timeout_is_not_no_worker_mode(make_worker):
+    worker = make_worker("serve", "--load-delay", "5", warmup_timeout=0.3)
+    assert not worker.warm("/repo")
+    assert not worker.alive
+    assert worker._retry_at == 0  # The next query starts a fresh worker
+    assert worker.search("query", 10, "/repo") is None
+    assert worker.alive
+
+
+def test_no_worker_mode_backs_off(make_worker):
+    worker = make_worker("nothing")
+    assert worker.search("query", 10, "/repo") is None
+    assert not wait_ready(worker)
+    assert worker._retry_at > 0
+    # Within the back-off, no new process is spawned
+    assert not worker._start()
+    assert not worker.warm("/repo")
+
+
+def test_run_search_falls_back_to_one_shot(make_worker, one_shot_greppy, monkeypatch):
+    monkeypatch.setattr(greppy, "_worker", make_worker("nothing"))
+    results = greppy.run_search("speculative search", 10, "/repo")
+    assert [r["file_path"] for r in results] == ["/repo/speculative.py", "/repo/search.py"]
+
+
+def test_search_files_dedupes_worker_results(make_worker, monkeypatch):
+    worker = make_worker("serve")
+    assert worker.warm("/repo")
+    monkeypatch.setattr(greppy, "_worker", worker)
+    files = greppy.search_files("cli cli recorder", limit=10, codebase="/repo")
+    assert files == [("/repo/cli.py", 1), ("/repo/recorder.py", 3)]
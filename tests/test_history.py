@@ -0,0 +1,296 @@
+"""TranscriptionHistory on a temporary database."""
+
+from datetime import datetime
+
+import pytest
+
+from vibetotext.history import TranscriptionHistory
+
+
+def entry(text: str, mode: str = "transcribe", timestamp: str = "2025-03-04T10:00:00", duration=None) -> dict:
+    return {"text": text, "mode": mode, "timestamp": timestamp, "duration_seconds": duration}
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "history.db"
+
+
+@pytest.fixture
+def history(db_path):
+    history = TranscriptionHistory(db_path)
+    yield history
+    history.close()
+
+
+def test_wal_mode(history):
+    with history._read_connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_pooled_reader_sees_later_commits(history):
+    with history._read_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0] == 0
+    history.add_entry("first entry", "transcribe")
+    assert history.flush(timeout=10)
+    with history._read_connection() as conn:  # Same pooled connection, new snapshot
+        assert conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0] == 1
+
+
+def test_readers_not_blocked_by_open_write(history):
+    history.add_entry("committed", "transcribe")
+    assert history.flush(timeout=10)
+    with history._get_connection() as writer:
+        writer.execute(
+            "INSERT INTO entries (text, mode, timestamp, word_count) VALUES ('pending', 'transcribe', ?, 1)",
+            (datetime.now().isoformat(),),
+        )
+        # The write transaction is open; a reader still gets the last committed snapshot at once
+        with history._read_connection() as conn:
+            assert [r["text"] for r in conn.execute("SELECT text FROM entries")] == ["committed"]
+        writer.rollback()
+
+
+def test_add_entries_then_close_writes_everything(db_path):
+    n = TranscriptionHistory.MAX_BATCH * 2 + 37  # Several writer batches
+    history = TranscriptionHistory(db_path)
+    entries = (entry(f"entry number {i}", timestamp=f"2025-03-04T10:{i // 60:02d}:{i % 60:02d}") for i in range(n))
+    assert history.add_entries(entries) == n
+    history.close()  # No flush(): close() drains the queue
+
+    history = TranscriptionHistory(db_path)
+    try:
+        assert history.entry_count == n
+        texts = {e["text"] for e in history.get_entries()}
+        assert texts == {f"entry number {i}" for i in range(n)}
+    finally:
+        history.close()
+
+
+def test_add_entry_fills_in_word_count_and_wpm(history):
+    history.add_entry("one two three four five six", "cleanup", datetime(2025, 3, 4, 9, 30), duration_seconds=3.0)
+    history.add_entries([{"text": "defaults only"}])
+    assert history.flush(timeout=10)
+
+    newest, oldest = history.get_entries()
+    assert (oldest["mode"], oldest["word_count"], oldest["wpm"]) == ("cleanup", 6, 120)
+    assert oldest["timestamp"] == "2025-03-04T09:30:00"
+    assert (newest["mode"], newest["word_count"], newest["wpm"]) == ("transcribe", 2, None)
+    assert history.entry_count == 2
+
+
+def test_close_is_idempotent(history):
+    history.add_entry("last words", "transcribe")
+    history.close()
+    history.close()
+    assert history.flush() is True  # Nothing left to wait for
+
+
+WORDS_ENTRIES = [
+    entry("Deploy the database migration", "transcribe", "2025-03-01T09:00:00"),
+    entry("database schema and database indexes", "cleanup", "2025-03-02T10:00:00"),
+    entry("deploy again, then check the database!", "transcribe", "2025-03-03T11:00:00"),
+]
+
+
+def test_common_words_counted_at_insert(history):
+    history.add_entries(WORDS_ENTRIES)
+    assert history.flush(timeout=10)
+
+    assert history.get_common_words(3) == [("database", 4), ("deploy", 2), ("check", 1)]
+    assert history.get_common_words(2, mode="cleanup") == [("database", 2), ("indexes", 1)]
+    assert history.get_common_words(2, since="2025-03-03") == [("check", 1), ("database", 1)]
+    assert not {"the", "again", "and"} & set(dict(history.get_common_words(100)))  # Stopwords skipped
+
+
+def test_word_tables_rebuilt_when_version_changes(db_path):
+    history = TranscriptionHistory(db_path)
+    history.add_entries(WORDS_ENTRIES)
+    history.close()
+
+    history = TranscriptionHistory(db_path)
+    try:
+        expected = history.get_common_words(100)
+        # Simulate a database from before the word tables (or an older tokenizer)
+        with history._get_connection() as conn:
+            conn.execute("DELETE FROM word_totals")
+            conn.execute("DELETE FROM meta WHERE key = 'word_counts_version'")
+            conn.commit()
+    finally:
+        history.close()
+
+    history = TranscriptionHistory(db_path)  # Queues the backfill
+    try:
+        assert history.flush(timeout=10)
+        assert history.get_common_words(100) == expected
+    finally:
+        history.close()
+
+
+STATS_ENTRIES = [
+    entry("one two three four five six", "transcribe", "2025-03-01T09:00:00", duration=3.0),  # 120 wpm
+    entry("one two three", "cleanup", "2025-03-01T18:00:00", duration=3.0),  # 60 wpm
+    entry("typed without a recording", "transcribe", "2025-03-02T08:00:00"),
+]
+
+
+def daily_rows(history) -> list:
+    with history._read_connection() as conn:
+        return [tuple(row) for row in conn.execute("SELECT * FROM daily_stats ORDER BY day, mode")]
+
+
+def test_statistics_from_rollups(history):
+    history.add_entries(STATS_ENTRIES)
+    assert history.flush(timeout=10)
+
+    stats = history.get_statistics()
+    assert stats["total_sessions"] == 3
+    assert stats["total_words"] == 13
+    assert stats["avg_wpm"] == 90
+    assert stats["total_duration_seconds"] == 6.0
+    # 9 words with a recording, typed at 40 wpm, minus the 6 seconds spent speaking them
+    assert stats["time_saved_minutes"] == round(9 / 40 - 6 / 60, 1)
+
+
+def test_rollups_consistent_across_reopen(db_path):
+    history = TranscriptionHistory(db_path)
+    history.add_entries(STATS_ENTRIES[:2])
+    history.close()
+
+    history = TranscriptionHistory(db_path)
+    history.add_entries(STATS_ENTRIES[2:] + [entry("more on day one", "cleanup", "2025-03-01T20:00:00", 2.0)])
+    history.close()
+
+    history = TranscriptionHistory(db_path)
+    try:
+        incremental = daily_rows(history)
+        stats = history.get_statistics()
+        assert len(incremental) == 3  # (day, mode) pairs
+        # Rebuilding from entries gives the same rows as the insert-time updates
+        with history._get_connection() as conn:
+            history._backfill_rollups(conn)
+            conn.commit()
+        assert daily_rows(history) == incremental
+        assert history.get_statistics() == stats
+    finally:
+        history.close()
+
+
+def test_clear_empties_everything(history):
+    history.add_entries(STATS_ENTRIES + WORDS_ENTRIES)
+    history.clear()
+
+    assert history.entry_count == 0
+    assert history.get_entries() == []
+    assert history.get_statistics()["total_sessions"] == 0
+    assert history.get_common_words() == []
+    assert history.search("database") == []
+    assert daily_rows(history) == []
+
+    history.add_entry("after clearing", "transcribe")
+    assert history.flush(timeout=10)
+    assert history.get_statistics()["total_sessions"] == 1
+
+
+SEARCH_ENTRIES = [
+    entry("fixing the login redirect bug", "transcribe", "2025-01-10T09:00:00"),
+    entry("the login page needs a new button", "cleanup", "2025-02-10T09:00:00"),
+    entry("refactor the payment service", "plan", "2025-03-10T09:00:00"),
+    entry("fixed the payment retry bug", "transcribe", "2025-04-10T09:00:00"),
+]
+
+
+@pytest.fixture
+def searchable(history):
+    history.add_entries(SEARCH_ENTRIES)
+    assert history.flush(timeout=10)
+    return history
+
+
+def texts(results) -> list:
+    return [r["text"] for r in results]
+
+
+def test_search_all_words_stemmed(searchable):
+    if not searchable._fts:
+        pytest.skip("SQLite built without FTS5")
+    # "fix" matches "fixing" and "fixed"; every word must match
+    assert set(texts(searchable.search("fix bug"))) == {SEARCH_ENTRIES[0]["text"], SEARCH_ENTRIES[3]["text"]}
+    assert texts(searchable.search("login bug")) == [SEARCH_ENTRIES[0]["text"]]
+    assert searchable.search("nothing matches this") == []
+
+    result = searchable.search("payment", limit=1)[0]
+    assert result["rank"] is not None
+    assert "[payment]" in result["snippet"]
+
+
+def test_search_filters(searchable):
+    assert texts(searchable.search("login", mode="cleanup")) == [SEARCH_ENTRIES[1]["text"]]
+    assert texts(searchable.search("payment", since="2025-04-01")) == [SEARCH_ENTRIES[3]["text"]]
+
+
+@pytest.mark.parametrize("query", ['login AND', 'NEAR(login', '"payment', 'pay*', '-login', 'text:login', '()'])
+def test_search_syntax_is_literal(searchable, query):
+    searchable.search(query)  # No FTS5 syntax error
+
+
+def test_common_words_return_newest_matches(searchable, monkeypatch):
+    if not searchable._fts:
+        pytest.skip("SQLite built without FTS5")
+    monkeypatch.setattr(searchable, "SEARCH_RANK_LIMIT", 1)
+    results = searchable.search("bug")  # Matches 2 entries, over the limit
+    assert texts(results) == [SEARCH_ENTRIES[3]["text"], SEARCH_ENTRIES[0]["text"]]
+    assert all(r["rank"] is None for r in results)
+
+
+def test_search_index_follows_deletes(searchable):
+    with searchable._get_connection() as conn:
+        conn.execute("DELETE FROM entries WHERE text LIKE 'refactor%'")
+        conn.commit()
+    assert searchable.search("refactor") == []
+
+
+def test_like_fallback(searchable, monkeypatch):
+    monkeypatch.setattr(searchable, "_fts", False)
+    assert texts(searchable.search("payment")) == [SEARCH_ENTRIES[3]["text"], SEARCH_ENTRIES[2]["text"]]
+    assert texts(searchable.search("login", mode="cleanup")) == [SEARCH_ENTRIES[1]["text"]]
+
+
+@pytest.fixture
+def paged(history):
+    # Pairs of entries share a timestamp, so the id tie-breaker matters
+    history.add_entries(
+        entry(f"entry {i}", "cleanup" if i % 3 == 0 else "transcribe", f"2025-03-04T10:00:{i // 2:02d}")
+        for i in range(23)
+    )
+    assert history.flush(timeout=10)
+    with history._read_connection() as conn:
+        expected = [row["text"] for row in conn.execute("SELECT text FROM entries ORDER BY timestamp DESC, id DESC")]
+    return history, expected
+
+
+def test_pages_cover_every_entry_once(paged):
+    history, expected = paged
+    seen, cursor, pages = [], None, 0
+    while True:
+        entries, cursor = history.get_page(5, cursor)
+        seen.extend(e["text"] for e in entries)
+        pages += 1
+        if cursor is None:
+            break
+    assert seen == expected
+    assert pages == 5  # The last page is short, so there's no empty extra page
+
+
+def test_page_of_exact_size_ends_with_empty_page(paged):
+    history, expected = paged
+    entries, cursor = history.get_page(len(expected))
+    assert len(entries) == len(expected) and cursor is not None
+    assert history.get_page(len(expected), cursor) == ([], None)
+
+
+def test_iter_entries(paged):
+    history, expected = paged
+    assert [e["text"] for e in history.iter_entries(page_size=4)] == expected
+    cleanup = [e["text"] for e in history.iter_entries(page_size=2, mode="cleanup")]
+    assert cleanup == [text for text in expected if int(text.split()[1]) % 3 == 0]
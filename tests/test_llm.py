@@ -0,0 +1,129 @@
+"""LLMClient, the response cache and streamed pasting against a local fake Gemini server."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("google.generativeai")
+
+from vibetotext import llm  # noqa: E402
+from vibetotext.llm import ResponseCache  # noqa: E402
+
+CHUNKS = ["Refined: ", "first line\n", "second ", "line with more words ", "and the end.  "]
+
+
+def _response(text: str) -> dict:
+    return {"candidates": [{"content": {"parts": [{"text": text}], "role": "model"}, "index": 0}]}
+
+
+class FakeGemini(BaseHTTPRequestHandler):
+    """generateContent and streamGenerateContent (a chunked JSON array, one element per chunk)."""
+
+    protocol_version = "HTTP/1.1"  # Keep-alive, so connection reuse is observable
+    requests = []  # (path, client port) per request
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.requests.append((self.path.split("?")[0], self.client_address[1]))
+
+        if ":streamGenerateContent" in self.path:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+
+            def write(text):
+                data = text.encode()
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                self.wfile.flush()
+
+            write("[")
+            for i, chunk in enumerate(CHUNKS):
+                write((",\n" if i else "") + json.dumps(_response(chunk)))
+            write("]")
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            data = json.dumps(_response("".join(CHUNKS))).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+
+@pytest.fixture
+def gemini(tmp_path, monkeypatch):
+    """Point llm at a fake server (REST transport) with a fresh client and a temporary cache."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeGemini)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    FakeGemini.requests = []
+
+    monkeypatch.setattr(llm, "_api_key", "test-key")
+    monkeypatch.setattr(llm, "_api_endpoint", f"http://127.0.0.1:{server.server_address[1]}")
+    monkeypatch.setattr(llm, "_genai", None)
+    monkeypatch.setattr(llm, "_client", None)
+    cache = ResponseCache(tmp_path / "llm_cache.db")
+    monkeypatch.setattr(llm, "_cache", cache)
+
+    yield FakeGemini.requests
+    cache.close()
+    server.shutdown()
+    server.server_close()
+
+
+def test_requests_reuse_one_connection(gemini):
+    assert llm.cleanup_text("first transcript") == "".join(CHUNKS).strip()
+    assert llm.generate_implementation_plan("second transcript") == "".join(CHUNKS).strip()
+    assert "".join(llm.stream_cleanup_text("third transcript")) == "".join(CHUNKS)
+
+    assert len(gemini) == 3
+    assert gemini[2][0].endswith(":streamGenerateContent")
+    assert len({port for _, port in gemini}) == 1  # Same client socket every time
+
+
+def test_streamed_chunks_arrive_in_order(gemini):
+    assert list(llm.stream_cleanup_text("a transcript")) == CHUNKS
+
+
+def test_cache_hit_skips_the_server(gemini):
+    first = llm.cleanup_text("the same transcript")
+    assert llm.cleanup_text("the  same\ntranscript ") == first  # Whitespace differences still hit
+    assert len(gemini) == 1
+
+    # A completed stream is cached too, and a hit comes back as a single chunk
+    streamed = "".join(llm.stream_implementation_plan("plan this"))
+    assert list(llm.stream_implementation_plan("plan this")) == [streamed.strip()]
+    assert len(gemini) == 2
+
+    stats = llm.get_cache().stats()
+    assert (stats["hits"], stats["misses"]) == (2, 2)
+
+
+def test_cache_key_keeps_case(gemini):
+    llm.cleanup_text("Use the API key")
+    llm.cleanup_text("use the api key")
+    assert len(gemini) == 2
+
+
+def test_streamed_paste_in_order(gemini, monkeypatch):
+    pytest.importorskip("pyperclip")
+    from vibetotext import output
+
+    clipboard = []
+    pasted = []
+    monkeypatch.setattr(output, "SYSTEM", "Linux")
+    monkeypatch.setattr(output.pyperclip, "copy", clipboard.append)
+    monkeypatch.setattr(output, "simulate_paste", lambda: pasted.append(clipboard[-1]) or True)
+    monkeypatch.setattr(output, "STREAM_PASTE_DELAY", 0)
+
+    text = output.paste_stream(llm.stream_cleanup_text("paste me"))
+
+    assert text == "".join(CHUNKS).strip()
+    assert "".join(pasted) == text  # Pieces pasted in order, nothing lost or repeated
+    assert pasted[0] == "Refined: first line"  # First piece goes out at the first line break
+    assert clipboard[-1] == text  # Clipboard ends with the whole response
@@ -0,0 +1,70 @@
+"""Frames and the shared level buffer between ui.py and the overlay scripts."""
+
+import io
+
+import numpy as np
+import pytest
+
+from vibetotext import overlay_protocol as protocol
+from vibetotext.ui import LevelBuffer
+
+
+def frame(msg_type: int, payload: bytes = b"") -> bytes:
+    return protocol.HEADER.pack(msg_type, len(payload)) + payload
+
+
+def decode(data: bytes) -> list:
+    messages = []
+    protocol.read_messages(io.BytesIO(data), lambda msg_type, value: messages.append((msg_type, value)))
+    return messages
+
+
+def test_frames_round_trip():
+    levels = [i / protocol.NUM_BARS for i in range(protocol.NUM_BARS)]
+    data = (
+        frame(protocol.MSG_SHOW, protocol.SHOW.pack(0, 25, 1920, 1080))
+        + frame(protocol.MSG_LEVELS, protocol.LEVELS.pack(*levels))
+        + frame(protocol.MSG_HIDE)
+    )
+    messages = decode(data)
+
+    assert [m[0] for m in messages] == [protocol.MSG_SHOW, protocol.MSG_LEVELS, protocol.MSG_HIDE, protocol.MSG_STOP]
+    assert messages[0][1] == (0, 25, 1920, 1080)
+    assert messages[1][1] == pytest.approx(levels)
+
+
+def test_truncated_frame_ends_with_stop():
+    data = frame(protocol.MSG_HIDE) + frame(protocol.MSG_LEVELS, protocol.LEVELS.pack(*[0.5] * protocol.NUM_BARS))[:-3]
+    assert decode(data) == [(protocol.MSG_HIDE, None), (protocol.MSG_STOP, None)]
+
+
+def test_shared_levels_read_what_the_parent_writes():
+    buffer = LevelBuffer()
+    try:
+        assert buffer.SIZE == protocol.LEVEL_BUFFER_SIZE
+        reader = protocol.SharedLevels(buffer.name)
+        levels = np.linspace(0, 1, protocol.NUM_BARS, dtype=np.float32)
+
+        buffer.write(levels)
+        assert reader.read() == pytest.approx(levels.tolist())
+        assert reader.read() is None  # Nothing new since
+        buffer.write(levels[::-1])
+        assert reader.read() == pytest.approx(levels[::-1].tolist())
+        reader._shm.close()
+    finally:
+        buffer.close()
+
+
+def test_open_shared_levels_acks_only_after_attaching(capfdbinary):
+    buffer = LevelBuffer()
+    try:
+        shared = protocol.open_shared_levels(["overlay", buffer.name])
+        assert shared is not None
+        assert capfdbinary.readouterr().out == protocol.ACK_SHARED_LEVELS
+        shared._shm.close()
+    finally:
+        buffer.close()
+
+    assert protocol.open_shared_levels(["overlay", "vibetotext-no-such-segment"]) is None
+    assert protocol.open_shared_levels(["overlay"]) is None
+    assert capfdbinary.readouterr().out == b""  # No ack: the parent keeps sending frames
@@ -0,0 +1,41 @@
+"""AudioRecorder's waveform levels, fed blocks directly instead of from a sound device."""
+
+import numpy as np
+import pytest
+
+from vibetotext.recorder import AudioRecorder
+
+SAMPLE_RATE = 16000
+BLOCK = 160  # 10 ms
+
+
+def tone(frames: int) -> np.ndarray:
+    t = np.arange(frames) / SAMPLE_RATE
+    return (0.3 * np.sin(2 * np.pi * 440 * t)).astype(np.float32).reshape(-1, 1)
+
+
+def test_levels_pushed_at_level_rate():
+    recorder = AudioRecorder(SAMPLE_RATE, max_seconds=2, level_rate=20)
+    pushed = []
+    recorder.on_level = lambda levels: pushed.append(levels.copy())
+    recorder.recording = True
+
+    block = tone(BLOCK)
+    for _ in range(100):  # One second
+        recorder._callback(block, BLOCK, None, None)
+
+    assert len(pushed) == 21  # On the first block, then every 50 ms
+    assert 0 < pushed[-1].max() <= 1
+
+
+def test_no_levels_without_a_listener():
+    recorder = AudioRecorder(SAMPLE_RATE, max_seconds=2)
+    recorder.recording = True
+    recorder._callback(tone(BLOCK), BLOCK, None, None)
+    assert not recorder._prev_levels.any()  # Spectrum never computed
+
+
+@pytest.mark.parametrize("level_rate", [0, -30])
+def test_level_rate_must_be_positive(level_rate):
+    with pytest.raises(ValueError, match="level_rate"):
+        AudioRecorder(level_rate=level_rate)
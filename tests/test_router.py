@@ -0,0 +1,116 @@
+"""ModelRouter decisions, with stand-in transcribers and a fixed system load."""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from vibetotext import router as router_module
+from vibetotext.router import PRIOR_RTF, RTF_SMOOTHING, ModelRouter
+from vibetotext.vad import trim_silence
+
+SAMPLE_RATE = 16000
+
+
+def speech(seconds: float, padding: float = 1.0) -> np.ndarray:
+    """A tone standing in for speech, with silence before and after."""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    silence = np.zeros(int(padding * SAMPLE_RATE), dtype=np.float32)
+    return np.concatenate([silence, 0.3 * np.sin(2 * np.pi * 220 * t).astype(np.float32), silence])
+
+
+class FakeTranscriber:
+    """Transcriber stand-in that records each call and takes no time."""
+
+    def __init__(self, model_name: str, text: str = "some words"):
+        self.model_name = model_name
+        self.text = text
+        self.calls = []
+
+    def transcribe(self, audio, sample_rate=16000, n_threads=None, vad=None):
+        self.calls.append((len(audio), n_threads, vad))
+        return self.text
+
+
+@pytest.fixture
+def make_router(monkeypatch):
+    monkeypatch.setattr(router_module, "_system_load", lambda: 0.0)
+
+    def make(models, slo_seconds, cpus=8, vad=True, text="some words"):
+        router = ModelRouter(models, slo_seconds, vad=vad, log_path=None)
+        router.cpus = cpus  # Idle and with cores to spare: slowdown 1
+        router._transcribers = {name: FakeTranscriber(name, text) for name in router.models}
+        return router
+
+    return make
+
+
+def test_largest_model_that_fits(make_router):
+    router = make_router(["small", "tiny", "base"], slo_seconds=1.0)
+    # 2s of speech: tiny 0.08s, base 0.16s, small 0.5s predicted
+    assert router.choose(2.0)["model"] == "small"
+    # 5s: small would take 1.25s
+    assert router.choose(5.0)["model"] == "base"
+
+
+def test_falls_back_to_smallest(make_router):
+    router = make_router(["base", "medium"], slo_seconds=0.01)
+    decision = router.choose(10.0)
+    assert decision["model"] == "base"
+    assert decision["predicted"] > 0.01
+
+
+def test_load_reduces_threads(make_router, monkeypatch):
+    router = make_router(["tiny"], slo_seconds=1.0, cpus=4)
+    monkeypatch.setattr(router_module, "_system_load", lambda: 2.0)
+    decision = router.choose(1.0)
+    assert decision["threads"] == 2
+    assert decision["slowdown"] == 2.0  # Half the threads, cores fully used
+
+
+def test_routes_on_trimmed_audio(make_router):
+    router = make_router(["tiny", "small"], slo_seconds=1.0)
+    audio = speech(3.0, padding=3.0)  # 9s recorded, 3s of speech: small fits only after trimming
+
+    router.transcribe(audio, SAMPLE_RATE)
+
+    assert router.decisions[-1]["model"] == "small"
+    assert router.decisions[-1]["duration"] == pytest.approx(len(trim_silence(audio)) / SAMPLE_RATE, abs=0.01)
+    # MAX_THREADS, and the transcriber is told the audio is already trimmed
+    assert router._transcribers["small"].calls == [(len(trim_silence(audio)), 4, False)]
+
+
+def test_no_trimming_without_vad(make_router):
+    router = make_router(["tiny"], slo_seconds=1.0, vad=False)
+    audio = speech(1.0)
+    router.transcribe(audio, SAMPLE_RATE)
+    assert router._transcribers["tiny"].calls[0][0] == len(audio)
+
+
+def test_silence_runs_no_model(make_router):
+    router = make_router(["tiny"], slo_seconds=1.0)
+    assert router.transcribe(np.zeros(2 * SAMPLE_RATE, dtype=np.float32), SAMPLE_RATE) == ""
+    assert router._transcribers["tiny"].calls == []
+    assert not router.decisions
+
+
+def test_rtf_follows_runs(make_router, monkeypatch):
+    router = make_router(["base"], slo_seconds=1.0, vad=False)
+    clock = itertools.count(100.0, 1.0)  # Each run takes 1s
+    monkeypatch.setattr(router_module.time, "time", lambda: next(clock))
+
+    router.transcribe(speech(2.0, padding=0.0), SAMPLE_RATE)
+
+    measured = 1.0 / 2.0  # Seconds per second of audio, slowdown 1
+    assert router._rtf["base"] == pytest.approx(PRIOR_RTF["base"] + RTF_SMOOTHING * (measured - PRIOR_RTF["base"]))
+    assert router.stats()["requests"] == 1
+
+
+def test_empty_text_leaves_rtf(make_router, monkeypatch):
+    router = make_router(["base"], slo_seconds=1.0, vad=False, text="")
+    clock = itertools.count(100.0, 5.0)
+    monkeypatch.setattr(router_module.time, "time", lambda: next(clock))
+
+    assert router.transcribe(speech(2.0, padding=0.0), SAMPLE_RATE) == ""
+    assert router._rtf["base"] == PRIOR_RTF["base"]
+    assert router.decisions[-1]["actual"] == 5.0  # Still recorded
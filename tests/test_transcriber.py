@@ -0,0 +1,108 @@
+"""TieredTranscriber: which passes run, and on what audio."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from vibetotext.transcriber import TieredTranscriber, Transcriber
+from vibetotext.vad import trim_silence
+
+SAMPLE_RATE = 16000
+FAKE_PYWHISPERCPP = Path(__file__).parent / "fake_pywhispercpp"
+
+
+def speech(seconds: float, padding: float = 1.0) -> np.ndarray:
+    """A tone standing in for speech, with silence before and after."""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    silence = np.zeros(int(padding * SAMPLE_RATE), dtype=np.float32)
+    return np.concatenate([silence, 0.3 * np.sin(2 * np.pi * 220 * t).astype(np.float32), silence])
+
+
+class FakePass:
+    """Transcriber stand-in that records the audio length and vad argument of each call."""
+
+    def __init__(self, model_name: str, text: str):
+        self.model_name = model_name
+        self.vad = True
+        self.text = text
+        self.calls = []
+
+    def transcribe(self, audio, sample_rate=16000, vad=None):
+        self.calls.append((len(audio), vad))
+        return self.text
+
+
+def test_long_speech_skips_the_draft():
+    audio = speech(6.0)
+    draft, refine = FakePass("tiny", "draft"), FakePass("small", "refined text")
+    drafts = []
+
+    text = TieredTranscriber(draft, refine).transcribe(audio, on_draft=drafts.append)
+
+    assert text == "refined text"
+    assert draft.calls == [] and drafts == []
+    assert refine.calls == [(len(trim_silence(audio)), False)]  # Trimmed once, here
+
+
+def test_clean_short_draft_is_kept():
+    draft, refine = FakePass("tiny", "open the config file"), FakePass("small", "refined")
+    drafts = []
+
+    text = TieredTranscriber(draft, refine).transcribe(speech(2.0), on_draft=drafts.append)
+
+    assert text == "open the config file"
+    assert refine.calls == [] and drafts == []
+
+
+def test_unreliable_draft_is_refined_on_the_same_audio():
+    audio = speech(2.0)
+    draft = FakePass("tiny", "the the the the the the the the")  # Repetition loop
+    refine = FakePass("small", "then run the tests")
+    drafts = []
+
+    text = TieredTranscriber(draft, refine).transcribe(audio, on_draft=drafts.append)
+
+    assert text == "then run the tests"
+    assert drafts == [draft.text]  # Handed over before the refine pass
+    trimmed = len(trim_silence(audio))
+    assert draft.calls == refine.calls == [(trimmed, False)]
+
+
+def test_silence_runs_no_pass():
+    draft, refine = FakePass("tiny", "draft"), FakePass("small", "refined")
+    assert TieredTranscriber(draft, refine).transcribe(np.zeros(3 * SAMPLE_RATE, dtype=np.float32)) == ""
+    assert draft.calls == refine.calls == []
+
+
+def test_transcribers_skip_their_own_vad(monkeypatch):
+    """With real Transcribers (stand-in model), each pass sees the audio trimmed by the tiered transcriber."""
+    monkeypatch.syspath_prepend(str(FAKE_PYWHISPERCPP))
+    monkeypatch.delitem(sys.modules, "pywhispercpp", raising=False)
+    monkeypatch.delitem(sys.modules, "pywhispercpp.model", raising=False)
+    tiered = TieredTranscriber(Transcriber("tiny"), Transcriber("base"))
+
+    # Long: only the refine model runs
+    audio = speech(5.0, padding=2.0)
+    text = tiered.transcribe(audio)
+    assert text.startswith("model=base ")
+    assert f"samples={len(trim_silence(audio))} " in text
+
+    # Short: the stand-in's five-word answer looks like a clean draft and is kept
+    audio = speech(2.0, padding=2.0)
+    text = tiered.transcribe(audio)
+    assert text.startswith("model=tiny ")
+    assert f"samples={len(trim_silence(audio))} " in text
+
+
+@pytest.mark.parametrize("vad, trimmed", [(None, True), (True, True), (False, False)])
+def test_transcribe_vad_argument(monkeypatch, vad, trimmed):
+    monkeypatch.syspath_prepend(str(FAKE_PYWHISPERCPP))
+    monkeypatch.delitem(sys.modules, "pywhispercpp", raising=False)
+    monkeypatch.delitem(sys.modules, "pywhispercpp.model", raising=False)
+    audio = speech(2.0)
+
+    text = Transcriber("tiny", vad=True).transcribe(audio, vad=vad)
+
+    assert f"samples={len(trim_silence(audio)) if trimmed else len(audio)} " in text
@@ -0,0 +1,81 @@
+"""ui.py's sender thread and shutdown, with a stand-in overlay process."""
+
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pytest
+
+from vibetotext import overlay_protocol as protocol
+from vibetotext import ui
+
+READ_STDIN = "import shutil, sys; shutil.copyfileobj(sys.stdin.buffer, open(sys.argv[1], 'wb'))"
+IGNORE_STDIN = "import time; time.sleep(60)"
+
+
+class FakeRecorder:
+    on_level = None
+
+
+def overlay(code: str, *args) -> subprocess.Popen:
+    process = subprocess.Popen([sys.executable, "-c", code, *args], stdin=subprocess.PIPE, bufsize=0)
+    ui._ui_process = process  # As _ensure_ui_process() would, minus the window
+    return process
+
+
+@pytest.fixture(autouse=True)
+def clean_ui():
+    yield
+    ui.stop_ui()
+
+
+def test_frames_reach_the_overlay_in_order(tmp_path):
+    out = tmp_path / "frames"
+    process = overlay(READ_STDIN, str(out))
+    levels = np.linspace(0, 1, protocol.NUM_BARS, dtype=np.float32)
+
+    ui.show_recording()  # No shared buffer attached: levels go over the pipe
+    ui.update_waveform(levels)
+    time.sleep(0.2)
+    ui.hide_recording()
+    ui._stop_ipc_thread()  # Sends what is queued, then exits
+    process.stdin.close()
+    process.wait(timeout=5)
+
+    messages = []
+    with open(out, "rb") as f:
+        protocol.read_messages(f, lambda msg_type, value: messages.append((msg_type, value)))
+    types = [m[0] for m in messages]
+    assert types == [protocol.MSG_SHOW, protocol.MSG_LEVELS, protocol.MSG_HIDE, protocol.MSG_STOP]  # Last: EOF
+    assert messages[1][1] == pytest.approx(levels.tolist())
+
+
+def test_stalled_overlay_never_blocks_senders():
+    overlay(IGNORE_STDIN)
+    ui.show_recording()
+    payload = bytes(4000)
+
+    start = time.monotonic()
+    for _ in range(1000):  # ~4 MB, far more than a pipe buffer holds
+        ui._send(protocol.MSG_SHOW, payload)
+    assert time.monotonic() - start < 1.0
+
+
+def test_stop_ui_detaches_the_recorder_before_closing_the_buffer():
+    overlay(IGNORE_STDIN)
+    recorder = FakeRecorder()
+    ui.connect_recorder(recorder)
+    assert recorder.on_level == ui.update_waveform
+    buffer = ui._ensure_level_buffer()
+    ui.show_recording()
+    recorder.on_level(np.ones(protocol.NUM_BARS, dtype=np.float32))
+
+    start = time.monotonic()
+    ui.stop_ui()
+    assert time.monotonic() - start < 5.0
+    assert recorder.on_level is None
+    assert ui._level_buffer is None and ui._ui_process is None
+    with pytest.raises(FileNotFoundError):
+        protocol.SharedLevels(buffer.name)  # Unlinked
+    ui.update_waveform(np.ones(protocol.NUM_BARS, dtype=np.float32))  # A late callback is a no-op
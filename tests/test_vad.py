@@ -0,0 +1,52 @@
+"""Silence trimming before inference."""
+
+import numpy as np
+import pytest
+
+from vibetotext.vad import FRAME_MS, HANGOVER_MS, MIN_SECONDS, trim_silence
+
+SAMPLE_RATE = 16000
+FRAME = SAMPLE_RATE * FRAME_MS // 1000
+
+
+def tone(n: int) -> np.ndarray:
+    return (0.3 * np.sin(2 * np.pi * 220 * np.arange(n) / SAMPLE_RATE)).astype(np.float32)
+
+
+def clip(seconds: float, speech: slice) -> np.ndarray:
+    audio = np.zeros(int(seconds * SAMPLE_RATE), dtype=np.float32)
+    audio[speech] = tone(len(audio[speech]))
+    return audio
+
+
+@pytest.mark.parametrize("n_samples, speech, whole", [
+    (4800, slice(0, 480), False),  # Speech in the first frame only
+    (4800, slice(4320, 4800), False),  # ... the last frame only
+    (FRAME * 3, slice(FRAME, 2 * FRAME), True),  # Fewer frames than the hangover window
+    (FRAME * 3 + 100, slice(0, FRAME), True),  # Partial trailing frame
+])
+def test_clips_shorter_than_the_hangover_window(n_samples, speech, whole):
+    audio = np.zeros(n_samples, dtype=np.float32)
+    audio[speech] = tone(speech.stop - speech.start)
+    trimmed = trim_silence(audio, SAMPLE_RATE)
+    if whole:
+        assert trimmed is audio  # Every frame is within the hangover: nothing to trim
+    else:
+        assert len(trimmed) == int(MIN_SECONDS * SAMPLE_RATE)  # Padded up to whisper.cpp's minimum
+    assert np.isclose(np.sum(trimmed**2), np.sum(audio**2))  # All of the speech kept
+
+
+def test_silence_is_empty():
+    assert len(trim_silence(np.zeros(SAMPLE_RATE, dtype=np.float32), SAMPLE_RATE)) == 0
+
+
+def test_leading_and_trailing_silence_dropped():
+    audio = clip(4.0, slice(SAMPLE_RATE, 3 * SAMPLE_RATE))
+    trimmed = trim_silence(audio, SAMPLE_RATE)
+    hangover = HANGOVER_MS * SAMPLE_RATE // 1000
+    assert 2 * SAMPLE_RATE <= len(trimmed) <= 2 * SAMPLE_RATE + 2 * hangover + 2 * FRAME
+
+
+def test_short_speech_padded_to_minimum():
+    audio = clip(3.0, slice(SAMPLE_RATE, SAMPLE_RATE + 2 * FRAME))
+    assert len(trim_silence(audio, SAMPLE_RATE)) == int(MIN_SECONDS * SAMPLE_RATE)
@@ -0,0 +1,151 @@
+"""TranscriptionServer and TranscriptionClient on a temporary socket, with tests/fake_pywhispercpp as the model."""
+
+import os
+import shutil
+import signal
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from vibetotext import whisper_server
+from vibetotext.whisper_server import TranscriptionClient, _ping, spawn_server
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="uses Unix sockets and signals")
+
+FAKE_PYWHISPERCPP = Path(__file__).parent / "fake_pywhispercpp"
+
+
+def expected(model_name: str, audio: np.ndarray, language: str = "None") -> list:
+    """What the stand-in model answers for audio, without the answering pid."""
+    return [
+        f"model={model_name}",
+        f"samples={len(audio)}",
+        f"sum={float(np.sum(audio, dtype=np.float64)):.4f}",
+        f"language={language}",
+    ]
+
+
+def wait_until_gone(address: str, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while _ping(address):
+        assert time.monotonic() < deadline, "server still answering"
+        time.sleep(0.05)
+
+
+@pytest.fixture
+def address(monkeypatch):
+    """
+    A socket address in a temporary home, with the stand-in model on PYTHONPATH
+    for spawned servers. Kills any server still running at the end.
+    """
+    home = Path(tempfile.mkdtemp(prefix="vtt-"))  # Short: Unix socket paths are limited to ~100 bytes
+    state = home / ".vibetotext"
+    monkeypatch.setenv("HOME", str(home))  # Spawned servers read the authkey from here
+    monkeypatch.setenv(
+        "PYTHONPATH",
+        os.pathsep.join(filter(None, [str(FAKE_PYWHISPERCPP), os.environ.get("PYTHONPATH")])),
+    )
+    monkeypatch.setattr(whisper_server, "STATE_DIR", state)
+    monkeypatch.setattr(whisper_server, "AUTHKEY_PATH", state / "whisper_server.key")
+    monkeypatch.setattr(whisper_server, "LOG_PATH", str(home / "whisper_server.log"))
+    address = str(state / "whisper_server.sock")
+
+    yield address
+    info = _ping(address)
+    if info:
+        os.kill(info["pid"], signal.SIGKILL)
+    shutil.rmtree(home, ignore_errors=True)
+
+
+@pytest.fixture
+def client(address):
+    client = TranscriptionClient(address, spawn=False)
+    yield client
+    client.close()
+
+
+def test_load_and_transcribe_over_shared_memory(address, client):
+    assert spawn_server(address)
+    assert client.load("base") > 0
+    assert client.load("base") == 0.0  # Already loaded
+
+    audio = np.linspace(-0.5, 1.0, 16000, dtype=np.float32)
+    assert client.transcribe("base", audio, language="en")[:-1] == expected("base", audio, "en")
+
+    # A longer recording than the segment holds gets a new, larger segment the server attaches to
+    first_segment = client._segment.name
+    rng = np.random.default_rng(0)
+    long_audio = rng.uniform(-1, 1, 2_000_000).astype(np.float32)
+    assert client.transcribe("base", long_audio)[:-1] == expected("base", long_audio)
+    assert client._segment.name != first_segment
+
+    # Back to a short clip in the larger segment: only n_samples are read
+    assert client.transcribe("base", audio)[:-1] == expected("base", audio)
+    assert _ping(address)["models"] == ["base"]
+
+
+def test_client_spawns_server(address):
+    client = TranscriptionClient(address)
+    try:
+        texts = client.transcribe("tiny", np.ones(800, dtype=np.float32))
+    finally:
+        client.close()
+    info = _ping(address)
+    assert texts == expected("tiny", np.ones(800)) + [f"pid={info['pid']}"]
+    assert texts[-1] != f"pid={os.getpid()}"  # Answered by the server process
+
+
+def test_reconnect_after_server_restart(address, client):
+    audio = np.full(1600, 0.25, dtype=np.float32)
+    assert spawn_server(address)
+    first_pid = client.transcribe("base", audio)[-1]
+
+    # Server dies without closing anything; a new one replaces its stale socket
+    os.kill(_ping(address)["pid"], signal.SIGKILL)
+    wait_until_gone(address)
+    assert spawn_server(address)
+
+    # The client's connection is dead: the request reconnects once and succeeds
+    texts = client.transcribe("base", audio)
+    assert texts[:-1] == expected("base", audio)
+    assert texts[-1] != first_pid
+
+
+def test_errors_are_replies(address, client):
+    assert spawn_server(address)
+    with pytest.raises(RuntimeError, match="ValueError: unknown model 'huge'"):
+        client.load("huge")
+    with pytest.raises(RuntimeError, match="unknown request 'frobnicate'"):
+        client._request("frobnicate")
+    assert client.load("tiny") > 0  # Same connection still serves
+
+
+def test_shutdown(address, client):
+    assert spawn_server(address)
+    client.load("tiny")
+    assert client._request("shutdown") is None
+
+    wait_until_gone(address)
+    assert not os.path.exists(address)  # Listener removed its socket
+    with pytest.raises(OSError):
+        client.load("tiny")  # No server, and this client doesn't spawn one
+
+
+def test_transcriber_falls_back_to_in_process_model(address, monkeypatch):
+    from vibetotext.transcriber import Transcriber
+
+    monkeypatch.syspath_prepend(str(FAKE_PYWHISPERCPP))
+    monkeypatch.delitem(sys.modules, "pywhispercpp", raising=False)
+    monkeypatch.delitem(sys.modules, "pywhispercpp.model", raising=False)
+
+    transcriber = Transcriber("base", vad=False)
+    transcriber._client = TranscriptionClient(address, spawn=False)  # Nothing listening there
+
+    text = transcriber.transcribe(np.full(1600, 0.5, dtype=np.float32))
+    assert text.endswith(f"pid={os.getpid()}")  # Answered in-process
+    assert "samples=1600" in text
+    assert transcriber._client is None  # Later calls don't try the server again